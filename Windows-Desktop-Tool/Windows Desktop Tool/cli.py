@@ -0,0 +1,241 @@
+"""
+命令行模式：python main.py cli <命令> ...
+不导入 PyQt5 / qfluentwidgets，结果以 JSON 输出到标准输出（进度信息输出到标准错误），便于脚本批量调用
+
+    convert INPUT [INPUT ...] (-o OUTPUT | --to FORMAT [--output-dir DIR]) [--jobs N]
+    shred PATH [PATH ...] --yes [--passes N] | shred --resume --yes
+    speedtest [--provider auto|speedtest|cloudflare]
+    ip
+
+退出码：0 全部成功，1 有失败/被取消，2 参数错误
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import contextlib
+
+# 多个文件时轮询任务状态的间隔（秒）
+POLL_INTERVAL = 0.5
+
+def _positive_int(text):
+    """ argparse 参数类型：不小于 1 的整数 """
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"需要整数: {text}")
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"必须不小于 1: {text}")
+    return value
+
+def _emit(data, pretty=False):
+    print(json.dumps(data, ensure_ascii=False, indent=2 if pretty else None, default=str))
+
+def _progress_printer(enabled, **fields):
+    """ 返回把进度以 JSON 行写到标准错误的回调（未启用时返回 None） """
+    if not enabled:
+        return None
+
+    def callback(*values):
+        record = dict(fields)
+        if len(values) == 1:
+            record["message"] = values[0]
+        else:
+            record["percent"], record["message"] = values[0], values[1]
+        print(json.dumps(record, ensure_ascii=False), file=sys.stderr, flush=True)
+    return callback
+
+def _target_output(input_path, args):
+    """ 返回 (输出文件, 目标格式) """
+    if args.output:
+        return args.output, os.path.splitext(args.output)[1].lstrip(".").lower()
+    target = args.to.lstrip(".").lower()
+    if target == "jpeg":
+        target = "jpg"
+    output_dir = args.output_dir or os.path.dirname(os.path.abspath(input_path))
+    stem = os.path.splitext(os.path.basename(input_path))[0]
+    return os.path.join(output_dir, f"{stem}.{target}"), target
+
+def cmd_convert(args):
+    from modules import file_converter
+    from modules.conversion_jobs import ConversionJobManager, run_inline
+    from modules.converter_registry import backend_for
+
+    if args.output and len(args.inputs) > 1:
+        return {"status": "error", "message": "多个输入文件时请使用 --to 指定目标格式"}, 2
+    if not args.output and not args.to:
+        return {"status": "error", "message": "请使用 -o 指定输出文件或 --to 指定目标格式"}, 2
+
+    results = []
+    tasks = []
+    for input_path in args.inputs:
+        output_path, target = _target_output(input_path, args)
+        item = {"input": input_path, "output": output_path}
+        conversion = file_converter.resolve_conversion(os.path.splitext(input_path)[1], target)
+        if not os.path.isfile(input_path):
+            item.update(success=False, message="文件不存在")
+        elif conversion is None:
+            item.update(success=False, message=f"不支持的转换: {os.path.splitext(input_path)[1]} → {target}")
+        elif backend_for(conversion[0]).name == "qt_svg":
+            # SVG 渲染依赖 Qt，命令行模式不加载
+            item.update(success=False, message="命令行模式不支持 SVG 转换，请使用图形界面")
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+            tasks.append((item, getattr(file_converter, conversion[0]), conversion[1]))
+        results.append(item)
+
+    start = time.perf_counter()
+    if len(tasks) == 1:
+        # 单个文件直接在当前进程中转换，不启动进程池
+        item, func, extra = tasks[0]
+        on_progress = _progress_printer(args.progress, input=item["input"])
+        success, msg = run_inline(func, item["input"], item["output"], *extra, progress_callback=on_progress)
+        item.update(success=success, message=msg, seconds=round(time.perf_counter() - start, 3))
+    elif tasks:
+        manager = ConversionJobManager(max_workers=args.jobs)
+        try:
+            futures = [file_converter.submit_conversion(func, item["input"], item["output"], *extra,
+                                                        name=item["input"], manager=manager)
+                       for item, func, extra in tasks]
+            reported = {}
+            while not all(f.done() for f in futures):
+                time.sleep(POLL_INTERVAL)
+                if args.progress:
+                    for job in manager.jobs:
+                        state = (job.status, job.progress)
+                        if reported.get(job.id) != state:
+                            reported[job.id] = state
+                            _progress_printer(True, input=job.name, status=job.status)(job.progress, job.message)
+            for (item, _, _), future in zip(tasks, futures):
+                try:
+                    success, msg = future.result()
+                except Exception as e:
+                    success, msg = False, str(e)
+                item.update(success=success, message=msg)
+        finally:
+            manager.shutdown()
+
+    failed = sum(1 for item in results if not item["success"])
+    return {
+        "status": "success" if not failed else "error",
+        "converted": len(results) - failed,
+        "failed": failed,
+        "seconds": round(time.perf_counter() - start, 3),
+        "results": results,
+    }, 1 if failed else 0
+
+def cmd_shred(args):
+    from modules.settings import load_settings
+    from modules.file_shredder import ShredControl, set_user_protected_paths, shred_paths
+    from modules.shred_journal import load_pending_job
+
+    if not args.yes:
+        return {"status": "error", "message": "粉碎后无法恢复，请添加 --yes 确认"}, 2
+    settings = load_settings()
+    set_user_protected_paths(settings.get("protected_paths", []))
+
+    resume = None
+    if args.resume:
+        resume = load_pending_job()
+        if resume is None:
+            return {"status": "error", "message": "没有未完成的粉碎任务"}, 1
+        paths = [os.path.normpath(p) for p in resume.remaining_targets]
+    elif args.paths:
+        paths = [os.path.normpath(os.path.abspath(p)) for p in args.paths]
+    else:
+        return {"status": "error", "message": "请指定要粉碎的文件或文件夹"}, 2
+    passes = resume.passes if resume else args.passes or settings.get("shred_passes", 1)
+
+    files = []
+    control = ShredControl()
+    result = {}
+
+    def on_file(path, success, msg):
+        files.append({"path": path, "success": success, "message": msg})
+        if args.progress:
+            print(json.dumps(files[-1], ensure_ascii=False), file=sys.stderr, flush=True)
+
+    done = threading.Event()
+
+    def run():
+        try:
+            result.update(shred_paths(paths, passes, resume, control,
+                                      on_progress=_progress_printer(args.progress), on_file=on_file))
+        finally:
+            done.set()
+
+    # 在后台线程中粉碎，Ctrl+C 时通过 control 取消，正在覆写的文件记录在日志中可用 --resume 继续
+    # （等待 Event 而不是 Thread.join：join 被 KeyboardInterrupt 打断后可能不再等待线程结束）
+    start = time.perf_counter()
+    threading.Thread(target=run, name="shred", daemon=True).start()
+    try:
+        while not done.wait(POLL_INTERVAL):
+            pass
+    except KeyboardInterrupt:
+        control.cancel()
+        done.wait()
+    if not result:
+        return {"status": "error", "message": "粉碎任务异常结束"}, 1
+
+    ok = not result["cancelled"] and not result["failed"]
+    result.update(status="success" if ok else "error", passes=passes, files=files,
+                  seconds=round(time.perf_counter() - start, 3))
+    return result, 0 if ok else 1
+
+def cmd_speedtest(args):
+    from modules.network_speed import run_speed_test
+    result = run_speed_test(callback=_progress_printer(args.progress), provider=args.provider)
+    return result, 0 if result.get("status") == "success" else 1
+
+def cmd_ip(args):
+    from modules.ip_query import get_public_ip_info
+    # 查询失败时的诊断信息会直接 print，转到标准错误，避免混入 JSON 输出
+    with contextlib.redirect_stdout(sys.stderr):
+        result = get_public_ip_info()
+    return result, 0 if result.get("status") == "success" else 1
+
+def build_parser():
+    # 各命令共用的选项
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--pretty", action="store_true", help="缩进输出 JSON")
+    common.add_argument("--progress", action="store_true", help="把进度以 JSON 行输出到标准错误")
+
+    parser = argparse.ArgumentParser(prog="main.py cli", description="万能桌面工具命令行模式（输出 JSON）")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    convert = commands.add_parser("convert", parents=[common], help="格式转换（图片、PDF/Word/Excel、视频）")
+    convert.add_argument("inputs", nargs="+", metavar="INPUT")
+    convert.add_argument("-o", "--output", help="输出文件（扩展名决定目标格式，仅单个输入文件）")
+    convert.add_argument("--to", help="目标格式，如 jpg、pdf、docx、mp4")
+    convert.add_argument("--output-dir", help="输出目录（默认与输入文件相同）")
+    convert.add_argument("--jobs", type=_positive_int, default=None, help="多个文件时同时转换的任务数")
+    convert.set_defaults(handler=cmd_convert)
+
+    shred = commands.add_parser("shred", parents=[common], help="文件粉碎（覆写后删除，无法恢复）")
+    shred.add_argument("paths", nargs="*", metavar="PATH")
+    shred.add_argument("--passes", type=_positive_int, default=None, help="覆写遍数（默认使用设置中的值）")
+    shred.add_argument("--resume", action="store_true", help="继续上次中断的粉碎任务")
+    shred.add_argument("--yes", action="store_true", help="确认粉碎")
+    shred.set_defaults(handler=cmd_shred)
+
+    speedtest = commands.add_parser("speedtest", parents=[common], help="网速测试")
+    speedtest.add_argument("--provider", choices=("auto", "speedtest", "cloudflare"), default="auto")
+    speedtest.set_defaults(handler=cmd_speedtest)
+
+    ip = commands.add_parser("ip", parents=[common], help="查询公网 IP 信息")
+    ip.set_defaults(handler=cmd_ip)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        result, code = args.handler(args)
+    except KeyboardInterrupt:
+        result, code = {"status": "error", "message": "已取消"}, 1
+    _emit({"command": args.command, **result}, args.pretty)
+    return code
+
+if __name__ == "__main__":
+    sys.exit(main())
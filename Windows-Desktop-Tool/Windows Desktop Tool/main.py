@@ -1,11 +1,13 @@
 import sys
 import os
-from PyQt5.QtCore import Qt, QTranslator, QLibraryInfo, QLocale
-from PyQt5.QtWidgets import QApplication
-from qfluentwidgets import setTheme, Theme, FluentTranslator
-from ui.main_window import MainWindow
+import multiprocessing
 
 def main():
+    # 界面库在此处导入：命令行模式与转换进程池的子进程都不需要加载 PyQt5 / qfluentwidgets
+    from PyQt5.QtCore import Qt, QTranslator, QLibraryInfo, QLocale
+    from PyQt5.QtWidgets import QApplication
+    from qfluentwidgets import FluentTranslator
+
     # 启用高 DPI 缩放支持（必须在创建QApplication之前）
     QApplication.setAttribute(Qt.AA_EnableHighDpiScaling)
     QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps)
@@ -38,11 +40,18 @@ def main():
     from PyQt5.QtCore import QTimer
     QTimer.singleShot(0, load_translations)
 
-    # 创建并显示窗口
+    # 创建并显示窗口（转换进程池的子进程会重新导入本模块，界面模块只在主进程中导入）
+    from ui.main_window import MainWindow
     window = MainWindow()
     window.show()
     
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
+    # 打包为 exe 后转换进程池需要此调用
+    multiprocessing.freeze_support()
+    if len(sys.argv) > 1 and sys.argv[1] == "cli":
+        # 命令行模式：python main.py cli <命令> ...（见 cli.py）
+        from cli import main as cli_main
+        sys.exit(cli_main(sys.argv[2:]))
     main()
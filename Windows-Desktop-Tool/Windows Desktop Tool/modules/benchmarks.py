@@ -0,0 +1,674 @@
+"""
+性能基准测试模块
+用于验证各功能模块的性能优化效果，不参与程序正常运行
+用法: python -m modules.benchmarks <名称>  (不带参数时列出所有基准)
+"""
+import os
+import sys
+import time
+import random
+
+def benchmark_protected_index(count=100000):
+    """ 受保护路径索引：批量检查候选路径的耗时 """
+    from modules.file_shredder import build_protected_index
+
+    system_drive = os.environ.get('SystemDrive', 'C:')
+    roots = [
+        system_drive + "\\Windows\\System32",
+        system_drive + "\\WindowsFoo",
+        system_drive + "\\Program Files\\App",
+        system_drive + "\\Program Files Backup",
+        system_drive + "\\Users\\Alice\\Documents",
+        system_drive + "\\Users\\Default\\NTUSER.DAT",
+        "D:\\Data\\Projects",
+        "\\\\server\\share\\folder",
+    ]
+    rng = random.Random(0)
+    paths = []
+    for i in range(count):
+        root = roots[i % len(roots)]
+        depth = rng.randint(1, 5)
+        paths.append(root + "".join(f"\\dir{rng.randint(0, 99)}" for _ in range(depth)) + f"\\file{i}.txt")
+
+    start = time.perf_counter()
+    index = build_protected_index(["D:\\Data\\Projects\\dir1"])
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    protected = 0
+    for path in paths:
+        if index.match(path)[0]:
+            protected += 1
+    elapsed = time.perf_counter() - start
+
+    return {
+        "paths": count,
+        "protected": protected,
+        "rules": index.rule_count,
+        "build_ms": round(build_time * 1000, 3),
+        "check_s": round(elapsed, 4),
+        "paths_per_sec": int(count / elapsed) if elapsed else 0,
+    }
+
+def _mount_loopback(size_mb):
+    """ 在 Linux 上创建并挂载一个临时 ext4 回环文件系统（需要 root），返回 (挂载点, 清理函数) """
+    import subprocess
+    import tempfile
+    import shutil
+
+    work = tempfile.mkdtemp(prefix="wipe_bench_")
+    image = os.path.join(work, "volume.img")
+    mount_dir = os.path.join(work, "mnt")
+    os.makedirs(mount_dir)
+    with open(image, "wb") as f:
+        f.truncate(size_mb * 1024 * 1024)
+    subprocess.run(["mkfs.ext4", "-q", "-F", image], check=True)
+    subprocess.run(["mount", "-o", "loop", image, mount_dir], check=True)
+
+    def cleanup():
+        subprocess.run(["umount", mount_dir])
+        shutil.rmtree(work, ignore_errors=True)
+    return mount_dir, cleanup
+
+def benchmark_free_space_wipe(size_mb=1024, target_dir=None):
+    """
+    空闲空间擦除吞吐量：在回环文件系统上分别用 1/2/4 个写入线程写满空闲空间
+    target_dir: 已挂载的测试卷（如 Windows 上挂载的 VHD）；为空时在 Linux 上自动创建回环文件系统
+    """
+    from modules.free_space_wiper import wipe_free_space
+
+    cleanup = None
+    if not target_dir:
+        target_dir, cleanup = _mount_loopback(size_mb)
+    result = {"target": target_dir}
+    try:
+        for writers in (1, 2, 4):
+            start = time.perf_counter()
+            success, msg, written = wipe_free_space(target_dir, writers=writers,
+                                                    fill_size=64 * 1024 * 1024, reserve=16 * 1024 * 1024)
+            elapsed = time.perf_counter() - start
+            result[f"writers_{writers}"] = (f"{written / 1024 / 1024:.0f} MB in {elapsed:.2f}s, "
+                                            f"{written / 1024 / 1024 / elapsed:.0f} MB/s" if success else msg)
+    finally:
+        if cleanup:
+            cleanup()
+    return result
+
+def benchmark_image_batch(count=200, size=1024):
+    """ 批量图片转换吞吐量：PNG 转 JPG，比较单进程与按核数并行 """
+    import tempfile
+    import shutil
+    from PIL import Image
+    from modules.image_batch import plan_batch, iter_batch, STATUS_DONE
+
+    work = tempfile.mkdtemp(prefix="img_batch_bench_")
+    try:
+        src_dir = os.path.join(work, "src")
+        os.makedirs(src_dir)
+        # 噪声图像，避免纯色图片压缩过快而失去代表性
+        noise = Image.effect_noise((size, size), 64).convert("RGB")
+        for i in range(count):
+            noise.save(os.path.join(src_dir, f"img{i:05d}.png"))
+
+        result = {"images": count, "size": f"{size}x{size}", "cpus": os.cpu_count()}
+        for label, workers in (("1_process", 1), ("all_cores", None)):
+            out_dir = os.path.join(work, label)
+            tasks = plan_batch([src_dir], out_dir, "JPG")
+            start = time.perf_counter()
+            done = sum(1 for r in iter_batch(tasks, "JPG", workers) if r[2] == STATUS_DONE)
+            elapsed = time.perf_counter() - start
+            result[f"{label}_s"] = round(elapsed, 3)
+            result[f"{label}_images_per_sec"] = round(done / elapsed, 1) if elapsed else 0
+
+        # 再次运行时所有输出都已是最新，应全部跳过
+        tasks = plan_batch([src_dir], os.path.join(work, "all_cores"), "JPG")
+        start = time.perf_counter()
+        skipped = sum(1 for r in iter_batch(tasks, "JPG") if r[2] != STATUS_DONE)
+        result["rerun_skipped"] = skipped
+        result["rerun_s"] = round(time.perf_counter() - start, 3)
+        return result
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+def _peak_rss_mb():
+    """ 当前进程的峰值内存（MB） """
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 / (1024 if sys.platform == "darwin" else 1)
+    except ImportError:
+        import psutil
+        return psutil.Process().memory_info().peak_wset / 1024 / 1024
+
+def _resize_once(path, output, max_size, fast):
+    """ 在独立进程中缩小一张图片，返回 (耗时秒, 峰值内存增量 MB) """
+    from PIL import Image
+    from modules.file_converter import image_convert, scaled_size
+
+    base = _peak_rss_mb()
+    start = time.perf_counter()
+    if fast:
+        ok, msg = image_convert(path, output, "JPG", max_size=max_size)
+        if not ok:
+            raise RuntimeError(msg)
+    else:
+        # 对照组：完整解码后直接重采样
+        with Image.open(path) as img:
+            img.load()
+            resized = img.resize(scaled_size(img.size, max_size), Image.LANCZOS)
+            resized.convert("RGB").save(output, "JPEG")
+    return time.perf_counter() - start, _peak_rss_mb() - base
+
+def benchmark_image_resize(megapixels=50, max_size=1920, repeat=3):
+    """ 大图缩小：完整解码 + 重采样 与 draft/reduce 快速路径的单张耗时和峰值内存 """
+    import tempfile
+    import shutil
+    from concurrent.futures import ProcessPoolExecutor
+    from PIL import Image
+
+    Image.MAX_IMAGE_PIXELS = None
+    width = int((megapixels * 1e6 * 3 / 2) ** 0.5)
+    height = int(width * 2 / 3)
+    work = tempfile.mkdtemp(prefix="img_resize_bench_")
+    try:
+        # 渐变叠加噪声，接近照片的压缩特性
+        img = Image.linear_gradient("L").resize((width, height)).convert("RGB")
+        noise = Image.effect_noise((width, height), 24).convert("RGB")
+        img = Image.blend(img, noise, 0.3)
+        noise.close()
+        sources = {"jpeg": os.path.join(work, "src.jpg"), "png": os.path.join(work, "src.png")}
+        img.save(sources["jpeg"], "JPEG", quality=90)
+        img.save(sources["png"], "PNG", compress_level=1)
+        img.close()
+
+        result = {"input": f"{width}x{height} ({width * height / 1e6:.1f} MP)", "max_size": max_size}
+        for fmt, path in sources.items():
+            for label, fast in (("full", False), ("fast", True)):
+                times, peaks = [], []
+                for _ in range(repeat):
+                    # 每次使用新进程，峰值内存互不影响
+                    with ProcessPoolExecutor(max_workers=1) as pool:
+                        seconds, peak = pool.submit(_resize_once, path, os.path.join(work, "out.jpg"),
+                                                    max_size, fast).result()
+                    times.append(seconds)
+                    peaks.append(peak)
+                result[f"{fmt}_{label}_s"] = round(min(times), 3)
+                result[f"{fmt}_{label}_peak_mb"] = round(max(peaks), 1)
+        return result
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+def _make_workbook(path, rows, columns=8, sheets=2):
+    """ 用 openpyxl 只写模式生成测试工作簿（数字、文本、日期混合） """
+    import datetime
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    rng = random.Random(0)
+    start = datetime.date(2020, 1, 1)
+    for s in range(sheets):
+        ws = wb.create_sheet(f"Sheet{s + 1}")
+        ws.append([f"列{c + 1}" for c in range(columns)])
+        for r in range(rows // sheets):
+            row = []
+            for c in range(columns):
+                kind = c % 3
+                if kind == 0:
+                    row.append(rng.randint(0, 10 ** 6))
+                elif kind == 1:
+                    row.append(f"文本 {r}-{c} & <值>")
+                else:
+                    row.append(start + datetime.timedelta(days=r % 3650))
+            ws.append(row)
+    wb.save(path)
+
+def _legacy_excel_to_word(excel_path, docx_path):
+    """ 对照组：优化前的实现（pandas 逐表重复读取 + python-docx 逐单元格赋值） """
+    import pandas as pd
+    from docx import Document
+
+    xls = pd.ExcelFile(excel_path)
+    doc = Document()
+    for sheet_name in xls.sheet_names:
+        df = pd.read_excel(excel_path, sheet_name=sheet_name)
+        doc.add_heading(f'Sheet: {sheet_name}', level=1)
+        table = doc.add_table(rows=df.shape[0] + 1, cols=df.shape[1])
+        for j in range(df.shape[1]):
+            table.cell(0, j).text = str(df.columns[j])
+        for i in range(df.shape[0]):
+            for j in range(df.shape[1]):
+                table.cell(i + 1, j).text = str(df.values[i, j])
+        doc.add_page_break()
+    doc.save(docx_path)
+    return True, ""
+
+def _timed_call(func_path, *args):
+    """ 在独立进程中执行 模块:函数，返回 (耗时秒, 峰值内存增量 MB) """
+    import importlib
+    module_name, func_name = func_path.split(":")
+    func = getattr(importlib.import_module(module_name), func_name)
+    base = _peak_rss_mb()
+    start = time.perf_counter()
+    ok, msg = func(*args)
+    if not ok:
+        raise RuntimeError(msg)
+    return time.perf_counter() - start, _peak_rss_mb() - base
+
+def _run_isolated(func_path, *args):
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        seconds, peak = pool.submit(_timed_call, func_path, *args).result()
+    return round(seconds, 3), round(peak, 1)
+
+def benchmark_excel_to_word(rows=300, large_rows=100000):
+    """
+    Excel 转 Word：rows 行的工作簿对比优化前后耗时（旧实现为平方复杂度，行数不宜过大）；
+    large_rows 行的工作簿只测流式实现的耗时与峰值内存
+    """
+    import tempfile
+    import shutil
+
+    work = tempfile.mkdtemp(prefix="xlsx_docx_bench_")
+    try:
+        small = os.path.join(work, "small.xlsx")
+        _make_workbook(small, rows)
+        result = {"rows": rows, "columns": 8}
+        result["legacy_s"], result["legacy_peak_mb"] = _run_isolated(
+            "modules.benchmarks:_legacy_excel_to_word", small, os.path.join(work, "legacy.docx"))
+        result["stream_s"], result["stream_peak_mb"] = _run_isolated(
+            "modules.office_convert:excel_to_word_stream", small, os.path.join(work, "stream.docx"))
+        result["speedup"] = round(result["legacy_s"] / result["stream_s"], 1) if result["stream_s"] else 0
+
+        if large_rows:
+            large = os.path.join(work, "large.xlsx")
+            _make_workbook(large, large_rows)
+            result["large_rows"] = large_rows
+            result["large_stream_s"], result["large_stream_peak_mb"] = _run_isolated(
+                "modules.office_convert:excel_to_word_stream", large, os.path.join(work, "large.docx"))
+            result["large_docx_mb"] = round(os.path.getsize(os.path.join(work, "large.docx")) / 1024 / 1024, 1)
+        return result
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+def _make_table_document(path, tables, rows, columns=6):
+    """ 生成包含大量表格（含横向、纵向合并单元格）的 Word 文档 """
+    from docx import Document
+
+    doc = Document()
+    for t in range(tables):
+        doc.add_paragraph(f"表格 {t + 1}")
+        table = doc.add_table(rows=rows, cols=columns)
+        for r, row in enumerate(table.rows):
+            for c, cell in enumerate(row.cells):
+                cell.text = f"{t}-{r}-{c}"
+        table.cell(0, 0).merge(table.cell(0, 1))
+        table.cell(1, columns - 1).merge(table.cell(3, columns - 1))
+    doc.save(path)
+
+def _legacy_word_to_excel(docx_path, excel_path):
+    """ 对照组：优化前的实现（python-docx 逐行访问 row.cells + pandas 写出） """
+    import pandas as pd
+    from docx import Document
+
+    doc = Document(docx_path)
+    all_tables = []
+    for table in doc.tables:
+        data = [[cell.text for cell in row.cells] for row in table.rows]
+        all_tables.append(pd.DataFrame(data))
+    with pd.ExcelWriter(excel_path) as writer:
+        for i, df in enumerate(all_tables):
+            df.to_excel(writer, sheet_name=f'Table_{i+1}', index=False, header=False)
+    return True, ""
+
+def benchmark_word_to_excel(tables=300, rows=40):
+    """ Word 表格提取到 Excel：优化前后耗时、峰值内存，并核对两者输出一致 """
+    import tempfile
+    import shutil
+    from openpyxl import load_workbook
+
+    work = tempfile.mkdtemp(prefix="docx_xlsx_bench_")
+    try:
+        source = os.path.join(work, "tables.docx")
+        _make_table_document(source, tables, rows)
+        outputs = {"legacy": os.path.join(work, "legacy.xlsx"), "stream": os.path.join(work, "stream.xlsx")}
+        result = {"tables": tables, "rows_per_table": rows, "columns": 6}
+        result["legacy_s"], result["legacy_peak_mb"] = _run_isolated(
+            "modules.benchmarks:_legacy_word_to_excel", source, outputs["legacy"])
+        result["stream_s"], result["stream_peak_mb"] = _run_isolated(
+            "modules.office_convert:word_to_excel_stream", source, outputs["stream"])
+        result["speedup"] = round(result["legacy_s"] / result["stream_s"], 1) if result["stream_s"] else 0
+
+        def cells(path):
+            wb = load_workbook(path, read_only=True)
+            data = [[[c if c not in (None, "") else None for c in row] for row in ws.iter_rows(values_only=True)]
+                    for ws in wb.worksheets]
+            wb.close()
+            return data
+        result["same_output"] = cells(outputs["legacy"]) == cells(outputs["stream"])
+        return result
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+def benchmark_pdf_to_word(pages=60, workers=None):
+    """ PDF 转 Word：单进程与按页并行的耗时和页/秒 """
+    import tempfile
+    import shutil
+    from PIL import Image
+    from pdf2docx import Converter
+    from modules.pdf_convert import pdf_to_word_parallel
+    try:
+        import pymupdf as fitz
+    except ImportError:
+        import fitz
+
+    work = tempfile.mkdtemp(prefix="pdf_docx_bench_")
+    try:
+        image = os.path.join(work, "image.png")
+        Image.effect_noise((320, 200), 48).convert("RGB").save(image)
+        pdf = os.path.join(work, "source.pdf")
+        doc = fitz.open()
+        for i in range(pages):
+            page = doc.new_page()
+            page.insert_text((72, 72), f"第 {i + 1} 页 Page {i + 1}", fontsize=18)
+            for line in range(30):
+                page.insert_text((72, 110 + line * 14), f"Line {line} " + "lorem ipsum " * 8, fontsize=9)
+            page.insert_image(fitz.Rect(72, 560, 392, 760), filename=image)
+        doc.save(pdf)
+        doc.close()
+
+        result = {"pages": pages, "workers": workers or os.cpu_count()}
+        start = time.perf_counter()
+        cv = Converter(pdf)
+        cv.convert(os.path.join(work, "single.docx"))
+        cv.close()
+        single = time.perf_counter() - start
+
+        start = time.perf_counter()
+        ok, msg = pdf_to_word_parallel(pdf, os.path.join(work, "parallel.docx"), workers or os.cpu_count())
+        parallel = time.perf_counter() - start
+        if not ok:
+            raise RuntimeError(msg)
+        result["single_s"] = round(single, 2)
+        result["single_pages_per_sec"] = round(pages / single, 1)
+        result["parallel_s"] = round(parallel, 2)
+        result["parallel_pages_per_sec"] = round(pages / parallel, 1)
+        return result
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+def _frame_count(path):
+    """ 解码统计视频帧数，用于核对分段拼接没有丢帧或重复帧 """
+    import subprocess
+    from modules.ffmpeg_tools import find_tool
+    result = subprocess.run([find_tool("ffmpeg"), "-v", "error", "-i", path, "-map", "0:v:0", "-f", "framemd5", "-"],
+                            stdout=subprocess.PIPE, check=True)
+    return sum(1 for line in result.stdout.splitlines() if line and not line.startswith(b"#"))
+
+def benchmark_video_segments(seconds=120, size="1280x720", workers=None):
+    """ 视频转码：单个 ffmpeg 进程与按关键帧分段并行（testsrc 生成的测试片段，flv1 + PCM 转 MP4） """
+    import subprocess
+    import tempfile
+    import shutil
+    from modules.ffmpeg_tools import find_tool
+    from modules.file_converter import video_convert
+
+    work = tempfile.mkdtemp(prefix="video_seg_bench_")
+    try:
+        source = os.path.join(work, "source.mkv")
+        # flv1 / PCM 都不能放入 MP4，视频与音频都需要转码；每 2 秒一个关键帧
+        subprocess.run([find_tool("ffmpeg"), "-v", "error", "-y",
+                        "-f", "lavfi", "-i", f"testsrc=duration={seconds}:size={size}:rate=25",
+                        "-f", "lavfi", "-i", f"sine=duration={seconds}",
+                        "-c:v", "flv1", "-q:v", "4", "-g", "50", "-c:a", "pcm_s16le", source], check=True)
+        result = {"seconds": seconds, "size": size, "workers": workers or os.cpu_count()}
+        for label, segmented in (("single", False), ("segmented", True)):
+            output = os.path.join(work, f"{label}.mp4")
+            start = time.perf_counter()
+            ok, msg = video_convert(source, output, "mp4", segmented=segmented, workers=workers)
+            elapsed = time.perf_counter() - start
+            if not ok:
+                raise RuntimeError(msg)
+            result[f"{label}_s"] = round(elapsed, 2)
+            result[f"{label}_speed"] = f"{seconds / elapsed:.2f}x"
+            result[f"{label}_frames"] = _frame_count(output)
+        return result
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+def _import_in_subprocess(code):
+    """ 在全新的解释器中执行导入代码，返回其输出的 JSON """
+    import json
+    import subprocess
+    app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", code], cwd=app_dir, capture_output=True, text=True)
+    lines = result.stdout.strip().splitlines()
+    if result.returncode != 0 or not lines:
+        return {"error": (result.stderr.strip().splitlines() or ["未知错误"])[-1]}
+    return json.loads(lines[-1])
+
+def benchmark_converter_imports(repeat=3):
+    """
+    转换模块启动开销：每个后端在全新进程中的导入耗时（取最小值），
+    以及改为按需导入前 file_converter 顶层导入的库（PIL、pandas、pdf2docx、docx2pdf、python-docx）的总耗时
+    """
+    from modules.converter_registry import BACKENDS
+
+    def timed(code):
+        best = None
+        for _ in range(repeat):
+            value = _import_in_subprocess(code)
+            if "error" in value:
+                return value["error"]
+            best = value["seconds"] if best is None else min(best, value["seconds"])
+        return round(best * 1000, 1)
+
+    result = {}
+    for name in BACKENDS:
+        result[f"{name}_ms"] = timed(
+            "import json, sys, time\n"
+            "from modules.converter_registry import BACKENDS\n"
+            f"b = BACKENDS[{name!r}]\n"
+            "ok = b.load()\n"
+            "print(json.dumps({'seconds': b.import_seconds} if ok else {'error': b.error}))")
+    result["legacy_top_level_ms"] = timed(
+        "import json, time\n"
+        "start = time.perf_counter()\n"
+        "from PIL import Image\n"
+        "import pandas\n"
+        "for name in ('pdf2docx', 'docx2pdf', 'docx'):\n"
+        "    try:\n"
+        "        __import__(name)\n"
+        "    except ImportError:\n"
+        "        pass\n"
+        "print(json.dumps({'seconds': time.perf_counter() - start}))")
+    result["file_converter_ms"] = timed(
+        "import json, time\n"
+        "start = time.perf_counter()\n"
+        "import modules.file_converter\n"
+        "print(json.dumps({'seconds': time.perf_counter() - start}))")
+    return result
+
+def _legacy_qr_code(data, box_size, border, ecc):
+    import qrcode
+    from modules.qr_plan import ERROR_CORRECTION
+    # 对照组：优化前的编码（固定纠错等级，从版本 1 开始逐级增大）
+    qr = qrcode.QRCode(version=1, error_correction=ERROR_CORRECTION[ecc], box_size=box_size, border=border)
+    qr.add_data(data)
+    qr.make(fit=True)
+    return qr
+
+def _legacy_qr_raster(qr):
+    """ 对照组：优化前的栅格化（PIL 渲染 → RGBA → bytes → QImage） """
+    from PyQt5.QtGui import QImage
+    img = qr.make_image(fill_color="black", back_color="white").convert("RGBA")
+    buffer = img.tobytes("raw", "RGBA")
+    # 原实现中 QImage 引用 buffer，随后转换为 QPixmap；此处 copy 代替转换，使结果独立于 buffer
+    return QImage(buffer, img.size[0], img.size[1], QImage.Format_RGBA8888).copy()
+
+def benchmark_qr_render(box_size=10, repeat=20):
+    """
+    二维码生成：编码耗时，以及由同一二维码栅格化时 PIL 路径与 NumPy 直接栅格化（8 位灰度 / 1 位黑白）、
+    SVG 输出的单次耗时（取最小值）；不同长度的内容分别测试，并核对两种栅格化结果逐像素一致
+    """
+    import numpy as np
+    from PyQt5.QtGui import QImage
+    from modules.qrcode_tool import build_matrix, matrix_to_qimage, matrix_to_svg
+
+    def best_ms(func):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+        return round(min(times) * 1000, 2)
+
+    def gray_pixels(image):
+        image = image.convertToFormat(QImage.Format_Grayscale8)
+        buffer = image.bits()
+        buffer.setsize(image.bytesPerLine() * image.height())
+        return np.frombuffer(buffer, np.uint8).reshape(image.height(), -1)[:, :image.width()].copy()
+
+    result = {"box_size": box_size}
+    for label, data in (("url", "https://example.com/download?id=20240601"),
+                        ("text_500", "二维码测试" * 100),
+                        ("max_1800", "A1b2C3d4E5" * 180)):
+        qr = _legacy_qr_code(data, box_size, 4, "M")
+        # 两种栅格化使用同一个模块矩阵（编码方案规划后的矩阵可能与对照组不同）
+        matrix = np.array(qr.get_matrix(), dtype=bool)
+        result[f"{label}_modules"] = matrix.shape[0]
+        # 编码与掩码选择（两种实现共用，纯 Python，占总耗时的大部分）
+        result[f"{label}_encode_ms"] = best_ms(lambda: build_matrix(data, 4, "M"))
+        result[f"{label}_legacy_raster_ms"] = best_ms(lambda: _legacy_qr_raster(qr))
+        result[f"{label}_numpy_raster_ms"] = best_ms(lambda: matrix_to_qimage(matrix, box_size))
+        result[f"{label}_numpy_mono_ms"] = best_ms(lambda: matrix_to_qimage(matrix, box_size, mono=True))
+        result[f"{label}_svg_ms"] = best_ms(lambda: matrix_to_svg(matrix, box_size))
+        legacy = gray_pixels(_legacy_qr_raster(qr))
+        result[f"{label}_identical"] = bool(np.array_equal(legacy, gray_pixels(matrix_to_qimage(matrix, box_size))))
+    return result
+
+def benchmark_qr_batch(count=1000, workers=None):
+    """ 批量生成二维码吞吐量（个/秒）：各输出方式分别比较单进程与按核数并行 """
+    import tempfile
+    import shutil
+    from PyQt5.QtGui import QGuiApplication
+    from modules.qr_batch import generate_batch
+
+    # PDF 排版绘制文字需要 QGuiApplication（字体数据库）
+    app = QGuiApplication.instance() or QGuiApplication([])
+    items = [(f"item{i:05d}", f"https://example.com/asset?id={i:06d}") for i in range(count)]
+    work = tempfile.mkdtemp(prefix="qr_batch_bench_")
+    try:
+        result = {"codes": count, "cpus": os.cpu_count()}
+        for mode in ("png", "svg", "zip", "pdf"):
+            for label, n in (("1_process", 1), ("all_cores", workers)):
+                output = os.path.join(work, f"{mode}_{label}")
+                if mode in ("zip", "pdf"):
+                    output += f".{mode}"
+                summary = generate_batch(items, mode, output, workers=n)
+                result[f"{mode}_{label}_s"] = round(summary["seconds"], 3)
+                result[f"{mode}_{label}_codes_per_sec"] = round(summary["rate"], 1)
+            if mode == "pdf":
+                result["pdf_pages"] = summary["pages"]
+                result["pdf_bytes"] = os.path.getsize(output)
+        return result
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+# 常见的二维码内容：(名称, 内容)
+_QR_CORPUS = [
+    ("url_short", "https://example.com"),
+    ("url_tracking", "https://shop.example.com/products/12345?utm_source=newsletter&utm_medium=email"
+                     "&utm_campaign=2024_spring_sale&ref=A8F3K2"),
+    ("wifi", "WIFI:T:WPA;S:Office-5G;P:Sup3rS3cret!2024;;"),
+    ("vcard", "BEGIN:VCARD\nVERSION:3.0\nN:张;三\nFN:张三\nORG:示例科技有限公司\nTITLE:产品经理\n"
+              "TEL;TYPE=CELL:+86 138 0013 8000\nTEL;TYPE=WORK:+86 10 6552 9988\n"
+              "EMAIL:zhangsan@example.com\nADR;TYPE=WORK:;;中关村大街 1 号;北京;;100080;中国\n"
+              "URL:https://www.example.com\nEND:VCARD"),
+    ("payment", "订单号:20240601123456789012 金额:128.00 收款方:示例便利店 门店编号:SH0001234"),
+    ("tracking_no", "SF1234567890123 CN 2024-06-01 SHANGHAI"),
+    ("serials", ";".join(f"{9787111000000 + i * 7919}" for i in range(40))),
+    ("json", '{"id":1024,"name":"温湿度传感器","sn":"TH-20240601-0001","mac":"AC:DE:48:00:11:22",'
+             '"fw":"2.3.1","ts":1717200000}'),
+    ("chinese_text", "本设备仅供室内使用，请勿淋雨或置于潮湿环境。使用前请仔细阅读说明书，"
+                     "如有疑问请联系客服热线 400-800-8888，工作时间为每日 9:00 至 21:00。" * 2),
+    ("japanese_text", "ご来店ありがとうございます。本日の営業時間は午前十時から午後九時までです。" * 2),
+    ("long_text", "The quick brown fox jumps over the lazy dog. " * 20),
+]
+
+def benchmark_qr_plan(repeat=3):
+    """
+    编码方案规划：对常见内容比较优化前（固定 H 级，从版本 1 开始逐级增大）与自动规划的版本、模块数和编码耗时
+    编码耗时包括 8 种掩码的评估（纯 Python，与模块数成正比），取 repeat 次中的最小值
+    """
+    import qrcode
+    from modules.qr_plan import plan_qr, make_qr
+
+    def best_ms(func):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+        return round(min(times) * 1000, 1)
+
+    result = {"budget_version": plan_qr("x").max_version}
+    totals = {"legacy_area": 0, "plan_area": 0, "legacy_ms": 0.0, "plan_ms": 0.0}
+    for label, data in _QR_CORPUS:
+        try:
+            legacy = _legacy_qr_code(data, 1, 4, "H")
+            legacy_ms = best_ms(lambda: _legacy_qr_code(data, 1, 4, "H"))
+            legacy_version = legacy.version
+        except (qrcode.exceptions.DataOverflowError, ValueError):
+            legacy_version, legacy_ms = None, None
+        plan_ms = best_ms(lambda: make_qr(data))
+        plan = plan_qr(data)
+        # 只改进分段、仍使用 H 级时的版本（区分分段与纠错等级选择各自的作用）
+        same_ecc = plan_qr(data, "H").version
+        result[label] = (f"{len(data.encode('utf-8'))} 字节, 优化前 H 级版本 {legacy_version} {legacy_ms} ms"
+                         f" → {plan.ecc} 级版本 {plan.version} {plan_ms} ms（仅优化分段：H 级版本 {same_ecc}）")
+        if label == "japanese_text":
+            result[f"{label}_kanji"] = f"使用汉字模式：{plan_qr(data, kanji=True).describe()}"
+        if legacy_version is not None:
+            totals["legacy_area"] += (legacy_version * 4 + 17) ** 2
+            totals["plan_area"] += plan.modules ** 2
+            totals["legacy_ms"] += legacy_ms
+            totals["plan_ms"] += plan_ms
+    result["total_modules_legacy"] = totals["legacy_area"]
+    result["total_modules_plan"] = totals["plan_area"]
+    result["total_legacy_ms"] = round(totals["legacy_ms"], 1)
+    result["total_plan_ms"] = round(totals["plan_ms"], 1)
+    return result
+
+BENCHMARKS = {
+    "protected_index": benchmark_protected_index,
+    "free_space_wipe": benchmark_free_space_wipe,
+    "image_batch": benchmark_image_batch,
+    "image_resize": benchmark_image_resize,
+    "excel_to_word": benchmark_excel_to_word,
+    "word_to_excel": benchmark_word_to_excel,
+    "pdf_to_word": benchmark_pdf_to_word,
+    "video_segments": benchmark_video_segments,
+    "converter_imports": benchmark_converter_imports,
+    "qr_render": benchmark_qr_render,
+    "qr_batch": benchmark_qr_batch,
+    "qr_plan": benchmark_qr_plan,
+}
+
+def _parse_arg(text):
+    try:
+        return int(text)
+    except ValueError:
+        return text
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in BENCHMARKS:
+        print("可用的基准测试: " + ", ".join(sorted(BENCHMARKS)))
+        return 1
+    result = BENCHMARKS[argv[0]](*[_parse_arg(a) for a in argv[1:]])
+    for key, value in result.items():
+        print(f"{key}: {value}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""
+格式转换结果缓存
+以 输入文件内容哈希 + 转换函数名 + 参数 + 转换器版本 为键，把转换结果保存在配置目录下；
+再次以相同参数转换同一内容时直接复制缓存文件，不再重新转换。
+缓存总大小有上限，超出时按最近使用时间（文件修改时间）淘汰，多个工作进程可同时读写。
+大文件只对头、中、尾抽样计算哈希（再加上大小与修改时间），超大输入不使用缓存，避免为了查缓存先把整个文件读一遍
+"""
+import os
+import json
+import uuid
+import shutil
+import hashlib
+import functools
+from modules.settings import _CONFIG_DIR
+from modules.conversion_jobs import report_progress
+
+CACHE_DIR = os.path.join(_CONFIG_DIR, "conversion_cache")
+# 缓存总大小上限；单个结果超过上限的 1/4 时不缓存（避免一个大视频挤掉所有条目）
+CACHE_MAX_BYTES = 1024 * 1024 * 1024
+# 输入文件超过该大小时不使用缓存（转换耗时远大于复制，结果通常也超出单条上限）
+MAX_INPUT_BYTES = CACHE_MAX_BYTES
+# 计算内容哈希时每次读取的字节数；超过 SAMPLE_THRESHOLD 的文件只读取头、中、尾各一块
+HASH_CHUNK = 1024 * 1024
+SAMPLE_THRESHOLD = 16 * 1024 * 1024
+
+_hash_memo = {}  # (路径, 大小, 修改时间) -> 内容哈希
+_usage = None  # 本进程估计的缓存总大小，首次写入时统计一次，之后累加
+
+def file_hash(path):
+    """
+    文件内容的 blake2b 哈希，按 (路径, 大小, 修改时间) 记忆，文件未变化时不重复读取
+    大文件为抽样哈希：大小、修改时间与头、中、尾各 HASH_CHUNK 字节
+    """
+    st = os.stat(path)
+    memo_key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    digest = _hash_memo.get(memo_key)
+    if digest is None:
+        h = hashlib.blake2b(digest_size=20)
+        with open(path, "rb") as f:
+            if st.st_size <= SAMPLE_THRESHOLD:
+                for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+                    h.update(chunk)
+            else:
+                h.update(f"{st.st_size}:{st.st_mtime_ns}".encode("ascii"))
+                for offset in (0, (st.st_size - HASH_CHUNK) // 2, st.st_size - HASH_CHUNK):
+                    f.seek(offset)
+                    h.update(f.read(HASH_CHUNK))
+        digest = h.hexdigest()
+        _hash_memo[memo_key] = digest
+    return digest
+
+def cache_key(converter, version, input_path, output_path, options):
+    """ 缓存键：内容哈希、转换函数、版本、参数与输出扩展名共同决定 """
+    payload = json.dumps([converter, version, file_hash(input_path),
+                          os.path.splitext(output_path)[1].lower(), options],
+                         sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=20).hexdigest()
+
+def _entry_path(key, ext):
+    return os.path.join(CACHE_DIR, key[:2], key + ext)
+
+def lookup(key, ext, output_path):
+    """ 命中时把缓存结果复制到 output_path 并返回 True """
+    entry = _entry_path(key, ext)
+    try:
+        # 更新修改时间作为最近使用时间
+        os.utime(entry)
+    except OSError:
+        return False
+    tmp = f"{output_path}.part"
+    try:
+        # 复制而不是硬链接：用户之后修改输出文件时不会连带改坏缓存
+        shutil.copyfile(entry, tmp)
+        os.replace(tmp, output_path)
+        return True
+    except OSError:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        return False
+
+def store(key, ext, output_path, max_bytes=CACHE_MAX_BYTES):
+    """
+    把转换结果放入缓存（先写临时文件再改名，其他进程不会读到不完整的文件）
+    只在估计的总大小超出上限时才扫描缓存目录淘汰旧条目
+    """
+    global _usage
+    try:
+        size = os.path.getsize(output_path)
+        if size > max_bytes // 4:
+            return
+        entry = _entry_path(key, ext)
+        os.makedirs(os.path.dirname(entry), exist_ok=True)
+        tmp = f"{entry}.{uuid.uuid4().hex}.tmp"
+        shutil.copyfile(output_path, tmp)
+        os.replace(tmp, entry)
+    except OSError:
+        return
+    if _usage is None:
+        _usage = cache_size()[1]
+    else:
+        _usage += size
+    if _usage > max_bytes:
+        # 淘汰时重新统计，同时纠正其他进程写入造成的偏差
+        _usage = evict(max_bytes)
+
+def _entries():
+    """ 返回 [(最近使用时间, 大小, 路径)] """
+    entries = []
+    if not os.path.isdir(CACHE_DIR):
+        return entries
+    for sub in os.scandir(CACHE_DIR):
+        if not sub.is_dir():
+            continue
+        for entry in os.scandir(sub.path):
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, entry.path))
+    return entries
+
+def cache_size():
+    """ 返回 (条目数, 总字节数) """
+    entries = [e for e in _entries() if not e[2].endswith(".tmp")]
+    return len(entries), sum(size for _, size, _ in entries)
+
+def evict(max_bytes=CACHE_MAX_BYTES):
+    """ 总大小超出上限时，从最久未使用的条目开始删除，返回删除后的总大小 """
+    entries = _entries()
+    total = sum(size for _, size, _ in entries)
+    if total <= max_bytes:
+        return total
+    for _, size, path in sorted(entries):
+        if path.endswith(".tmp"):
+            continue
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            continue
+        if total <= max_bytes:
+            break
+    return total
+
+def clear():
+    global _usage
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
+    _usage = 0
+
+def cached(version=1, ignore=()):
+    """
+    转换函数装饰器：函数签名须为 func(输入文件, 输出文件, *参数, **参数)，返回 (是否成功, 消息)
+    version: 转换实现的输出发生变化时递增，使旧的缓存结果失效
+    ignore: 不影响输出内容的关键字参数（如并行进程数），不计入缓存键
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(input_path, output_path, *args, **kwargs):
+            # 批量转换写入 .part 临时文件，由 image_batch 按修改时间跳过已是最新的输出，不再经过缓存
+            if output_path.endswith(".part"):
+                return func(input_path, output_path, *args, **kwargs)
+            try:
+                if os.path.getsize(input_path) > MAX_INPUT_BYTES:
+                    return func(input_path, output_path, *args, **kwargs)
+                options = {k: v for k, v in kwargs.items() if k not in ignore}
+                key = cache_key(func.__name__, version, input_path, output_path, [args, options])
+            except OSError:
+                return func(input_path, output_path, *args, **kwargs)
+            ext = os.path.splitext(output_path)[1].lower()
+            if lookup(key, ext, output_path):
+                report_progress(100, "使用缓存结果")
+                return True, "转换成功（使用缓存结果）"
+            result = func(input_path, output_path, *args, **kwargs)
+            if result[0] and os.path.isfile(output_path):
+                store(key, ext, output_path)
+            return result
+        return wrapper
+    return decorator
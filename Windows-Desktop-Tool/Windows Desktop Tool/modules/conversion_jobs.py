@@ -0,0 +1,241 @@
+"""
+格式转换后台任务队列
+转换函数在进程池（CPU 密集型）或线程池（依赖 Qt 的 SVG 渲染、自身管理子进程的任务）中执行，
+提交后立即返回 Future，界面线程不再被阻塞。
+转换函数可调用 report_progress / is_cancelled 上报进度、响应取消，在任务之外调用时不产生任何效果。
+"""
+import os
+import queue
+import itertools
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# 任务状态
+STATUS_PENDING = "排队中"
+STATUS_RUNNING = "进行中"
+STATUS_CANCELLING = "正在取消"
+STATUS_DONE = "已完成"
+STATUS_FAILED = "失败"
+STATUS_CANCELLED = "已取消"
+
+_context = threading.local()
+
+def report_progress(percent, text=""):
+    """ 在转换函数内部上报进度（0-100） """
+    ctx = getattr(_context, "job", None)
+    if ctx is None:
+        return
+    job_id, progress_queue, _ = ctx
+    try:
+        progress_queue.put((job_id, percent, text))
+    except Exception:
+        pass
+
+def is_cancelled():
+    """ 在转换函数内部检查任务是否已被取消 """
+    ctx = getattr(_context, "job", None)
+    if ctx is None:
+        return False
+    try:
+        return ctx[2].is_set()
+    except Exception:
+        return False
+
+def _run_job(job_id, func, args, kwargs, progress_queue, cancel_event):
+    """ 在工作进程/线程中执行转换函数 """
+    _context.job = (job_id, progress_queue, cancel_event)
+    try:
+        if cancel_event.is_set():
+            return False, "已取消"
+        report_progress(0, "开始转换")
+        return func(*args, **kwargs)
+    except Exception as e:
+        return False, str(e)
+    finally:
+        _context.job = None
+
+class _CallbackQueue:
+    """ 把进度消息直接交给回调函数（在当前线程中执行转换时代替队列） """
+    def __init__(self, callback):
+        self.callback = callback
+
+    def put(self, item):
+        if self.callback:
+            _, percent, text = item
+            self.callback(percent, text)
+
+def run_inline(func, *args, progress_callback=None, **kwargs):
+    """
+    在当前线程中直接执行转换函数（命令行模式转换单个文件时不必启动进程池）
+    progress_callback(百分比, 文本): 接收转换函数上报的进度
+    """
+    return _run_job(0, func, args, kwargs, _CallbackQueue(progress_callback), threading.Event())
+
+class ConversionJob:
+    """ 单个转换任务的状态 """
+    def __init__(self, job_id, name, cancel_event):
+        self.id = job_id
+        self.name = name
+        self.status = STATUS_PENDING
+        self.progress = 0
+        self.message = ""
+        self.future = None
+        self.cancel_event = cancel_event
+
+    @property
+    def finished(self):
+        return self.status in (STATUS_DONE, STATUS_FAILED, STATUS_CANCELLED)
+
+    def cancel(self):
+        """ 未开始的任务直接移出队列，进行中的任务通知转换函数尽快退出 """
+        if self.finished:
+            return
+        if self.future is not None and self.future.cancel():
+            self.status = STATUS_CANCELLED
+            return
+        self.cancel_event.set()
+        self.status = STATUS_CANCELLING
+
+class ConversionJobManager:
+    """ 转换任务管理器：进程池 + 线程池，按需启动 """
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+        self.jobs = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._process_pool = None
+        self._thread_pool = None
+        self._mp_manager = None
+        self._progress_queue = None
+        self._local_queue = queue.Queue()
+        self._drainers = []
+
+    def _ensure_process_pool(self, initializer=None, initargs=()):
+        if self._process_pool is None:
+            # Manager 提供可跨进程传递的队列与事件（首次提交进程任务时才启动）
+            self._mp_manager = multiprocessing.Manager()
+            self._progress_queue = self._mp_manager.Queue()
+            self._process_pool = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                     initializer=initializer, initargs=initargs)
+            self._start_drainer(self._progress_queue)
+        return self._process_pool
+
+    def prestart(self, initializer=None, initargs=()):
+        """ 预先启动进程池与工作进程（initializer 在每个工作进程启动时执行），首次转换无需等待 """
+        with self._lock:
+            pool = self._ensure_process_pool(initializer, initargs)
+            # 进程池在第一次提交时才创建工作进程
+            pool.submit(os.getpid)
+
+    def _ensure_thread_pool(self):
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="convert")
+            self._start_drainer(self._local_queue)
+        return self._thread_pool
+
+    def _start_drainer(self, progress_queue):
+        """ 后台线程读取进度消息并更新任务状态 """
+        def drain():
+            while True:
+                try:
+                    item = progress_queue.get()
+                except (EOFError, OSError, BrokenPipeError):
+                    return
+                if item is None:
+                    return
+                job_id, percent, text = item
+                job = self.get(job_id)
+                if job is not None and not job.finished:
+                    job.progress = max(0, min(100, int(percent)))
+                    if text:
+                        job.message = text
+                    if job.status == STATUS_PENDING:
+                        job.status = STATUS_RUNNING
+        thread = threading.Thread(target=drain, daemon=True)
+        thread.start()
+        self._drainers.append((thread, progress_queue))
+
+    def submit(self, func, *args, name=None, use_process=True, **kwargs):
+        """
+        提交转换任务，返回 ConversionJob（job.future 的结果为转换函数的 (是否成功, 消息)）
+        use_process: CPU 密集型任务放入进程池；依赖 Qt 或自行管理子进程的任务使用线程池
+        """
+        with self._lock:
+            if use_process:
+                pool = self._ensure_process_pool()
+                cancel_event = self._mp_manager.Event()
+                progress_queue = self._progress_queue
+            else:
+                pool = self._ensure_thread_pool()
+                cancel_event = threading.Event()
+                progress_queue = self._local_queue
+            job = ConversionJob(next(self._ids), name or getattr(func, "__name__", "转换任务"), cancel_event)
+            self.jobs.append(job)
+            job.future = pool.submit(_run_job, job.id, func, args, kwargs, progress_queue, cancel_event)
+        job.future.add_done_callback(lambda f, j=job: self._on_done(j, f))
+        return job
+
+    def _on_done(self, job, future):
+        if future.cancelled():
+            job.status = STATUS_CANCELLED
+            return
+        try:
+            success, msg = future.result()
+        except Exception as e:
+            success, msg = False, str(e)
+        job.message = msg
+        try:
+            cancelled = job.cancel_event.is_set()
+        except (EOFError, OSError):
+            # 退出程序时 Manager 可能已先关闭
+            cancelled = False
+        if cancelled and not success:
+            job.status = STATUS_CANCELLED
+        elif success:
+            job.status = STATUS_DONE
+            job.progress = 100
+        else:
+            job.status = STATUS_FAILED
+
+    def get(self, job_id):
+        for job in reversed(self.jobs):
+            if job.id == job_id:
+                return job
+        return None
+
+    def active_jobs(self):
+        return [job for job in self.jobs if not job.finished]
+
+    def clear_finished(self):
+        with self._lock:
+            self.jobs = [job for job in self.jobs if not job.finished]
+
+    def shutdown(self):
+        """ 取消所有任务并关闭进程池（不等待正在运行的转换结束） """
+        for job in list(self.jobs):
+            job.cancel()
+        for pool in (self._process_pool, self._thread_pool):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        for _, progress_queue in self._drainers:
+            try:
+                progress_queue.put(None)
+            except Exception:
+                pass
+        if self._mp_manager is not None:
+            try:
+                self._mp_manager.shutdown()
+            except Exception:
+                pass
+        self._process_pool = self._thread_pool = self._mp_manager = None
+        self._drainers = []
+
+_manager = None
+
+def get_job_manager():
+    """ 全局转换任务管理器 """
+    global _manager
+    if _manager is None:
+        _manager = ConversionJobManager()
+    return _manager
@@ -0,0 +1,102 @@
+"""
+转换后端注册表
+每个转换函数声明所依赖的后端（一组需要导入的模块），后端在第一次使用时才导入，
+PNG 转 JPG 不再需要先加载 pandas、pdf2docx 等重量级库；
+程序启动后可在后台线程中预先导入（预热），并预先启动转换进程池
+"""
+import time
+import functools
+import importlib
+import threading
+
+class Backend:
+    """ 一组转换函数共用的依赖，首次使用时导入并记录耗时 """
+    def __init__(self, name, modules, package, process_lane=False):
+        self.name = name
+        self.modules = modules
+        self.package = package        # 缺失时提示用户安装的包名
+        self.process_lane = process_lane  # 是否在进程池中使用（预热时在工作进程中预先导入）
+        self.import_seconds = None
+        self.error = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self.import_seconds is not None
+
+    def load(self):
+        """ 导入全部依赖模块，返回是否可用；结果（包括失败）只计算一次 """
+        with self._lock:
+            if self.loaded or self.error is not None:
+                return self.error is None
+            start = time.perf_counter()
+            try:
+                for module in self.modules:
+                    importlib.import_module(module)
+            except Exception as e:
+                # 除缺少模块外，依赖库初始化失败也视为不可用（不能让进程池初始化函数抛出异常）
+                self.error = str(e) or type(e).__name__
+                return False
+            self.import_seconds = time.perf_counter() - start
+            return True
+
+BACKENDS = {
+    "pillow": Backend("pillow", ("PIL.Image",), "Pillow", process_lane=True),
+    "qt_svg": Backend("qt_svg", ("PyQt5.QtSvg", "modules.svg_raster"), "PyQt5"),
+    "pdf2docx": Backend("pdf2docx", ("pdf2docx", "docx", "modules.pdf_convert"), "pdf2docx"),
+    "docx2pdf": Backend("docx2pdf", ("docx2pdf",), "docx2pdf", process_lane=True),
+    "office": Backend("office", ("openpyxl", "docx", "lxml.etree", "modules.office_convert"),
+                      "python-docx / openpyxl", process_lane=True),
+    "ffmpeg": Backend("ffmpeg", ("modules.ffmpeg_tools", "modules.video_plan", "modules.video_segments"),
+                      "ffmpeg"),
+}
+
+# 转换函数名 -> 后端名
+CONVERTERS = {}
+
+def uses_backend(name):
+    """ 转换函数装饰器：调用前导入所需后端，缺少依赖时返回 (False, 提示) """
+    backend = BACKENDS[name]
+
+    def decorator(func):
+        CONVERTERS[func.__name__] = name
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not backend.load():
+                return False, f"缺少依赖库 {backend.package}"
+            return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def backend_for(converter_name):
+    return BACKENDS[CONVERTERS[converter_name]]
+
+def preload(names):
+    """ 导入指定后端（忽略缺失的依赖），返回 {后端名: 导入耗时秒或 None} """
+    result = {}
+    for name in names:
+        backend = BACKENDS[name]
+        backend.load()
+        result[name] = backend.import_seconds
+    return result
+
+def _init_worker(names):
+    """ 转换进程池的初始化函数：工作进程启动时预先导入进程池中使用的后端 """
+    preload(names)
+
+def warm_up(names=None, start_pool=True):
+    """
+    在后台线程中预热：导入后端，并预先启动转换进程池（工作进程启动时导入进程池中使用的后端）
+    返回后台线程
+    """
+    names = list(names or BACKENDS)
+
+    def run():
+        if start_pool:
+            from modules.conversion_jobs import get_job_manager
+            get_job_manager().prestart(_init_worker, ([n for n in names if BACKENDS[n].process_lane],))
+        preload(names)
+    thread = threading.Thread(target=run, name="converter-warm-up", daemon=True)
+    thread.start()
+    return thread
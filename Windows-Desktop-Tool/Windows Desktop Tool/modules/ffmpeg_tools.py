@@ -0,0 +1,169 @@
+"""
+ffmpeg 调用封装
+- probe: 用 ffprobe（JSON 输出）读取时长与各路流的编码信息，未安装 ffprobe 时解析 ffmpeg -i 的输出
+- run_ffmpeg: 以 -progress pipe:1 启动 ffmpeg，逐行解析进度流，计算百分比、fps 与速度；
+  日志只保留最后若干行；取消时结束整个进程树
+"""
+import os
+import re
+import json
+import queue
+import shutil
+import threading
+import subprocess
+from collections import deque
+
+# 失败时保留的日志行数
+LOG_TAIL_LINES = 200
+
+def find_tool(name):
+    return shutil.which(name)
+
+def creation_flags():
+    """ Windows 上不弹出控制台窗口 """
+    return getattr(subprocess, "CREATE_NO_WINDOW", 0) if os.name == "nt" else 0
+
+def kill_process_tree(proc):
+    """ 结束进程及其所有子进程 """
+    try:
+        import psutil
+        parent = psutil.Process(proc.pid)
+        for child in parent.children(recursive=True):
+            try:
+                child.kill()
+            except psutil.Error:
+                pass
+    except Exception:
+        pass
+    try:
+        proc.kill()
+    except OSError:
+        pass
+
+def _parse_duration(text):
+    h, m, s = text.split(":")
+    return int(h) * 3600 + int(m) * 60 + float(s)
+
+_DURATION_RE = re.compile(r"Duration: (\d+:\d+:\d+(?:\.\d+)?)")
+_STREAM_RE = re.compile(r"Stream #\d+:(\d+)(?:\[[^\]]*\])?(?:\([^)]*\))?: (Video|Audio|Subtitle|Data|Attachment): (\w+)(.*)")
+_SIZE_RE = re.compile(r", (\d{2,5})x(\d{2,5})")
+
+def _probe_with_ffmpeg(path):
+    """ 没有 ffprobe 时，从 ffmpeg -i 的输出中解析时长与流信息 """
+    result = subprocess.run([find_tool("ffmpeg"), "-hide_banner", "-nostdin", "-i", path],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                            creationflags=creation_flags())
+    text = result.stderr.decode("utf-8", errors="replace")
+    info = {"duration": None, "format": "", "streams": []}
+    match = _DURATION_RE.search(text)
+    if match:
+        info["duration"] = _parse_duration(match.group(1))
+    match = re.search(r"Input #0, ([\w,]+), from", text)
+    if match:
+        info["format"] = match.group(1)
+    for index, kind, codec, rest in _STREAM_RE.findall(text):
+        stream = {"index": int(index), "type": kind.lower(), "codec": codec,
+                  "attached_pic": "(attached pic)" in rest, "width": None, "height": None, "bit_rate": None}
+        size = _SIZE_RE.search(rest) if kind == "Video" else None
+        if size:
+            stream["width"], stream["height"] = int(size.group(1)), int(size.group(2))
+        info["streams"].append(stream)
+    if not info["streams"]:
+        raise RuntimeError(text.strip().splitlines()[-1] if text.strip() else "无法读取媒体信息")
+    return info
+
+def probe(path):
+    """
+    读取媒体信息，返回 {"duration": 秒或 None, "format": 容器名, "streams": [{"index", "type", "codec", ...}]}
+    type 为 video / audio / subtitle / data / attachment
+    """
+    ffprobe = find_tool("ffprobe")
+    if ffprobe is None:
+        return _probe_with_ffmpeg(path)
+    result = subprocess.run([ffprobe, "-v", "error", "-print_format", "json", "-show_format", "-show_streams", path],
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, creationflags=creation_flags())
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.decode("utf-8", errors="replace").strip() or "无法读取媒体信息")
+    data = json.loads(result.stdout.decode("utf-8", errors="replace") or "{}")
+    fmt = data.get("format", {})
+    duration = fmt.get("duration")
+    info = {"duration": float(duration) if duration else None, "format": fmt.get("format_name", ""), "streams": []}
+    for stream in data.get("streams", []):
+        info["streams"].append({
+            "index": stream.get("index"),
+            "type": stream.get("codec_type", ""),
+            "codec": stream.get("codec_name", ""),
+            "attached_pic": bool(stream.get("disposition", {}).get("attached_pic")),
+            "width": stream.get("width"),
+            "height": stream.get("height"),
+            "bit_rate": int(stream["bit_rate"]) if stream.get("bit_rate", "").isdigit() else None,
+        })
+    return info
+
+def _read_lines(stream, sink):
+    for raw in iter(stream.readline, b""):
+        sink(raw.decode("utf-8", errors="replace").rstrip("\r\n"))
+    stream.close()
+
+def run_ffmpeg(args, duration=None, progress_callback=None, cancel_check=None, log_lines=LOG_TAIL_LINES):
+    """
+    运行 ffmpeg（自动添加 -y -progress pipe:1 等参数），返回 (返回码, 日志尾部, 是否被取消)
+    duration: 输出时长（秒），用于计算百分比
+    progress_callback(百分比或 None, {"fps", "speed", "out_time"})：每个进度块回调一次
+    cancel_check: 返回 True 时结束 ffmpeg 进程树
+    """
+    cmd = [find_tool("ffmpeg"), "-hide_banner", "-nostdin", "-y", "-nostats", "-progress", "pipe:1", *args]
+    proc = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                            creationflags=creation_flags())
+    log = deque(maxlen=log_lines)
+    lines = queue.Queue()
+    readers = [threading.Thread(target=_read_lines, args=(proc.stderr, log.append), daemon=True),
+               threading.Thread(target=_read_lines, args=(proc.stdout, lines.put), daemon=True)]
+    for reader in readers:
+        reader.start()
+
+    block = {}
+    cancelled = False
+    while True:
+        try:
+            line = lines.get(timeout=0.25)
+        except queue.Empty:
+            if cancel_check and cancel_check():
+                cancelled = True
+                kill_process_tree(proc)
+                break
+            if not readers[1].is_alive() and lines.empty():
+                break
+            continue
+        key, _, value = line.partition("=")
+        block[key.strip()] = value.strip()
+        if key != "progress":
+            continue
+        # 一个进度块以 progress=continue/end 结束
+        if progress_callback:
+            out_time = None
+            if block.get("out_time_us", "").lstrip("-").isdigit():
+                out_time = max(0, int(block["out_time_us"])) / 1e6
+            percent = None
+            if duration and out_time is not None:
+                percent = min(100.0, out_time / duration * 100)
+            progress_callback(percent, {"fps": block.get("fps", ""), "speed": block.get("speed", "").strip(),
+                                        "out_time": out_time})
+        block = {}
+        if cancel_check and cancel_check():
+            cancelled = True
+            kill_process_tree(proc)
+            break
+
+    proc.wait()
+    for reader in readers:
+        reader.join(timeout=1)
+    return proc.returncode, "\n".join(log), cancelled
+
+_ERROR_HINTS = ("error", "invalid", "failed", "no such file", "not supported", "unknown")
+
+def error_summary(log, lines=3):
+    """ 从日志尾部提取错误信息：优先取包含错误关键字的行，没有时取最后几行 """
+    tail = [line.strip() for line in log.splitlines() if line.strip()]
+    errors = [line for line in tail if any(hint in line.lower() for hint in _ERROR_HINTS)]
+    return "\n".join((errors or tail)[-lines:]) or "未知错误"
@@ -1,143 +1,245 @@
 import os
-import sys
-import subprocess
-import shutil
-from PyQt5.QtGui import QImage, QPainter
-from PyQt5.QtSvg import QSvgRenderer
-from PyQt5.QtCore import QSize, Qt
-from PIL import Image
-import pandas as pd
-
-# 动态导入处理
-try:
-    from pdf2docx import Converter as PDFConverter
-except ImportError:
-    PDFConverter = None
-
-try:
-    from docx2pdf import convert as docx_to_pdf_convert
-except ImportError:
-    docx_to_pdf_convert = None
-
-try:
-    from docx import Document
-except ImportError:
-    Document = None
-
-def svg_to_ico(svg_path, ico_path):
-    """ SVG 转 ICO """
+from modules.conversion_jobs import get_job_manager, is_cancelled, report_progress
+from modules.conversion_cache import cached
+from modules.converter_registry import uses_backend
+
+# 各转换函数依赖的第三方库由 uses_backend 在首次调用时导入（见 modules/converter_registry.py）
+
+@cached()
+@uses_backend("qt_svg")
+def svg_to_ico(svg_path, ico_path, sizes=None):
+    """ SVG 转 ICO，包含 16~256 的全部标准尺寸 """
     try:
-        renderer = QSvgRenderer(svg_path)
-        if not renderer.isValid():
-            return False, "无效的 SVG 文件"
-        
-        # 创建 256x256 高清图
-        image = QImage(256, 256, QImage.Format_ARGB32)
-        image.fill(Qt.transparent)
-        painter = QPainter(image)
-        renderer.render(painter)
-        painter.end()
-        
-        if image.save(ico_path, "ICO"):
+        from modules.svg_raster import export_ico, ICO_SIZES
+        export_ico(svg_path, ico_path, sizes or ICO_SIZES)
+        return True, "转换成功"
+    except Exception as e:
+        return False, str(e)
+
+@cached()
+@uses_backend("qt_svg")
+def svg_to_image(svg_path, output_path, output_format, size=1024):
+    """ SVG 渲染为位图 (PNG, JPG, BMP, WebP)，size 为最长边，保持宽高比 """
+    try:
+        from modules.svg_raster import render_svg
+        if render_svg(svg_path, size).save(output_path, output_format):
             return True, "转换成功"
-        return False, "保存 ICO 失败"
+        return False, "保存失败"
     except Exception as e:
         return False, str(e)
 
-def image_convert(input_path, output_path, output_format):
-    """ 通用图片格式转换 (PNG, JPG, BMP, WebP, etc.) """
+# 缩小图片时先整数倍快速缩小到目标尺寸的该倍数以内，再做一次高质量重采样
+REDUCING_GAP = 2
+
+def scaled_size(size, max_size=None, scale=None):
+    """
+    计算缩放后的尺寸（保持宽高比，不放大）
+    max_size: 最长边像素数，或 (最大宽, 最大高)
+    scale: 缩放比例，如 0.5
+    """
+    width, height = size
+    ratio = 1.0
+    if scale:
+        ratio = min(ratio, float(scale))
+    if max_size:
+        max_w, max_h = (max_size, max_size) if isinstance(max_size, (int, float)) else max_size
+        ratio = min(ratio, max_w / width, max_h / height)
+    if ratio >= 1.0:
+        return size
+    return max(1, round(width * ratio)), max(1, round(height * ratio))
+
+def _resize_image(img, target):
+    """
+    缩小到目标尺寸：JPEG 利用 draft 让解码器直接按 1/2、1/4、1/8 解码，
+    其它格式用 reduce 做整数倍缩小，最后只做一次 LANCZOS 重采样
+    """
+    if img.format == "JPEG":
+        img.draft(None, (target[0] * REDUCING_GAP, target[1] * REDUCING_GAP))
+    if img.mode in ("1", "P"):
+        # 调色板/二值图像无法高质量重采样，先转换（仅此一次）
+        converted = img.convert("RGBA" if img.mode == "P" else "L")
+        img.close()
+        img = converted
+    factor = min(img.width // target[0], img.height // target[1]) // REDUCING_GAP
+    if factor >= 2:
+        reduced = img.reduce(factor)
+        img.close()
+        img = reduced
+    from PIL import Image
+    resized = img.resize(target, Image.LANCZOS)
+    img.close()
+    return resized
+
+@cached()
+@uses_backend("pillow")
+def image_convert(input_path, output_path, output_format, max_size=None, scale=None):
+    """
+    通用图片格式转换 (PNG, JPG, BMP, WebP, etc.)
+    max_size / scale: 可选的缩小参数，见 scaled_size
+    """
+    from PIL import Image
     try:
-        img = Image.open(input_path)
-        # 如果是转 JPG，需要去掉透明通道
-        if output_format.upper() in ["JPG", "JPEG"] and img.mode in ("RGBA", "P"):
-            img = img.convert("RGB")
-        img.save(output_path, output_format.upper())
+        output_format = output_format.upper()
+        if output_format == "JPG":
+            output_format = "JPEG"  # Pillow 中的格式名
+        with Image.open(input_path) as src:
+            img = src
+            target = scaled_size(img.size, max_size, scale)
+            if target != img.size:
+                img = _resize_image(img, target)
+            # 如果是转 JPG，需要去掉透明通道（缩小之后再转换，处理的像素更少）
+            if output_format == "JPEG" and img.mode in ("RGBA", "P", "LA"):
+                converted = img.convert("RGB")
+                if img is not src:
+                    img.close()
+                img = converted
+            try:
+                img.save(output_path, output_format)
+            finally:
+                if img is not src:
+                    img.close()
         return True, "转换成功"
     except Exception as e:
         return False, str(e)
 
-def pdf_to_word(pdf_path, docx_path):
-    """ PDF 转 Word """
-    if PDFConverter is None:
-        return False, "缺少依赖库 pdf2docx"
+@cached(ignore=("workers",))
+@uses_backend("pdf2docx")
+def pdf_to_word(pdf_path, docx_path, workers=None):
+    """ PDF 转 Word（页数较多时按页拆分到多个进程并行转换） """
     try:
-        cv = PDFConverter(pdf_path)
-        cv.convert(docx_path, start=0, end=None)
-        cv.close()
-        return True, "转换成功"
+        from modules.pdf_convert import pdf_to_word_parallel
+        return pdf_to_word_parallel(pdf_path, docx_path, workers)
     except Exception as e:
         return False, str(e)
 
+@cached()
+@uses_backend("docx2pdf")
 def word_to_pdf(docx_path, pdf_path):
     """ Word 转 PDF (需要系统安装有 MS Word) """
-    if docx_to_pdf_convert is None:
-        return False, "缺少依赖库 docx2pdf"
+    from docx2pdf import convert
     try:
-        docx_to_pdf_convert(docx_path, pdf_path)
+        convert(docx_path, pdf_path)
         return True, "转换成功"
     except Exception as e:
         return False, str(e)
 
+@cached()
+@uses_backend("office")
 def word_to_excel(docx_path, excel_path):
-    """ 提取 Word 中的表格到 Excel """
-    if Document is None:
-        return False, "缺少依赖库 python-docx"
+    """ 提取 Word 中的表格到 Excel（直接解析文档 XML，适合包含大量表格的文档） """
     try:
-        doc = Document(docx_path)
-        all_tables = []
-        for i, table in enumerate(doc.tables):
-            data = []
-            for row in table.rows:
-                data.append([cell.text for cell in row.cells])
-            df = pd.DataFrame(data)
-            all_tables.append(df)
-        
-        if not all_tables:
-            return False, "Word 文档中未找到任何表格"
-            
-        with pd.ExcelWriter(excel_path) as writer:
-            for i, df in enumerate(all_tables):
-                df.to_excel(writer, sheet_name=f'Table_{i+1}', index=False, header=False)
-        return True, "成功提取表格到 Excel"
+        from modules.office_convert import word_to_excel_stream
+        return word_to_excel_stream(docx_path, excel_path)
     except Exception as e:
         return False, str(e)
 
+@cached()
+@uses_backend("office")
 def excel_to_word(excel_path, docx_path):
-    """ 将 Excel 工作表转为 Word 表格 """
-    if Document is None:
-        return False, "缺少依赖库 python-docx"
+    """ 将 Excel 工作表转为 Word 表格（流式读取与写出，适合大型工作簿） """
     try:
-        xls = pd.ExcelFile(excel_path)
-        doc = Document()
-        for sheet_name in xls.sheet_names:
-            df = pd.read_excel(excel_path, sheet_name=sheet_name)
-            doc.add_heading(f'Sheet: {sheet_name}', level=1)
-            table = doc.add_table(rows=df.shape[0] + 1, cols=df.shape[1])
-            # 添加表头
-            for j in range(df.shape[1]):
-                table.cell(0, j).text = str(df.columns[j])
-            # 添加数据
-            for i in range(df.shape[0]):
-                for j in range(df.shape[1]):
-                    table.cell(i + 1, j).text = str(df.values[i, j])
-            doc.add_page_break()
-            
-        doc.save(docx_path)
-        return True, "成功将 Excel 转为 Word 表格"
+        from modules.office_convert import excel_to_word_stream
+        return excel_to_word_stream(excel_path, docx_path)
     except Exception as e:
         return False, str(e)
 
 
-def video_convert(input_path, output_path, target_format=None):
-    """ 通用视频格式转换，依赖系统已安装 ffmpeg """
+@cached(ignore=("segmented", "workers"))
+@uses_backend("ffmpeg")
+def video_convert(input_path, output_path, target_format=None, segmented=None, workers=None):
+    """
+    通用视频格式转换，依赖系统已安装 ffmpeg；转换过程中上报进度，可随时取消
+    先按各路流的编码规划方案：目标容器支持的流直接复制，只对不兼容的流转码
+    segmented: 是否分段并行转码视频流，None 表示仅在编码器扩展性较差（见 video_segments.POOR_SCALING_ENCODERS）、
+               长视频且多核时自动启用，libx264 等默认编码器不分段；workers: 并行的 ffmpeg 进程数
+    """
     try:
-        if shutil.which("ffmpeg") is None:
+        from modules.ffmpeg_tools import find_tool, probe, run_ffmpeg, error_summary
+        from modules.video_plan import plan_conversion
+        if find_tool("ffmpeg") is None:
             return False, "未检测到 ffmpeg，请先安装并配置环境变量"
-        cmd = ["ffmpeg", "-y", "-i", input_path, output_path]
-        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        if result.returncode == 0:
-            return True, "转换成功"
-        msg = result.stderr.decode("utf-8", errors="ignore").strip() or "未知错误"
-        return False, msg
+        try:
+            info = probe(input_path)
+        except Exception:
+            info = None
+        duration = info["duration"] if info else None
+        plan = None
+        if info:
+            try:
+                plan = plan_conversion(info, target_format or output_path)
+            except ValueError:
+                plan = None
+
+        if plan and segmented is not False:
+            from modules.video_segments import can_split, transcode_segmented
+            workers = workers or os.cpu_count() or 1
+            if can_split(plan, duration, workers, force=bool(segmented)):
+                success, msg = transcode_segmented(input_path, output_path, plan, duration, workers)
+                if not success:
+                    _remove_partial(output_path)
+                return success, msg
+
+        def on_progress(percent, stats):
+            text = f"{stats['fps'] or 0} fps，{stats['speed'] or '-'}"
+            report_progress(percent if percent is not None else 0, text)
+
+        # 无法读取流信息时交给 ffmpeg 按默认规则转码
+        output_args = plan["args"] if plan else []
+        returncode, log, cancelled = run_ffmpeg(["-i", input_path, *output_args, output_path], duration,
+                                                on_progress, is_cancelled)
+        if cancelled:
+            _remove_partial(output_path)
+            return False, "已取消"
+        if returncode == 0:
+            return True, "转换成功（直接复制流）" if plan and plan["mode"] == "remux" else "转换成功"
+        _remove_partial(output_path)
+        return False, error_summary(log)
     except Exception as e:
         return False, str(e)
+
+def _remove_partial(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+# 按 输入扩展名 + 目标格式 选择转换函数（监视文件夹与命令行模式使用）
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".webp", ".bmp", ".gif", ".tif", ".tiff"}
+VIDEO_EXTENSIONS = {".mp4", ".mkv", ".mov", ".avi", ".flv", ".wmv"}
+IMAGE_TARGETS = {"png": "PNG", "jpg": "JPG", "webp": "WEBP", "bmp": "BMP", "ico": "ICO"}
+VIDEO_TARGETS = {"mp4", "mkv", "mov", "avi"}
+_DOCUMENT_CONVERTERS = {
+    (".pdf", "docx"): "pdf_to_word",
+    (".docx", "pdf"): "word_to_pdf",
+    (".docx", "xlsx"): "word_to_excel",
+    (".xlsx", "docx"): "excel_to_word",
+}
+
+def resolve_conversion(ext, target):
+    """ 返回 (file_converter 中的转换函数名, 额外参数)，不支持的组合返回 None """
+    ext, target = ext.lower(), target.lower()
+    if ext == ".svg":
+        if target == "ico":
+            return "svg_to_ico", ()
+        if target in IMAGE_TARGETS:
+            return "svg_to_image", (IMAGE_TARGETS[target],)
+    elif ext in IMAGE_EXTENSIONS and target in IMAGE_TARGETS:
+        return "image_convert", (IMAGE_TARGETS[target],)
+    elif ext in VIDEO_EXTENSIONS and target in VIDEO_TARGETS:
+        return "video_convert", (target,)
+    elif (ext, target) in _DOCUMENT_CONVERTERS:
+        return _DOCUMENT_CONVERTERS[(ext, target)], ()
+    return None
+
+# 依赖 Qt 绘制或自行启动子进程的转换在线程池中执行，其余放入进程池
+_THREAD_CONVERTERS = {"svg_to_ico", "svg_to_image", "video_convert", "pdf_to_word"}
+
+def submit_conversion(func, *args, name=None, manager=None, **kwargs):
+    """
+    提交转换任务到后台任务队列，立即返回 Future，结果为 (是否成功, 消息)
+    任务进度与状态可通过 modules.conversion_jobs.get_job_manager().jobs 查看
+    manager: 使用指定的 ConversionJobManager（默认为全局任务管理器）
+    """
+    job = (manager or get_job_manager()).submit(func, *args, name=name,
+                                                use_process=func.__name__ not in _THREAD_CONVERTERS, **kwargs)
+    return job.future
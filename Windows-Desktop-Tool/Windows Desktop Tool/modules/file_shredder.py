@@ -1,81 +1,270 @@
 import os
+import bisect
+import ntpath
 import shutil
 import stat
+import threading
 import psutil
-from PyQt5.QtCore import QThread, pyqtSignal
 
-def is_system_path(path, check_processes=False):
+# 系统盘下受保护的关键目录/文件（相对系统盘根目录）
+_BUILTIN_PROTECTED = [
+    "windows",
+    "program files",
+    "program files (x86)",
+    "users\\default",
+    # 补充一些极其关键的
+    "boot",
+    "recovery",
+    "pagefile.sys",
+    "swapfile.sys",
+    "hiberfil.sys",
+    "msocache",
+    "system volume information",
+    # 注册表相关系统文件 (通常在 System32\config)
+    "windows\\system32\\config",
+]
+
+_REASON_SYSTEM = "检测到系统关键文件，为防止系统损坏，已禁止操作"
+_REASON_ROOT = "禁止对系统盘根目录进行粉碎操作"
+_REASON_USER = "该路径已被设置为受保护路径，已禁止操作"
+
+def split_path(path):
+    """
+    将路径归一化为小写的路径分量元组
+    工具仅面向 Windows，统一按 Windows 路径规则处理（盘符/UNC、大小写、分隔符、"."/".."、末尾的点和空格）
+    """
+    path = os.fspath(path).replace("/", "\\").lower()
+    drive, rest = ntpath.splitdrive(path)
+    if not drive or not rest.startswith("\\"):
+        # 相对路径或 "C:foo" 这类盘符相对路径才需要借助当前目录展开
+        drive, rest = ntpath.splitdrive(ntpath.abspath(path).lower())
+    parts = [drive.rstrip("\\")]
+    for part in rest.split("\\"):
+        if part == "..":
+            if len(parts) > 1:
+                parts.pop()
+            continue
+        # Win32 会忽略分量末尾的点和空格，"windows." 与 "windows" 指向同一目录
+        part = part.rstrip(". ")
+        if part:
+            parts.append(part)
+    return tuple(parts)
+
+class ProtectedPathIndex:
+    """
+    受保护路径索引：按路径分量构建的前缀树
+    - 子树规则：命中该节点即受保护（覆盖其下所有文件）
+    - 精确规则：仅路径本身受保护（如系统盘根目录）
+    按分量匹配，避免 "C:\\windowsfoo" 被 "C:\\windows" 误判
+    """
+    def __init__(self):
+        self._root = {}
+        self.rule_count = 0
+
+    def add(self, path, reason, subtree=True):
+        node = self._root
+        for part in split_path(path):
+            node = node.setdefault(part, {})
+        # 使用空字符串作为规则键，不会与真实路径分量冲突
+        rule = node.get("")
+        if rule is None or (subtree and not rule[0]):
+            node[""] = (subtree, reason)
+            self.rule_count += 1
+
+    def match(self, path):
+        """ 返回 (是否受保护, 原因) """
+        return self.match_parts(split_path(path))
+
+    def match_parts(self, parts):
+        node = self._root
+        for part in parts:
+            node = node.get(part)
+            if node is None:
+                return False, ""
+            rule = node.get("")
+            if rule is not None and rule[0]:
+                return True, rule[1]
+        rule = node.get("")
+        if rule is not None:
+            return True, rule[1]
+        return False, ""
+
+def build_protected_index(user_paths=None):
+    """ 根据系统环境与用户规则构建受保护路径索引 """
+    system_drive = os.environ.get('SystemDrive', 'C:')
+    index = ProtectedPathIndex()
+    # 白名单增强建议：禁止粉碎系统盘根目录
+    index.add(system_drive + "\\", _REASON_ROOT, subtree=False)
+    for rel in _BUILTIN_PROTECTED:
+        index.add(ntpath.join(system_drive + "\\", rel), _REASON_SYSTEM)
+    for user_path in user_paths or []:
+        user_path = os.path.expandvars(str(user_path)).strip()
+        if user_path:
+            index.add(user_path, _REASON_USER)
+    return index
+
+_protected_index = None
+_user_protected_paths = []
+
+def get_protected_index():
+    """ 获取全局受保护路径索引（首次使用时构建，之后复用） """
+    global _protected_index
+    if _protected_index is None:
+        _protected_index = build_protected_index(_user_protected_paths)
+    return _protected_index
+
+def set_user_protected_paths(paths):
+    """ 更新用户自定义的受保护路径，下次检查时重建索引 """
+    global _protected_index, _user_protected_paths
+    _user_protected_paths = list(paths or [])
+    _protected_index = None
+
+# PID 不大于该值的进程视为系统关键进程
+_SYSTEM_PID_MAX = 1000
+
+class LockHolderIndex:
+    """
+    文件占用索引：一次性快照所有进程打开的文件句柄，建立 归一化路径 -> PID 映射
+    之后对整批文件的占用检查都只是字典查找，不再逐个路径遍历全部进程
+    """
+    def __init__(self):
+        self._holders = {}        # 路径分量元组 -> {pid}
+        self._files_by_pid = {}   # pid -> [路径分量元组]
+        self._names = {}          # pid -> 进程名
+        self._sorted_keys = None  # 文件夹前缀查询用的有序键列表（按需构建）
+
+    def snapshot(self):
+        """ 全量扫描一次所有进程的打开文件 """
+        self._holders.clear()
+        self._files_by_pid.clear()
+        self._names.clear()
+        self._scan(psutil.process_iter(['pid', 'name', 'open_files']))
+        return self
+
+    def refresh(self, pids=None):
+        """
+        增量刷新
+        pids: 需要重新扫描的进程；为空时仅处理新启动和已退出的进程
+        """
+        current = set(psutil.pids())
+        for pid in list(self._names):
+            if pid not in current:
+                self._forget(pid)
+        if pids is None:
+            pids = current - set(self._names)
+        procs = []
+        for pid in pids:
+            self._forget(pid)
+            if pid not in current:
+                continue
+            try:
+                procs.append(psutil.Process(pid))
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+        self._scan(procs, fetch=True)
+        return self
+
+    def _scan(self, procs, fetch=False):
+        for proc in procs:
+            try:
+                if fetch:
+                    info = proc.as_dict(['pid', 'name', 'open_files'])
+                else:
+                    info = proc.info
+                pid = info['pid']
+                self._names[pid] = info.get('name') or ""
+                keys = []
+                for file in info.get('open_files') or []:
+                    key = split_path(file.path)
+                    self._holders.setdefault(key, set()).add(pid)
+                    keys.append(key)
+                self._files_by_pid[pid] = keys
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+        self._sorted_keys = None
+
+    def _forget(self, pid):
+        for key in self._files_by_pid.pop(pid, []):
+            pids = self._holders.get(key)
+            if pids is not None:
+                pids.discard(pid)
+                if not pids:
+                    del self._holders[key]
+        self._names.pop(pid, None)
+        self._sorted_keys = None
+
+    def holder_pids(self, path, recursive=False):
+        """ 占用该路径的进程 PID 集合；recursive=True 时包含文件夹内的所有文件 """
+        parts = split_path(path)
+        pids = set(self._holders.get(parts, ()))
+        if recursive:
+            if self._sorted_keys is None:
+                self._sorted_keys = sorted(self._holders)
+            size = len(parts)
+            for i in range(bisect.bisect_right(self._sorted_keys, parts), len(self._sorted_keys)):
+                key = self._sorted_keys[i]
+                if key[:size] != parts:
+                    break
+                pids.update(self._holders[key])
+        return pids
+
+    def holders(self, path, recursive=False):
+        """ 占用该路径的进程列表 [(pid, 进程名)] """
+        return [(pid, self._names.get(pid, "")) for pid in sorted(self.holder_pids(path, recursive))]
+
+    def is_held_by_system(self, path):
+        return any(pid <= _SYSTEM_PID_MAX for pid in self.holder_pids(path))
+
+def format_holders(holders, limit=3):
+    """ 将占用进程列表格式化为 "name(pid), ..." """
+    text = ", ".join(f"{name or '未知'}({pid})" for pid, name in holders[:limit])
+    if len(holders) > limit:
+        text += f" 等 {len(holders)} 个进程"
+    return text
+
+def is_system_path(path, check_processes=False, lock_index=None):
     """
     检查路径是否为系统关键文件路径
-    check_processes: 是否检查进程占用（耗时操作，默认关闭以提高性能）
+    check_processes: 是否检查进程占用（未传入 lock_index 时需要扫描全部进程，批量检查请复用同一个索引）
     """
     try:
-        path = os.path.abspath(path).lower()
-        system_drive = os.environ.get('SystemDrive', 'C:').lower()
-        
-        # 关键目录列表
-        critical_dirs = [
-            os.path.join(system_drive, "\\windows").lower(),
-            os.path.join(system_drive, "\\program files").lower(),
-            os.path.join(system_drive, "\\program files (x86)").lower(),
-            os.path.join(system_drive, "\\users\\default").lower(),
-            # 补充一些极其关键的
-            os.path.join(system_drive, "\\boot").lower(),
-            os.path.join(system_drive, "\\recovery").lower(),
-            os.path.join(system_drive, "\\pagefile.sys").lower(),
-            os.path.join(system_drive, "\\swapfile.sys").lower(),
-            os.path.join(system_drive, "\\hiberfil.sys").lower(),
-            os.path.join(system_drive, "\\msocache").lower(),
-            os.path.join(system_drive, "\\system volume information").lower(),
-        ]
-        
-        # 注册表相关系统文件 (通常在 System32\config)
-        reg_files_dir = os.path.join(system_drive, "\\windows\\system32\\config").lower()
-        critical_dirs.append(reg_files_dir)
-        
-        # 白名单增强建议：禁止粉碎系统盘根目录下的文件
-        if path == system_drive + "\\" or path == system_drive:
-            return True, "禁止对系统盘根目录进行粉碎操作"
-
-        for critical in critical_dirs:
-            if path.startswith(critical):
-                return True, "检测到系统关键文件，为防止系统损坏，已禁止操作"
+        is_sys, reason = get_protected_index().match(path)
+        if is_sys:
+            return True, reason
 
         # 检查是否被系统关键进程占用 (仅在 check_processes=True 时执行)
         if check_processes:
-            abs_path = os.path.abspath(path)
-            for proc in psutil.process_iter(['pid', 'open_files']):
-                try:
-                    if proc.info['pid'] <= 1000:
-                        for file in proc.info.get('open_files') or []:
-                            if os.path.abspath(file.path) == abs_path:
-                                return True, "此文件正在被系统关键进程占用，禁止操作"
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    continue
+            if lock_index is None:
+                lock_index = LockHolderIndex().snapshot()
+            if lock_index.is_held_by_system(path):
+                return True, "此文件正在被系统关键进程占用，禁止操作"
     except Exception:
         pass
 
     return False, ""
 
-def try_kill_locking_processes(path):
-    """尝试终止占用该文件的进程"""
+def try_kill_locking_processes(path, lock_index=None):
+    """尝试终止占用该文件（或文件夹内文件）的进程"""
     try:
-        abs_path = os.path.abspath(path)
-        for proc in psutil.process_iter(['pid', 'name', 'open_files']):
+        if lock_index is None:
+            lock_index = LockHolderIndex().snapshot()
+        for pid in lock_index.holder_pids(path, recursive=True):
             try:
-                for file in proc.info.get('open_files') or []:
-                    if os.path.abspath(file.path) == abs_path:
-                        proc.terminate()
+                psutil.Process(pid).terminate()
             except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
                 continue
     except Exception:
         pass
 
-def force_delete(path):
+def force_delete(path, lock_index=None):
     """
     尝试强制删除文件或文件夹
+    lock_index: 可选的文件占用索引，批量删除时复用以避免重复扫描进程
     """
     try:
+        if is_reparse_point(path):
+            _remove_link(path)
+            return True, "已删除链接（未改动链接目标）"
         if not os.path.exists(path):
             return True, "文件已不存在"
 
@@ -90,21 +279,18 @@ def force_delete(path):
                 return True, "成功粉碎"
         except (PermissionError, OSError):
             # 如果失败（可能是被占用），尝试解除占用后重试
-            try_kill_locking_processes(path)
+            if lock_index is not None:
+                # 快照之后新启动的进程也可能占用文件
+                lock_index.refresh()
+            try_kill_locking_processes(path, lock_index)
             
             # 再次尝试删除
             if os.path.isfile(path) or os.path.islink(path):
                 os.chmod(path, stat.S_IWRITE)
                 os.remove(path)
             elif os.path.isdir(path):
-                # 递归处理只读属性并删除
-                for root, dirs, files in os.walk(path):
-                    for momo in dirs:
-                        try: os.chmod(os.path.join(root, momo), stat.S_IWRITE)
-                        except: pass
-                    for momo in files:
-                        try: os.chmod(os.path.join(root, momo), stat.S_IWRITE)
-                        except: pass
+                # 递归处理只读属性并删除（不进入目录联接，避免改动目标之外的文件）
+                _clear_readonly(path)
                 shutil.rmtree(path, onerror=remove_readonly)
             return True, "成功粉碎"
             
@@ -116,71 +302,334 @@ def remove_readonly(func, path, _):
     os.chmod(path, stat.S_IWRITE)
     func(path)
 
-class ValidationWorker(QThread):
+# 默认覆写遍数、覆写缓冲区大小（也是取消/暂停检查的粒度）、中途 fsync 间隔
+DEFAULT_PASSES = 1
+OVERWRITE_BUFFER = 1024 * 1024
+SYNC_INTERVAL = 64 * 1024 * 1024
+_REPARSE_POINT = stat.FILE_ATTRIBUTE_REPARSE_POINT
+
+class ShredCancelled(Exception):
+    """ 粉碎任务被用户取消 """
+
+class ShredControl:
     """
-    后台校验文件占用情况（性能优化版：仅执行快速路径校验）
+    粉碎任务的取消/暂停控制，由覆写循环在每个缓冲区写入前检查
     """
-    finished = pyqtSignal(str, bool, str) # 路径, 是否是系统文件, 原因
+    def __init__(self):
+        self._cancel = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
 
-    def __init__(self, paths):
-        super().__init__()
-        self.paths = [os.path.abspath(p).lower() for p in paths]
-        self.path_map = {os.path.abspath(p).lower(): p for p in paths}
+    def cancel(self):
+        self._cancel.set()
+        # 暂停中被取消时也要立即唤醒
+        self._running.set()
 
-    def run(self):
-        # 批量匹配路径，跳过耗时的进程扫描
-        for abs_path_lower in self.paths:
-            original_path = self.path_map[abs_path_lower]
-            
-            # 执行快速路径检查
-            is_sys, reason = is_system_path(original_path, check_processes=False)
-            if is_sys:
-                self.finished.emit(original_path, True, reason)
-            else:
-                self.finished.emit(original_path, False, "")
-
-class ShredderWorker(QThread):
-    progress = pyqtSignal(int, str)
-    file_finished = pyqtSignal(str, bool, str) # 路径, 是否成功, 消息
-    finished = pyqtSignal(int, int, list) # 成功数, 失败数, 错误列表
-
-    def __init__(self, paths):
-        super().__init__()
-        self.paths = paths
-
-    def run(self):
-        success_count = 0
-        fail_count = 0
-        errors = []
-        total = len(self.paths)
-
-        for i, path in enumerate(self.paths):
-            # 最后的安全检查
-            is_sys, _ = is_system_path(path)
-            if is_sys:
-                fail_count += 1
-                msg = "系统关键文件，禁止操作"
-                errors.append(f"{path}: {msg}")
-                self.file_finished.emit(path, False, msg)
+    def pause(self):
+        self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    @property
+    def paused(self):
+        return not self._running.is_set()
+
+    def checkpoint(self):
+        """ 暂停时阻塞，被取消时抛出 ShredCancelled """
+        if not self._running.is_set():
+            self._running.wait()
+        if self._cancel.is_set():
+            raise ShredCancelled()
+
+def is_reparse_point(path, st=None):
+    """
+    是否为符号链接或目录联接（junction）等重解析点
+    Windows 上 os.path.islink 不识别目录联接，os.walk 也会进入其中，需要检查文件属性
+    """
+    try:
+        st = st or os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISLNK(st.st_mode) or bool(getattr(st, "st_file_attributes", 0) & _REPARSE_POINT)
+
+def _scan_dir(path):
+    """ 列出文件夹内容：[(路径, lstat 结果)]，无法读取时返回空列表（与 os.walk 相同，忽略错误） """
+    entries = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    entries.append((entry.path, entry.stat(follow_symlinks=False)))
+                except OSError:
+                    pass
+    except OSError:
+        pass
+    return entries
+
+def iter_target_files(path, on_skip=None):
+    """
+    列出目标下需要覆写的普通文件
+    - 不进入、不覆写符号链接与目录联接，避免覆写到目标之外
+    - 进入每个文件夹前、覆写每个文件前检查受保护路径，命中时跳过并调用 on_skip(路径, 原因)
+    """
+    for file_path, _ in iter_target_entries(path, on_skip):
+        yield file_path
+
+def iter_target_entries(path, on_skip=None):
+    """ 同 iter_target_files，同时给出每个文件的 lstat 结果：(路径, lstat) """
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return
+    if is_reparse_point(path, st):
+        return
+    if stat.S_ISREG(st.st_mode):
+        yield path, st
+        return
+    index = get_protected_index()
+    folders = [path]
+    while folders:
+        for entry_path, st in _scan_dir(folders.pop()):
+            if is_reparse_point(entry_path, st):
                 continue
+            protected, reason = index.match(entry_path)
+            if protected:
+                if on_skip:
+                    on_skip(entry_path, reason)
+            elif stat.S_ISDIR(st.st_mode):
+                folders.append(entry_path)
+            elif stat.S_ISREG(st.st_mode):
+                yield entry_path, st
+
+def _remove_link(path, st=None):
+    """ 只删除链接本身，不影响链接目标（Windows 上目录联接与目录符号链接需用 rmdir 删除） """
+    st = st or os.lstat(path)
+    if os.name == "nt" and getattr(st, "st_file_attributes", 0) & stat.FILE_ATTRIBUTE_DIRECTORY:
+        os.rmdir(path)
+    else:
+        os.remove(path)
+
+def _clear_readonly(path):
+    """ 清除文件夹内各项的只读属性（不进入链接） """
+    for entry_path, st in _scan_dir(path):
+        try:
+            os.chmod(entry_path, stat.S_IWRITE)
+        except OSError:
+            pass
+        if stat.S_ISDIR(st.st_mode) and not is_reparse_point(entry_path, st):
+            _clear_readonly(entry_path)
 
-            if not os.path.exists(path):
-                fail_count += 1
-                msg = "文件不存在"
-                errors.append(f"{path}: {msg}")
-                self.file_finished.emit(path, False, msg)
+def _remove_unprotected(path):
+    """
+    目标中含有受保护的项目时使用：只删除其余内容（链接只删除链接本身），保留受保护项目及其上级文件夹
+    返回是否删除了目标本身
+    """
+    index = get_protected_index()
+    for entry_path, st in _scan_dir(path):
+        try:
+            if is_reparse_point(entry_path, st):
+                _remove_link(entry_path, st)
+            elif index.match(entry_path)[0]:
                 continue
-            
-            self.progress.emit(int(i / total * 100), f"正在粉碎: {os.path.basename(path)}")
-            
-            # 尝试解除占用
-            success, msg = force_delete(path)
-            if success:
-                success_count += 1
-                self.file_finished.emit(path, True, "已粉碎")
+            elif stat.S_ISDIR(st.st_mode):
+                _remove_unprotected(entry_path)
             else:
-                fail_count += 1
-                errors.append(f"{path}: {msg}")
-                self.file_finished.emit(path, False, msg)
-        
-        self.finished.emit(success_count, fail_count, errors)
+                os.chmod(entry_path, stat.S_IWRITE)
+                os.remove(entry_path)
+        except OSError:
+            pass
+    try:
+        os.rmdir(path)
+        return True
+    except OSError:
+        return False
+
+def overwrite_file(path, passes=DEFAULT_PASSES, start_pass=0, on_pass=None, control=None):
+    """
+    用随机数据原地覆写文件，每遍结束后 fsync 确保真正写入磁盘
+    on_pass(已完成遍数): 每完成一遍时回调（用于记录日志）
+    control: ShredControl，每写一个缓冲区检查一次取消/暂停；
+             取消时抛出 ShredCancelled，若文件已开始覆写则异常参数为该路径，
+             已完成的遍数已通过 on_pass 记录
+    """
+    touched = start_pass > 0
+    try:
+        if control:
+            control.checkpoint()
+        os.chmod(path, stat.S_IWRITE)
+        size = os.path.getsize(path)
+        with open(path, "r+b", buffering=0) as f:
+            for n in range(start_pass, passes):
+                f.seek(0)
+                block = os.urandom(OVERWRITE_BUFFER)
+                remaining = size
+                unsynced = 0
+                while remaining > 0:
+                    if control:
+                        control.checkpoint()
+                    chunk = min(remaining, OVERWRITE_BUFFER)
+                    f.write(block[:chunk] if chunk < OVERWRITE_BUFFER else block)
+                    touched = True
+                    remaining -= chunk
+                    unsynced += chunk
+                    # 定期落盘，避免大量脏页在结束时集中刷新导致取消响应变慢
+                    if unsynced >= SYNC_INTERVAL:
+                        os.fsync(f.fileno())
+                        unsynced = 0
+                os.fsync(f.fileno())
+                if on_pass:
+                    on_pass(n + 1)
+    except ShredCancelled:
+        if touched:
+            raise ShredCancelled(path)
+        raise
+
+def shred_paths(paths, passes=DEFAULT_PASSES, resume=None, control=None, on_progress=None, on_file=None):
+    """
+    依次粉碎各路径（不依赖界面，ShredderWorker 与命令行共用），全程记录日志以便中断后继续
+    resume: 从日志恢复的未完成任务（JournalState），跳过已完成的文件与覆写遍数
+    on_progress(百分比, 文本) / on_file(路径, 是否成功, 消息): 进度回调
+    返回任务汇总（含取消时已处理/未处理的项目与错误列表）
+    """
+    from modules.shred_journal import ShredJournal
+
+    control = control or ShredControl()
+    passes = resume.passes if resume else passes
+    success_count = 0
+    fail_count = 0
+    errors = []
+    protected = []  # 目标中跳过的受保护项目
+    total = len(paths)
+
+    def file_finished(path, success, msg):
+        if on_file:
+            on_file(path, success, msg)
+
+    try:
+        lock_index = LockHolderIndex().snapshot()
+    except Exception:
+        lock_index = None
+
+    journal = ShredJournal()
+    try:
+        if resume:
+            journal.resume()
+        else:
+            journal.begin(paths, passes)
+    except OSError:
+        journal = None
+
+    interrupted = None
+    processed = 0
+    for i, path in enumerate(paths):
+        if control.cancelled:
+            break
+        processed = i + 1
+        # 最后的安全检查
+        is_sys, _ = is_system_path(path, check_processes=lock_index is not None, lock_index=lock_index)
+        if is_sys:
+            fail_count += 1
+            msg = "系统关键文件，禁止操作"
+            errors.append(f"{path}: {msg}")
+            file_finished(path, False, msg)
+            continue
+
+        if not os.path.exists(path):
+            if resume:
+                # 上次中断前已删除，只是完成记录尚未落盘
+                success_count += 1
+                file_finished(path, True, "已粉碎")
+                if journal:
+                    journal.target_done(path, True)
+                continue
+            fail_count += 1
+            msg = "文件不存在"
+            errors.append(f"{path}: {msg}")
+            file_finished(path, False, msg)
+            continue
+
+        if on_progress:
+            on_progress(int(i / total * 100), f"正在粉碎: {os.path.basename(path)}")
+
+        skipped = []
+
+        def on_skip(skip_path, reason):
+            skipped.append(skip_path)
+            protected.append(f"{skip_path}: {reason}")
+            file_finished(skip_path, False, f"已跳过: {reason}")
+
+        try:
+            success, msg = _overwrite_target(path, passes, resume, control, journal, lock_index, on_skip)
+        except ShredCancelled as e:
+            # 正在覆写的文件保持在日志记录的状态，可在下次启动时继续
+            interrupted = e.args[0] if e.args else None
+            processed = i
+            msg = "已取消（部分覆写，可继续）" if interrupted else "已取消"
+            file_finished(path, False, msg)
+            break
+        if success and skipped:
+            # 受保护的项目原样保留，只删除已覆写的内容
+            _remove_unprotected(path)
+            msg = f"已粉碎（跳过 {len(skipped)} 个受保护项目）"
+        elif success:
+            # 尝试解除占用
+            success, msg = force_delete(path, lock_index)
+            msg = "已粉碎" if success else msg
+        if success:
+            success_count += 1
+            file_finished(path, True, msg)
+        else:
+            fail_count += 1
+            errors.append(f"{path}: {msg}")
+            file_finished(path, False, msg)
+        if journal:
+            journal.target_done(path, success)
+
+    if journal:
+        if interrupted:
+            # 保留日志，下次启动时提示继续未完成的覆写
+            journal.close()
+        else:
+            journal.finish()
+
+    return {
+        "cancelled": control.cancelled,
+        "success": success_count,
+        "failed": fail_count,
+        "skipped": paths[processed:],
+        "interrupted": interrupted,
+        "protected": protected,
+        "errors": errors,
+    }
+
+def _overwrite_target(path, passes, resume, control, journal, lock_index, on_skip=None):
+    """ 覆写目标下的所有文件，已在日志中完成的文件与受保护的项目直接跳过 """
+    for file_path in iter_target_files(path, on_skip):
+        if resume and file_path in resume.done_files:
+            continue
+        if control.cancelled:
+            raise ShredCancelled()
+        start_pass = resume.completed_passes(file_path) if resume else 0
+        on_pass = None
+        if journal:
+            journal.plan(file_path, os.path.getsize(file_path), passes)
+            on_pass = lambda n, p=file_path: journal.pass_done(p, n)
+        try:
+            try:
+                overwrite_file(file_path, passes, start_pass, on_pass, control)
+            except PermissionError:
+                # 可能被占用，解除占用后重试一次
+                if lock_index is not None:
+                    lock_index.refresh()
+                try_kill_locking_processes(file_path, lock_index)
+                overwrite_file(file_path, passes, start_pass, on_pass, control)
+        except OSError as e:
+            return False, f"覆写失败: {e}"
+        if journal:
+            journal.file_done(file_path)
+    return True, ""
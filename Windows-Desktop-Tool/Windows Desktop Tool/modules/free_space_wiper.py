@@ -0,0 +1,157 @@
+"""
+空闲空间擦除
+在目标卷上创建大尺寸的填充文件写满空闲空间，覆盖已删除文件残留的数据，完成后删除填充文件
+"""
+import os
+import errno
+import shutil
+import threading
+import time
+import uuid
+import psutil
+from PyQt5.QtCore import QThread, pyqtSignal
+
+# 填充文件大小、单次写入大小
+FILL_FILE_SIZE = 1024 * 1024 * 1024
+WRITE_BLOCK = 8 * 1024 * 1024
+# 预留空间：至少 256MB 或卷容量的 1%，避免系统因磁盘写满而异常
+MIN_RESERVE = 256 * 1024 * 1024
+RESERVE_RATIO = 0.01
+
+def reserve_bytes(target_dir):
+    return max(MIN_RESERVE, int(psutil.disk_usage(target_dir).total * RESERVE_RATIO))
+
+def _preallocate(f, size):
+    """ 预分配文件空间，减少碎片（不支持时忽略，写入时再分配），返回是否已分配 """
+    try:
+        if hasattr(os, "posix_fallocate"):
+            os.posix_fallocate(f.fileno(), 0, size)
+        else:
+            f.truncate(size)
+            f.seek(0)
+        return True
+    except OSError:
+        return False
+
+def wipe_free_space(target_dir, writers=1, progress_callback=None, stop_event=None,
+                    fill_size=FILL_FILE_SIZE, block_size=WRITE_BLOCK, reserve=None):
+    """
+    擦除 target_dir 所在卷的空闲空间
+    writers: 并行写入线程数（SSD/阵列可适当增加）
+    progress_callback(已写入字节, 需写入字节, 当前空闲字节)
+    stop_event: threading.Event，置位后尽快停止
+    reserve: 保留的空闲字节数，默认按 reserve_bytes 计算
+    返回 (是否成功, 消息, 已写入字节)
+    """
+    if not os.path.isdir(target_dir):
+        return False, "目标目录不存在", 0
+
+    work_dir = os.path.join(target_dir, f".wipe_{uuid.uuid4().hex[:8]}")
+    os.makedirs(work_dir)
+    stop_event = stop_event or threading.Event()
+    if reserve is None:
+        reserve = reserve_bytes(target_dir)
+    initial_free = psutil.disk_usage(target_dir).free
+    goal = max(0, initial_free - reserve)
+    lock = threading.Lock()
+    # pending: 已分给写入线程但还未占用磁盘的字节（预分配失败的文件），计算剩余空间时扣除
+    state = {"written": 0, "index": 0, "pending": 0, "error": None}
+    block = os.urandom(block_size)
+
+    def next_file():
+        # 根据当前空闲空间决定下一个填充文件的大小，剩余空间不足预留值时停止
+        # 创建与预分配都在锁内完成，其他线程读到的空闲空间已扣除本文件，多个线程不会重复占用同一段剩余空间
+        with lock:
+            free = psutil.disk_usage(target_dir).free
+            room = free - reserve - state["pending"]
+            if room < block_size or stop_event.is_set():
+                return None, None, False
+            state["index"] += 1
+            size = min(fill_size, room - room % block_size)
+            f = open(os.path.join(work_dir, f"fill_{state['index']:05d}.bin"), "wb", buffering=0)
+            allocated = _preallocate(f, size)
+            if not allocated:
+                state["pending"] += size
+            return f, size, allocated
+
+    def writer():
+        try:
+            while not stop_event.is_set():
+                f, size, allocated = next_file()
+                if f is None:
+                    return
+                with f:
+                    remaining = size
+                    try:
+                        while remaining > 0 and not stop_event.is_set():
+                            n = f.write(block if remaining >= block_size else block[:remaining])
+                            remaining -= n
+                            with lock:
+                                state["written"] += n
+                                if not allocated:
+                                    state["pending"] -= n
+                    finally:
+                        if not allocated:
+                            with lock:
+                                state["pending"] -= remaining
+                    os.fsync(f.fileno())
+        except OSError as e:
+            # 磁盘已满等错误：停止所有写入线程
+            with lock:
+                if state["error"] is None and e.errno != errno.ENOSPC:
+                    state["error"] = str(e)
+            stop_event.set()
+
+    threads = [threading.Thread(target=writer, daemon=True) for _ in range(max(1, writers))]
+    try:
+        for t in threads:
+            t.start()
+        while any(t.is_alive() for t in threads):
+            time.sleep(0.5)
+            if progress_callback:
+                progress_callback(state["written"], goal, psutil.disk_usage(target_dir).free)
+    finally:
+        stop_event.set()
+        for t in threads:
+            t.join()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if state["error"]:
+        return False, state["error"], state["written"]
+    return True, "空闲空间擦除完成", state["written"]
+
+class FreeSpaceWipeWorker(QThread):
+    """ 空闲空间擦除线程 """
+    progress = pyqtSignal(int, str)
+    finished = pyqtSignal(bool, str)
+
+    def __init__(self, target_dir, writers=1):
+        super().__init__()
+        self.target_dir = target_dir
+        self.writers = writers
+        self.stop_event = threading.Event()
+        self.cancelled = False
+        self._start_time = 0
+
+    def stop(self):
+        self.cancelled = True
+        self.stop_event.set()
+
+    def run(self):
+        self._start_time = time.monotonic()
+        try:
+            success, msg, written = wipe_free_space(self.target_dir, self.writers,
+                                                    self._on_progress, self.stop_event)
+        except Exception as e:
+            success, msg, written = False, str(e), 0
+        if success and self.cancelled:
+            msg = f"已取消，已写入 {written / 1024**3:.2f} GB，填充文件已清理"
+        self.finished.emit(success, msg)
+
+    def _on_progress(self, written, goal, free):
+        elapsed = max(time.monotonic() - self._start_time, 1e-6)
+        percent = int(written / goal * 100) if goal else 100
+        speed = written / elapsed / 1024 / 1024
+        self.progress.emit(min(percent, 100),
+                           f"正在擦除空闲空间: 已写入 {written / 1024**3:.2f} GB，"
+                           f"剩余空闲 {free / 1024**3:.2f} GB，{speed:.0f} MB/s")
@@ -0,0 +1,225 @@
+"""
+批量图片转换
+将文件/文件夹中的图片按命名模板转换到输出目录，解码与编码在按 CPU 核数创建的进程池中并行执行，
+逐个文件返回结果；输出文件已存在、不旧于源文件且转换参数相同时跳过
+"""
+import os
+import json
+import time
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from PyQt5.QtCore import QThread, pyqtSignal
+
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".webp", ".bmp", ".gif", ".tif", ".tiff", ".ico"}
+DEFAULT_TEMPLATE = "{name}"
+# 每个工作进程同时排队的任务数（限制在途任务，取消时能尽快停下）
+QUEUE_DEPTH = 4
+# 输出目录中记录各输出文件转换参数的清单，参数改变后重新转换
+MANIFEST_NAME = ".image_batch.json"
+
+# 单个文件的处理结果
+STATUS_DONE = "done"
+STATUS_SKIPPED = "skipped"
+STATUS_FAILED = "failed"
+
+def collect_images(sources):
+    """ 展开文件与文件夹（递归），返回图片路径列表 """
+    images = []
+    for source in sources:
+        if os.path.isdir(source):
+            for root, dirs, files in os.walk(source):
+                dirs.sort()
+                for name in sorted(files):
+                    if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS:
+                        images.append(os.path.join(root, name))
+        elif os.path.isfile(source) and os.path.splitext(source)[1].lower() in IMAGE_EXTENSIONS:
+            images.append(source)
+    return images
+
+def output_name(template, src, index, output_format):
+    """
+    按命名模板生成输出文件名（不含目录），扩展名自动追加
+    可用字段：{name} 源文件名（不含扩展名）、{ext} 源扩展名、{parent} 所在文件夹名、
+    {index} 序号（从 1 开始，可写作 {index:04d}）、{fmt} 目标格式
+    """
+    stem, ext = os.path.splitext(os.path.basename(src))
+    fmt = output_format.lower()
+    name = (template or DEFAULT_TEMPLATE).format(
+        name=stem, ext=ext.lstrip(".").lower(), index=index, fmt=fmt,
+        parent=os.path.basename(os.path.dirname(os.path.abspath(src))))
+    # 模板中不允许出现路径分隔符
+    name = name.replace("/", "_").replace("\\", "_").strip() or stem
+    return f"{name}.{'jpg' if fmt == 'jpeg' else fmt}"
+
+def plan_batch(sources, output_dir, output_format, template=DEFAULT_TEMPLATE):
+    """ 生成 [(源文件, 输出文件)]，重名时追加序号 """
+    tasks = []
+    used = set()
+    for index, src in enumerate(collect_images(sources), 1):
+        name = output_name(template, src, index, output_format)
+        stem, ext = os.path.splitext(name)
+        n = 1
+        while name.lower() in used:
+            n += 1
+            name = f"{stem}_{n}{ext}"
+        used.add(name.lower())
+        tasks.append((src, os.path.join(output_dir, name)))
+    return tasks
+
+def options_key(output_format, options):
+    """ 目标格式与转换参数（尺寸、缩放、质量等）的摘要 """
+    payload = json.dumps([output_format.lower(), options or {}], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=8).hexdigest()
+
+def load_manifest(output_dir):
+    """ 读取输出目录的参数清单 {输出文件名: 参数摘要}，不存在或损坏时返回空字典 """
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        return manifest if isinstance(manifest, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(output_dir, manifest):
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+    except OSError as e:
+        print(f"保存批量转换清单失败: {e}")
+
+def is_up_to_date(src, dst, key=None, manifest=None):
+    """
+    输出文件非空且修改时间不早于源文件时视为已是最新
+    给出 key 与 manifest 时还要求清单中记录的转换参数与本次相同
+    """
+    if key is not None and (manifest or {}).get(os.path.basename(dst)) != key:
+        return False
+    try:
+        dst_stat = os.stat(dst)
+        return dst_stat.st_size > 0 and dst_stat.st_mtime_ns >= os.stat(src).st_mtime_ns
+    except OSError:
+        return False
+
+def convert_one(src, dst, output_format, options=None):
+    """
+    在工作进程中转换单个文件：先写入临时文件再替换，中断时不会留下不完整的输出
+    返回 (源文件, 输出文件, 状态, 消息)
+    """
+    from modules.file_converter import image_convert
+    tmp = f"{dst}.part"
+    try:
+        success, msg = image_convert(src, tmp, output_format, **(options or {}))
+        if success:
+            os.replace(tmp, dst)
+            return src, dst, STATUS_DONE, msg
+        return src, dst, STATUS_FAILED, msg
+    finally:
+        if os.path.exists(tmp):
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+def iter_batch(tasks, output_format, workers=None, options=None, force=False, stop_check=None):
+    """
+    执行批量转换，按完成顺序逐个产出 (源文件, 输出文件, 状态, 消息)
+    workers: 进程数，默认等于 CPU 核数
+    force: 为 True 时不跳过已是最新的输出
+    stop_check: 返回 True 时停止提交新任务
+    转换成功的输出与本次参数摘要记入所在目录的清单，参数不同的旧输出不会被跳过
+    """
+    key = options_key(output_format, options)
+    manifests = {}
+    pending = []
+    for src, dst in tasks:
+        dst_dir = os.path.dirname(dst)
+        if dst_dir not in manifests:
+            manifests[dst_dir] = load_manifest(dst_dir)
+        if not force and is_up_to_date(src, dst, key, manifests[dst_dir]):
+            yield src, dst, STATUS_SKIPPED, "已是最新"
+        else:
+            pending.append((src, dst))
+    if not pending:
+        return
+
+    for dst_dir in {os.path.dirname(dst) for _, dst in pending}:
+        os.makedirs(dst_dir, exist_ok=True)
+    try:
+        workers = max(1, min(workers or os.cpu_count() or 1, len(pending)))
+        queue = iter(pending)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            in_flight = {}
+
+            def fill():
+                while len(in_flight) < workers * QUEUE_DEPTH and not (stop_check and stop_check()):
+                    task = next(queue, None)
+                    if task is None:
+                        return
+                    future = pool.submit(convert_one, task[0], task[1], output_format, options)
+                    in_flight[future] = task
+
+            fill()
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    src, dst = in_flight.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = src, dst, STATUS_FAILED, str(e)
+                    name = os.path.basename(dst)
+                    if result[2] == STATUS_DONE:
+                        manifests[os.path.dirname(dst)][name] = key
+                    else:
+                        manifests[os.path.dirname(dst)].pop(name, None)
+                    yield result
+                fill()
+    finally:
+        # 中途取消时也保存已完成部分的记录
+        for dst_dir, manifest in manifests.items():
+            if os.path.isdir(dst_dir):
+                save_manifest(dst_dir, manifest)
+
+class ImageBatchWorker(QThread):
+    """ 批量图片转换线程 """
+    progress = pyqtSignal(int, str)
+    file_finished = pyqtSignal(str, str, str)  # 源文件, 状态, 消息
+    finished = pyqtSignal(dict)
+
+    def __init__(self, sources, output_dir, output_format, template=DEFAULT_TEMPLATE, options=None, workers=None):
+        super().__init__()
+        self.sources = sources
+        self.output_dir = output_dir
+        self.output_format = output_format
+        self.template = template
+        self.options = options
+        self.workers = workers
+
+    def run(self):
+        summary = {"total": 0, "done": 0, "skipped": 0, "failed": [], "seconds": 0.0,
+                   "rate": 0.0, "cancelled": False}
+        start = time.perf_counter()
+        try:
+            tasks = plan_batch(self.sources, self.output_dir, self.output_format, self.template)
+            summary["total"] = len(tasks)
+            finished = 0
+            for src, dst, status, msg in iter_batch(tasks, self.output_format, self.workers, self.options,
+                                                    stop_check=self.isInterruptionRequested):
+                finished += 1
+                if status == STATUS_DONE:
+                    summary["done"] += 1
+                elif status == STATUS_SKIPPED:
+                    summary["skipped"] += 1
+                else:
+                    summary["failed"].append((src, msg))
+                self.file_finished.emit(src, status, msg)
+                elapsed = time.perf_counter() - start
+                rate = summary["done"] / elapsed if elapsed > 0 else 0.0
+                self.progress.emit(int(finished / len(tasks) * 100),
+                                   f"{finished}/{len(tasks)}，{rate:.1f} 张/秒")
+        except Exception as e:
+            summary["failed"].append(("", str(e)))
+        summary["cancelled"] = self.isInterruptionRequested()
+        summary["seconds"] = time.perf_counter() - start
+        summary["rate"] = summary["done"] / summary["seconds"] if summary["seconds"] > 0 else 0.0
+        self.finished.emit(summary)
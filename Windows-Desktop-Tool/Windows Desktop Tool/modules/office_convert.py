@@ -0,0 +1,304 @@
+"""
+Office 文档流式转换
+Excel 转 Word：openpyxl 只读模式把每个工作表逐行读取一遍，单元格文本按批暂存到临时文件，
+表格 XML 按批拼接后直接写入 docx 压缩包，不在内存中构建 python-docx 表格对象，十万行级别的工作表内存占用也保持稳定
+Word 转 Excel：直接增量解析 document.xml 中的表格（按 python-docx 的规则处理合并单元格），
+openpyxl 只写模式一次写出所有工作表
+"""
+import io
+import os
+import re
+import pickle
+import zipfile
+import tempfile
+from xml.sax.saxutils import escape
+from modules.conversion_jobs import report_progress, is_cancelled
+
+# 每批写入的表格行数
+ROW_BATCH = 1000
+# docx 正文所在的压缩包条目
+DOCUMENT_PART = "word/document.xml"
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+# XML 1.0 不允许的控制字符
+_INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+_TABLE_START = (
+    '<w:tbl><w:tblPr><w:tblW w:type="auto" w:w="0"/>'
+    '<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" w:lastRow="0" '
+    'w:noHBand="0" w:noVBand="1" w:val="04A0"/></w:tblPr>'
+)
+
+def _placeholder(index):
+    return f"SHEET_TABLE_{index}"
+
+def cell_text(value):
+    """ 单元格值转文本，空单元格为空字符串 """
+    if value is None:
+        return ""
+    return str(value)
+
+def _cell_xml(text, width):
+    if not text:
+        return f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{width}"/></w:tcPr><w:p/></w:tc>'
+    text = escape(_INVALID_XML_CHARS.sub("", text))
+    # 单元格内换行转为 Word 换行符
+    text = text.replace("\n", '</w:t><w:br/><w:t xml:space="preserve">')
+    return (f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{width}"/></w:tcPr>'
+            f'<w:p><w:r><w:t xml:space="preserve">{text}</w:t></w:r></w:p></w:tc>')
+
+def row_xml(values, columns, width):
+    """ 生成一行表格 XML，不足 columns 列时补空单元格 """
+    cells = [_cell_xml(cell_text(v), width) for v in values[:columns]]
+    cells.extend(_cell_xml("", width) for _ in range(columns - len(cells)))
+    return "<w:tr>" + "".join(cells) + "</w:tr>"
+
+def _spool_sheet(ws, spool, progress):
+    """
+    逐行读取工作表（只读一遍），单元格文本按批写入临时文件 spool，返回 (行数, 列数)；被取消时返回 None
+    表格网格在行之前写出，需要先知道列数，因此行先暂存，读完后再生成表格
+    只读模式下 iter_rows 按文件中记录的 <dimension> 截断，不少第三方工具写出的文件中该记录过期或只有 A1，
+    因此先重置，行数与列数按实际读取的行统计
+    """
+    ws.reset_dimensions()
+    rows = columns = 0
+    batch = []
+    for values in ws.iter_rows(values_only=True):
+        batch.append([cell_text(v) for v in values])
+        columns = max(columns, len(values))
+        rows += 1
+        if len(batch) >= ROW_BATCH:
+            pickle.dump(batch, spool, pickle.HIGHEST_PROTOCOL)
+            batch = []
+            progress(rows)
+            if is_cancelled():
+                return None
+    if batch:
+        pickle.dump(batch, spool, pickle.HIGHEST_PROTOCOL)
+    progress(rows)
+    return rows, columns
+
+def _write_sheet_table(out, spool, columns, text_width):
+    """ 把暂存的工作表行写成表格 XML（columns 为实际列数） """
+    if columns == 0:
+        out.write(b"<w:p/>")
+        return
+    width = text_width // columns
+    out.write((_TABLE_START + "<w:tblGrid>" + f'<w:gridCol w:w="{width}"/>' * columns
+               + "</w:tblGrid>").encode("utf-8"))
+    spool.seek(0)
+    while True:
+        try:
+            batch = pickle.load(spool)
+        except EOFError:
+            break
+        out.write("".join(row_xml(values, columns, width) for values in batch).encode("utf-8"))
+    out.write(b"</w:tbl>")
+
+def excel_to_word_stream(excel_path, docx_path):
+    """
+    Excel 转 Word（流式）：每个工作表一个标题 + 表格，工作表之间分页
+    先用 python-docx 生成只含标题和占位符的文档骨架，再在写出压缩包时把占位符替换为逐行生成的表格
+    """
+    from openpyxl import load_workbook
+    from docx import Document
+    from lxml import etree
+
+    wb = load_workbook(excel_path, read_only=True, data_only=True)
+    try:
+        doc = Document()
+        section = doc.sections[0]
+        # 正文宽度（twip），与 python-docx add_table 的列宽计算一致
+        text_width = int((section.page_width - section.left_margin - section.right_margin) / 635)
+        sheets = wb.worksheets
+        for index, ws in enumerate(sheets):
+            doc.add_heading(f"Sheet: {ws.title}", level=1)
+            marker = doc.add_paragraph()
+            marker._p.addprevious(etree.Comment(_placeholder(index)))
+            marker._p.getparent().remove(marker._p)
+            doc.add_page_break()
+
+        skeleton = io.BytesIO()
+        doc.save(skeleton)
+        skeleton.seek(0)
+
+        tmp_path = f"{docx_path}.part"
+        try:
+            with zipfile.ZipFile(skeleton) as zin, \
+                    zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as zout:
+                for item in zin.infolist():
+                    if item.filename != DOCUMENT_PART:
+                        zout.writestr(item, zin.read(item.filename))
+                        continue
+                    parts = re.split(r"<!--SHEET_TABLE_\d+-->", zin.read(item.filename).decode("utf-8"))
+                    with zout.open(DOCUMENT_PART, "w") as out:
+                        out.write(parts[0].encode("utf-8"))
+                        for index, ws in enumerate(sheets):
+                            # 总行数要读完才知道，进度按工作表序号估算，表内按文件记录的行数（可能不准）细分
+                            recorded = ws.max_row or 0
+
+                            def progress(rows, index=index, recorded=recorded, title=ws.title):
+                                part = min(rows / recorded, 0.99) if recorded > 1 else 0.5
+                                report_progress(min(99, int((index + part) * 100 / len(sheets))),
+                                                f"正在转换工作表 {title}: {rows} 行")
+                            with tempfile.TemporaryFile() as spool:
+                                shape = _spool_sheet(ws, spool, progress)
+                                if shape is None:
+                                    raise InterruptedError
+                                _write_sheet_table(out, spool, shape[1], text_width)
+                            out.write(parts[index + 1].encode("utf-8"))
+            os.replace(tmp_path, docx_path)
+        except InterruptedError:
+            return False, "已取消"
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    finally:
+        wb.close()
+    return True, "成功将 Excel 转为 Word 表格"
+
+
+class _CountingReader:
+    """ 记录已读取字节数的文件包装，用于按解析进度上报百分比 """
+    def __init__(self, f):
+        self._f = f
+        self.position = 0
+
+    def read(self, size=-1):
+        data = self._f.read(size)
+        self.position += len(data)
+        return data
+
+# 解析时使用的完整标签名（预先拼接，避免在逐元素循环中重复构造字符串）
+_TAG_T, _TAG_TAB, _TAG_BR, _TAG_CR, _TAG_NB_HYPHEN = (_W + t for t in ("t", "tab", "br", "cr", "noBreakHyphen"))
+_TAG_R, _TAG_HYPERLINK, _TAG_P = _W + "r", _W + "hyperlink", _W + "p"
+_TAG_TR, _TAG_TC, _TAG_TR_PR, _TAG_TC_PR = _W + "tr", _W + "tc", _W + "trPr", _W + "tcPr"
+_TAG_GRID_BEFORE, _TAG_GRID_SPAN, _TAG_VMERGE = _W + "gridBefore", _W + "gridSpan", _W + "vMerge"
+_ATTR_VAL = _W + "val"
+_RUN_SPECIAL = {_TAG_TAB: "\t", _TAG_BR: "\n", _TAG_CR: "\n", _TAG_NB_HYPHEN: "-"}
+
+def _run_text(run):
+    """ 与 python-docx Run.text 一致：文本、制表符、换行 """
+    parts = []
+    for child in run:
+        tag = child.tag
+        if tag == _TAG_T:
+            parts.append(child.text or "")
+        elif tag in _RUN_SPECIAL:
+            parts.append(_RUN_SPECIAL[tag])
+    return "".join(parts)
+
+def _paragraph_text(p):
+    parts = []
+    for child in p:
+        tag = child.tag
+        if tag == _TAG_R:
+            parts.append(_run_text(child))
+        elif tag == _TAG_HYPERLINK:
+            parts.extend(_run_text(r) for r in child.iterchildren(_TAG_R))
+    return "".join(parts)
+
+def _int_val(el, default):
+    try:
+        return int(el.get(_ATTR_VAL))
+    except (TypeError, ValueError):
+        return default
+
+def _properties(el, pr_tag):
+    """ 返回元素的属性子元素（w:tcPr / w:trPr 总是第一个子元素），没有则返回 None """
+    if len(el) and el[0].tag == pr_tag:
+        return el[0]
+    return None
+
+def table_rows(tbl):
+    """
+    读取表格元素为二维文本列表，合并单元格按 python-docx 的 row.cells 规则展开：
+    横向合并（gridSpan）的每个网格列重复单元格文本，纵向合并的后续行沿用起始单元格文本
+    （直接遍历子元素而不用 find，逐单元格的开销约为 find 的一半）
+    """
+    rows = []
+    previous = []
+    for tr in tbl.iterchildren(_TAG_TR):
+        row = []
+        tr_pr = _properties(tr, _TAG_TR_PR)
+        if tr_pr is not None:
+            for child in tr_pr:
+                if child.tag == _TAG_GRID_BEFORE:
+                    # 行首跳过的网格列补空
+                    row = [""] * _int_val(child, 0)
+        for tc in tr.iterchildren(_TAG_TC):
+            span, continued = 1, False
+            tc_pr = _properties(tc, _TAG_TC_PR)
+            if tc_pr is not None:
+                for child in tc_pr:
+                    tag = child.tag
+                    if tag == _TAG_GRID_SPAN:
+                        span = max(1, _int_val(child, 1))
+                    elif tag == _TAG_VMERGE:
+                        continued = child.get(_ATTR_VAL, "continue") == "continue"
+            col = len(row)
+            if continued and col < len(previous):
+                text = previous[col]
+            else:
+                text = "\n".join([_paragraph_text(p) for p in tc.iterchildren(_TAG_P)])
+            if span == 1:
+                row.append(text)
+            else:
+                row.extend([text] * span)
+        rows.append(row)
+        previous = row
+    return rows
+
+def iter_docx_tables(docx_path, progress=None):
+    """
+    增量解析 docx 正文，逐个产出顶层表格的行数据（与 python-docx 的 Document.tables 范围一致）
+    每个表格处理完即释放对应的 XML 元素，内存占用与文档大小无关
+    progress(已解析字节, 总字节)
+    """
+    from lxml import etree
+
+    with zipfile.ZipFile(docx_path) as z:
+        total = z.getinfo(DOCUMENT_PART).file_size
+        with z.open(DOCUMENT_PART) as raw:
+            reader = _CountingReader(raw)
+            body_tag = _W + "body"
+            for _, el in etree.iterparse(reader, events=("end",), tag=_W + "tbl", huge_tree=True):
+                parent = el.getparent()
+                if parent is None or parent.tag != body_tag:
+                    # 嵌套在单元格中的表格随外层表格一起处理
+                    continue
+                yield table_rows(el)
+                # 释放已处理的表格及其之前的正文元素
+                el.clear()
+                while el.getprevious() is not None:
+                    del parent[0]
+                if progress:
+                    progress(reader.position, total)
+
+def word_to_excel_stream(docx_path, excel_path):
+    """ 提取 Word 中的所有表格到 Excel，每个表格一个工作表 """
+    from openpyxl import Workbook
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+    def progress(position, total):
+        report_progress(min(99, position * 100 // max(total, 1)), f"已提取 {count} 个表格")
+
+    wb = Workbook(write_only=True)
+    count = 0
+    for rows in iter_docx_tables(docx_path, progress):
+        count += 1
+        ws = wb.create_sheet(f"Table_{count}")
+        for row in rows:
+            ws.append([ILLEGAL_CHARACTERS_RE.sub("", text) if text else None for text in row])
+        if is_cancelled():
+            return False, "已取消"
+    if count == 0:
+        return False, "Word 文档中未找到任何表格"
+
+    tmp_path = f"{excel_path}.part"
+    try:
+        wb.save(tmp_path)
+        os.replace(tmp_path, excel_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return True, f"成功提取 {count} 个表格到 Excel"
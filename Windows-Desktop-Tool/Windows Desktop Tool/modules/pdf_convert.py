@@ -0,0 +1,149 @@
+"""
+PDF 转 Word（按页并行）
+把页码范围切分为若干块，由多个进程同时用 pdf2docx 转换，再按页序合并各块生成的 docx：
+图片关系重新登记到合并后的文档，外部超链接重新建立关系，每块最后一节的页面设置转为分节符保留
+"""
+import io
+import os
+import copy
+import time
+import shutil
+import tempfile
+import multiprocessing
+from modules.conversion_jobs import report_progress, is_cancelled
+
+# 页数少于该值时直接单进程转换（进程启动与合并的开销得不偿失）
+PARALLEL_MIN_PAGES = 8
+# 每个进程平均分到的块数：块越小进度越平滑、负载越均衡，但合并开销越大
+CHUNKS_PER_WORKER = 3
+MAX_CHUNK_PAGES = 20
+
+_R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_RT_IMAGE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/image"
+
+def page_count(pdf_path):
+    try:
+        import pymupdf as fitz
+    except ImportError:
+        import fitz
+    with fitz.open(pdf_path) as doc:
+        return doc.page_count
+
+def split_pages(pages, workers, chunks_per_worker=CHUNKS_PER_WORKER, max_chunk=MAX_CHUNK_PAGES):
+    """ 把 [0, pages) 切分为连续的 (起始页, 结束页) 块 """
+    chunk = max(1, min(max_chunk, -(-pages // (workers * chunks_per_worker))))
+    return [(start, min(start + chunk, pages)) for start in range(0, pages, chunk)]
+
+def _convert_chunk(args):
+    """ 工作进程：转换一段页码，返回 (块序号, 页数) """
+    index, pdf_path, docx_path, start, end = args
+    from pdf2docx import Converter
+    cv = Converter(pdf_path)
+    try:
+        cv.convert(docx_path, start=start, end=end)
+    finally:
+        cv.close()
+    return index, end - start
+
+def _copy_relationships(element, source_part, target_part):
+    """ 把元素中引用的关系（r:embed / r:link / r:id）从源文档迁移到目标文档并改写编号 """
+    mapping = {}
+    for el in element.iter():
+        for attr, rid in el.attrib.items():
+            if not attr.startswith("{" + _R_NS + "}"):
+                continue
+            if rid not in mapping:
+                rel = source_part.rels.get(rid)
+                if rel is None:
+                    continue
+                if rel.is_external:
+                    mapping[rid] = target_part.relate_to(rel.target_ref, rel.reltype, is_external=True)
+                elif rel.reltype == _RT_IMAGE:
+                    mapping[rid], _ = target_part.get_or_add_image(io.BytesIO(rel.target_part.blob))
+                else:
+                    continue
+            el.set(attr, mapping[rid])
+
+def merge_documents(paths, output_path):
+    """
+    按顺序合并 pdf2docx 生成的多个 docx
+    前一个文档正文末尾的 sectPr 转为段落级分节符，使其最后一页的页面设置不被后一个文档覆盖
+    """
+    from docx import Document
+    from docx.oxml.ns import qn
+    from docx.oxml import OxmlElement
+
+    base = Document(paths[0])
+    body = base.element.body
+    for path in paths[1:]:
+        doc = Document(path)
+        src_body = doc.element.body
+        src_sect = src_body.find(qn("w:sectPr"))
+        base_sect = body.find(qn("w:sectPr"))
+        if base_sect is not None:
+            # 把当前最后一节的页面设置移入一个段落，作为分节符
+            p = OxmlElement("w:p")
+            p_pr = OxmlElement("w:pPr")
+            p.append(p_pr)
+            body.remove(base_sect)
+            p_pr.append(base_sect)
+            body.append(p)
+        for child in list(src_body):
+            if child is src_sect:
+                continue
+            _copy_relationships(child, doc.part, base.part)
+            body.append(child)
+        if src_sect is not None:
+            body.append(copy.deepcopy(src_sect))
+    base.save(output_path)
+
+def pdf_to_word_parallel(pdf_path, docx_path, workers=None):
+    """
+    按页并行转换 PDF 为 Word，返回 (是否成功, 消息)
+    workers: 进程数，默认等于 CPU 核数
+    """
+    from pdf2docx import Converter
+
+    pages = page_count(pdf_path)
+    workers = max(1, workers or os.cpu_count() or 1)
+    start_time = time.perf_counter()
+    if pages < PARALLEL_MIN_PAGES or workers == 1:
+        report_progress(0, f"共 {pages} 页")
+        cv = Converter(pdf_path)
+        try:
+            cv.convert(docx_path, start=0, end=None)
+        finally:
+            cv.close()
+        return True, "转换成功"
+
+    chunks = split_pages(pages, workers)
+    work_dir = tempfile.mkdtemp(prefix="pdf2docx_")
+    tasks = [(i, pdf_path, os.path.join(work_dir, f"part_{i:04d}.docx"), start, end)
+             for i, (start, end) in enumerate(chunks)]
+    ctx = multiprocessing.get_context("spawn")
+    pool = ctx.Pool(min(workers, len(chunks)))
+    try:
+        done_pages = 0
+        results = pool.imap_unordered(_convert_chunk, tasks)
+        for _ in tasks:
+            while True:
+                try:
+                    _, n = results.next(timeout=0.5)
+                    break
+                except multiprocessing.TimeoutError:
+                    if is_cancelled():
+                        pool.terminate()
+                        return False, "已取消"
+            done_pages += n
+            rate = done_pages / max(time.perf_counter() - start_time, 1e-6)
+            report_progress(done_pages * 95 // pages, f"已转换 {done_pages}/{pages} 页，{rate:.1f} 页/秒")
+        pool.close()
+
+        report_progress(95, "正在合并文档")
+        merge_documents([task[2] for task in tasks], docx_path)
+        rate = pages / max(time.perf_counter() - start_time, 1e-6)
+        return True, f"转换成功，共 {pages} 页，{rate:.1f} 页/秒"
+    finally:
+        pool.terminate()
+        pool.join()
+        shutil.rmtree(work_dir, ignore_errors=True)
@@ -0,0 +1,311 @@
+"""
+批量生成二维码
+从 CSV 或逐行文本读取内容，在按 CPU 核数创建的进程池中分块编码（编码与掩码选择是主要耗时），
+结果输出为单独的 PNG/SVG 文件、ZIP 压缩包，或平铺排版的可打印 PDF（矢量）
+"""
+import os
+import csv
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from PyQt5.QtCore import QThread, pyqtSignal
+
+# 输出方式
+OUTPUT_PNG = "png"
+OUTPUT_SVG = "svg"
+OUTPUT_ZIP = "zip"   # ZIP 中为 PNG 图片
+OUTPUT_PDF = "pdf"
+
+# 每个任务包含的二维码数量（短内容单个编码只需几毫秒，逐个提交时进程间通信开销占比过高）
+CHUNK_SIZE = 32
+# 每个工作进程同时排队的任务数（限制在途任务，取消时能尽快停下）
+QUEUE_DEPTH = 2
+# PDF 排版（毫米）：A4 纸、页边距、二维码边长、间距、下方标签高度
+PAGE_SIZE_MM = (210, 297)
+PAGE_MARGIN_MM = 10
+TILE_MM = 30
+TILE_GAP_MM = 5
+LABEL_MM = 4
+PDF_DPI = 300
+# 文件名中不允许的字符
+_INVALID_NAME_CHARS = '<>:"/\\|?*\r\n\t'
+
+def _read_text(path):
+    """ 读取文本，兼容 UTF-8（含 BOM）与 Excel 在中文系统上默认导出的 GBK 编码 """
+    with open(path, "rb") as f:
+        raw = f.read()
+    for encoding in ("utf-8-sig", "gbk"):
+        try:
+            return raw.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    return raw.decode("utf-8", errors="replace")
+
+def read_items(path, column=0, name_column=None):
+    """
+    读取要生成的内容，返回 [(文件名/标签, 内容)]
+    .csv 文件：column / name_column 为列序号或表头中的列名（首行是否为表头自动判断），
+              不指定 name_column 时以内容作为文件名；其他文件：每个非空行为一个二维码
+    """
+    text = _read_text(path)
+    if os.path.splitext(path)[1].lower() != ".csv":
+        return [(line.strip(), line.strip()) for line in text.splitlines() if line.strip()]
+
+    sample = text[:4096]
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        has_header = csv.Sniffer().has_header(sample)
+    except csv.Error:
+        dialect, has_header = csv.excel, False
+    rows = [row for row in csv.reader(text.splitlines(), dialect) if any(cell.strip() for cell in row)]
+    header = rows.pop(0) if has_header and rows else []
+
+    def column_index(value):
+        if value is None or isinstance(value, int):
+            return value
+        if value in header:
+            return header.index(value)
+        if str(value).isdigit():
+            return int(value)
+        raise ValueError(f"CSV 中没有列: {value}")
+
+    data_index = column_index(column)
+    label_index = column_index(name_column)
+    items = []
+    for row in rows:
+        if data_index >= len(row) or not row[data_index].strip():
+            continue
+        data = row[data_index].strip()
+        label = row[label_index].strip() if label_index is not None and label_index < len(row) else ""
+        items.append((label or data, data))
+    return items
+
+def unique_names(labels):
+    """ 把标签转换为合法且不重复的文件名（不含扩展名） """
+    names = []
+    used = set()
+    for index, label in enumerate(labels, 1):
+        name = "".join("_" if c in _INVALID_NAME_CHARS else c for c in label).strip(" .")[:100]
+        name = name or f"qrcode_{index:05d}"
+        stem, n = name, 1
+        while name.lower() in used:
+            n += 1
+            name = f"{stem}_{n}"
+        used.add(name.lower())
+        names.append(name)
+    return names
+
+def _write_file(path, payload):
+    """ 先写入临时文件再替换，中断时不会留下不完整的输出 """
+    tmp = f"{path}.part"
+    with open(tmp, "wb") as f:
+        f.write(payload)
+    os.replace(tmp, path)
+
+def _png_bytes(matrix, size):
+    from PyQt5.QtCore import QByteArray, QBuffer, QIODevice
+    from modules.qrcode_tool import matrix_to_qimage
+    # 1 位黑白 PNG：体积约为灰度图的 1/3，编码也更快
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    matrix_to_qimage(matrix, size, mono=True).save(buffer, "PNG")
+    return bytes(data)
+
+def render_chunk(chunk, mode, size, border, ecc, output_dir=None):
+    """
+    在工作进程中生成一组二维码，chunk 为 [(序号, 文件名, 内容)]
+    mode: png/svg 直接写入 output_dir；zip 返回 PNG 数据；pdf 返回模块矩阵（按位打包）
+    返回 [(序号, 错误信息或 None, 数据)]
+    """
+    import numpy as np
+    from qrcode.exceptions import DataOverflowError
+    from modules.qrcode_tool import build_matrix, matrix_to_svg
+    results = []
+    for index, name, data in chunk:
+        try:
+            matrix = build_matrix(data, border, ecc)
+            payload = None
+            if mode == OUTPUT_PNG:
+                _write_file(os.path.join(output_dir, f"{name}.png"), _png_bytes(matrix, size))
+            elif mode == OUTPUT_SVG:
+                _write_file(os.path.join(output_dir, f"{name}.svg"), matrix_to_svg(matrix, size).encode("utf-8"))
+            elif mode == OUTPUT_ZIP:
+                payload = _png_bytes(matrix, size)
+            else:
+                payload = (matrix.shape[0], np.packbits(matrix).tobytes())
+            results.append((index, None, payload))
+        except (DataOverflowError, ValueError):
+            # 超出二维码容量时为 DataOverflowError（不是 ValueError 的子类）或版本号超过 40 的 ValueError
+            results.append((index, "内容过长，超出二维码容量", None))
+        except OSError as e:
+            results.append((index, str(e), None))
+    return results
+
+def iter_generate(items, mode, size=10, border=4, ecc="M", output_dir=None, workers=None, stop_check=None):
+    """
+    并行生成，按完成顺序逐块产出 [(序号, 错误信息或 None, 数据)]
+    items: [(文件名, 内容)]；workers: 进程数，默认等于 CPU 核数；stop_check: 返回 True 时停止提交新任务
+    """
+    tasks = [(i, name, data) for i, (name, data) in enumerate(items)]
+    chunks = iter([tasks[i:i + CHUNK_SIZE] for i in range(0, len(tasks), CHUNK_SIZE)])
+    workers = max(1, min(workers or os.cpu_count() or 1, (len(tasks) + CHUNK_SIZE - 1) // CHUNK_SIZE))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = {}
+
+        def fill():
+            while len(in_flight) < workers * QUEUE_DEPTH and not (stop_check and stop_check()):
+                chunk = next(chunks, None)
+                if chunk is None:
+                    return
+                in_flight[pool.submit(render_chunk, chunk, mode, size, border, ecc, output_dir)] = chunk
+
+        fill()
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk = in_flight.pop(future)
+                try:
+                    yield future.result()
+                except Exception as e:
+                    yield [(index, str(e), None) for index, _, _ in chunk]
+            fill()
+
+def write_pdf(path, codes, progress_callback=None):
+    """
+    把二维码平铺排版到 A4 页面（矢量），二维码下方印标签，返回页数
+    codes: [(标签, 模块数, 按位打包的矩阵)]；progress_callback(已排版数量)
+    需要在已创建 QApplication 的进程中调用（绘制文字需要字体数据库），可在后台线程中执行
+    """
+    import numpy as np
+    from PyQt5.QtCore import Qt, QRectF, QSizeF, QMarginsF
+    from PyQt5.QtGui import QPdfWriter, QPainter, QPainterPath, QPageSize, QPageLayout, QFont, QColor
+    from modules.qrcode_tool import dark_runs
+
+    mm = PDF_DPI / 25.4
+    writer = QPdfWriter(f"{path}.part")
+    writer.setResolution(PDF_DPI)
+    writer.setPageSize(QPageSize(QSizeF(*PAGE_SIZE_MM), QPageSize.Millimeter))
+    writer.setPageMargins(QMarginsF(0, 0, 0, 0), QPageLayout.Millimeter)
+
+    cell_w, cell_h = TILE_MM + TILE_GAP_MM, TILE_MM + LABEL_MM + TILE_GAP_MM
+    columns = max(1, int((PAGE_SIZE_MM[0] - 2 * PAGE_MARGIN_MM + TILE_GAP_MM) // cell_w))
+    rows = max(1, int((PAGE_SIZE_MM[1] - 2 * PAGE_MARGIN_MM + TILE_GAP_MM) // cell_h))
+    per_page = columns * rows
+
+    painter = QPainter(writer)
+    try:
+        font = QFont()
+        font.setPointSizeF(7)
+        painter.setFont(font)
+        black = QColor(0, 0, 0)
+        for i, (label, modules, packed) in enumerate(codes):
+            if i and i % per_page == 0:
+                writer.newPage()
+            slot = i % per_page
+            x = (PAGE_MARGIN_MM + (slot % columns) * cell_w) * mm
+            y = (PAGE_MARGIN_MM + (slot // columns) * cell_h) * mm
+            box = TILE_MM * mm / modules
+            matrix = np.unpackbits(np.frombuffer(packed, dtype=np.uint8),
+                                   count=modules * modules).reshape(modules, modules)
+            code = QPainterPath()
+            for row, start, length in dark_runs(matrix):
+                code.addRect(QRectF(x + start * box, y + row * box, length * box, box))
+            painter.fillPath(code, black)
+            label_rect = QRectF(x, y + TILE_MM * mm, TILE_MM * mm, LABEL_MM * mm)
+            painter.drawText(label_rect, Qt.AlignCenter,
+                             painter.fontMetrics().elidedText(label, Qt.ElideMiddle, int(label_rect.width())))
+            if progress_callback:
+                progress_callback(i + 1)
+    finally:
+        painter.end()
+    os.replace(f"{path}.part", path)
+    return (len(codes) + per_page - 1) // per_page
+
+def generate_batch(items, mode, output_path, size=10, border=4, ecc="M", workers=None,
+                   progress_callback=None, stop_check=None):
+    """
+    批量生成二维码，返回任务汇总
+    items: [(标签, 内容)]；output_path: png/svg 为输出文件夹，zip/pdf 为输出文件
+    progress_callback(百分比, 文本)；stop_check: 返回 True 时停止（已生成的单独文件保留，ZIP/PDF 不输出）
+    """
+    summary = {"total": len(items), "done": 0, "failed": [], "pages": 0, "seconds": 0.0,
+               "rate": 0.0, "cancelled": False, "output": output_path}
+    start = time.perf_counter()
+    names = unique_names([label for label, _ in items])
+    tasks = list(zip(names, (data for _, data in items)))
+    partial = f"{output_path}.part" if mode in (OUTPUT_ZIP, OUTPUT_PDF) else None
+    archive = None
+    matrices = {}
+
+    def report(percent, text):
+        if progress_callback:
+            progress_callback(percent, text)
+
+    def report_layout(done):
+        if done % 100 == 0 or done == len(matrices):
+            report(90 + int(done / len(matrices) * 10), f"正在排版 PDF {done}/{len(matrices)}")
+
+    try:
+        output_dir = None
+        if mode in (OUTPUT_PNG, OUTPUT_SVG):
+            output_dir = output_path
+            os.makedirs(output_dir, exist_ok=True)
+        elif mode == OUTPUT_ZIP:
+            # PNG 已经压缩，ZIP 中直接存储
+            archive = zipfile.ZipFile(partial, "w", zipfile.ZIP_STORED)
+
+        finished = 0
+        # PDF 在编码完成后还需要排版，编码部分占进度的 90%
+        scale = 90 if mode == OUTPUT_PDF else 100
+        for results in iter_generate(tasks, mode, size, border, ecc, output_dir, workers, stop_check):
+            for index, error, payload in results:
+                finished += 1
+                if error:
+                    summary["failed"].append((tasks[index][1], error))
+                    continue
+                summary["done"] += 1
+                if archive is not None:
+                    archive.writestr(f"{names[index]}.png", payload)
+                elif mode == OUTPUT_PDF:
+                    matrices[index] = payload
+            elapsed = time.perf_counter() - start
+            rate = summary["done"] / elapsed if elapsed > 0 else 0.0
+            report(int(finished / len(tasks) * scale), f"{finished}/{len(tasks)}，{rate:.0f} 个/秒")
+
+        summary["cancelled"] = bool(stop_check and stop_check())
+        if not summary["cancelled"]:
+            if archive is not None:
+                archive.close()
+                archive = None
+                os.replace(partial, output_path)
+            elif mode == OUTPUT_PDF and matrices:
+                codes = [(items[i][0], *matrices[i]) for i in sorted(matrices)]
+                summary["pages"] = write_pdf(output_path, codes, report_layout)
+    except Exception as e:
+        summary["failed"].append(("", str(e)))
+    finally:
+        if archive is not None:
+            archive.close()
+        if partial and os.path.exists(partial):
+            os.remove(partial)
+    summary["seconds"] = time.perf_counter() - start
+    summary["rate"] = summary["done"] / summary["seconds"] if summary["seconds"] > 0 else 0.0
+    return summary
+
+class QRBatchWorker(QThread):
+    """ 批量生成二维码线程 """
+    progress = pyqtSignal(int, str)
+    finished = pyqtSignal(dict)
+
+    def __init__(self, items, mode, output_path, size=10, border=4, ecc="M", workers=None):
+        super().__init__()
+        self.items = items
+        self.mode = mode
+        self.output_path = output_path
+        self.options = {"size": size, "border": border, "ecc": ecc, "workers": workers}
+
+    def run(self):
+        self.finished.emit(generate_batch(self.items, self.mode, self.output_path, **self.options,
+                                          progress_callback=self.progress.emit,
+                                          stop_check=self.isInterruptionRequested))
@@ -0,0 +1,238 @@
+"""
+二维码编码方案规划
+按字符类别用动态规划把内容分成数字 / 字母数字 / 字节（可选日文汉字）段，使编码位数最少；
+再在尺寸预算（版本上限）内选出能容纳内容的最高纠错等级，内容太长放不下时退到最小版本，
+不再固定使用 H 级并从版本 1 逐级增大（长内容会得到很大的版本，生成慢且难以扫描）
+不依赖 Qt，可在转换进程中使用
+"""
+import qrcode
+from qrcode import util
+from qrcode.exceptions import DataOverflowError
+
+# 纠错等级：可恢复约 7% / 15% / 25% / 30% 的损坏
+ERROR_CORRECTION = {
+    "L": qrcode.constants.ERROR_CORRECT_L,
+    "M": qrcode.constants.ERROR_CORRECT_M,
+    "Q": qrcode.constants.ERROR_CORRECT_Q,
+    "H": qrcode.constants.ERROR_CORRECT_H,
+}
+# 自动选择时从高到低尝试
+ECC_ORDER = ("H", "Q", "M", "L")
+AUTO_ECC = "auto"
+# 自动选择时的尺寸预算：版本 10 为 57×57 模块，屏幕显示或打印 2~3 厘米时仍容易识别
+MAX_AUTO_VERSION = 10
+MAX_VERSION = 40
+
+MODE_NAMES = {
+    util.MODE_NUMBER: "数字",
+    util.MODE_ALPHA_NUM: "字母数字",
+    util.MODE_8BIT_BYTE: "字节",
+    util.MODE_KANJI: "汉字",
+}
+_MODES = (util.MODE_NUMBER, util.MODE_ALPHA_NUM, util.MODE_8BIT_BYTE, util.MODE_KANJI)
+# 每个字符的编码位数，以 1/6 位为单位（数字 3 个一组 10 位，字母数字 2 个一组 11 位，汉字 13 位）
+_CHAR_COST = {util.MODE_NUMBER: 20, util.MODE_ALPHA_NUM: 33, util.MODE_KANJI: 78}
+# 版本分组：同一组内各模式的字符计数字段长度相同，分段结果也相同
+_VERSION_GROUPS = ((1, 9), (10, 26), (27, 40))
+_ALPHA_NUM = frozenset(util.ALPHA_NUM.decode("ascii"))
+
+def _kanji_value(ch):
+    """ 日文汉字模式下字符的 13 位编码值，不能用该模式编码时返回 None """
+    try:
+        code = ch.encode("shift_jis")
+    except UnicodeEncodeError:
+        return None
+    if len(code) != 2:
+        return None
+    value = int.from_bytes(code, "big")
+    if 0x8140 <= value <= 0x9FFC:
+        value -= 0x8140
+    elif 0xE040 <= value <= 0xEBBF:
+        value -= 0xC140
+    else:
+        return None
+    return (value >> 8) * 0xC0 + (value & 0xFF)
+
+class KanjiData(util.QRData):
+    """
+    日文汉字模式数据段（Shift-JIS 双字节字符，每个 13 位），python-qrcode 本身不支持该模式
+    与 UTF-8 字节段混用时部分扫码程序会解码出乱码，因此只在明确开启时使用
+    """
+    def __init__(self, text):
+        self.mode = util.MODE_KANJI
+        self.data = text
+
+    def __len__(self):
+        return len(self.data)
+
+    def write(self, buffer):
+        for ch in self.data:
+            buffer.put(_kanji_value(ch), 13)
+
+def _data_bits(mode, text):
+    n = len(text)
+    if mode == util.MODE_NUMBER:
+        return 10 * (n // 3) + (0, 4, 7)[n % 3]
+    if mode == util.MODE_ALPHA_NUM:
+        return 11 * (n // 2) + 6 * (n % 2)
+    if mode == util.MODE_KANJI:
+        return 13 * n
+    return 8 * len(text.encode("utf-8"))
+
+def _count(mode, text):
+    """ 字符计数字段的值（字节模式为字节数） """
+    return len(text.encode("utf-8")) if mode == util.MODE_8BIT_BYTE else len(text)
+
+def segment(text, version, kanji=False):
+    """
+    按版本的字符计数字段长度求总位数最少的分段，返回 ([(模式, 文本)], 总位数)
+    动态规划：逐个字符计算以各模式结尾的最少位数，换模式时加上新段的段头
+    """
+    head = {mode: (4 + util.length_in_bits(mode, version)) * 6 for mode in _MODES}
+    modes = _MODES if kanji else _MODES[:3]
+    costs = {mode: head[mode] for mode in modes}
+    choices = []
+    for ch in text:
+        byte_cost = 48 * len(ch.encode("utf-8"))
+        current, chosen = {}, {}
+        for mode in modes:
+            if mode == util.MODE_NUMBER and not "0" <= ch <= "9":
+                continue
+            if mode == util.MODE_ALPHA_NUM and ch not in _ALPHA_NUM:
+                continue
+            if mode == util.MODE_KANJI and _kanji_value(ch) is None:
+                continue
+            current[mode] = costs[mode] + _CHAR_COST.get(mode, byte_cost)
+            chosen[mode] = mode
+        # 在当前字符之后切换到新模式：上一段补齐到整数位，再加新段的段头
+        encoded = list(chosen)
+        for to in modes:
+            for frm in encoded:
+                cost = (current[frm] + 5) // 6 * 6 + head[to]
+                if to not in current or cost < current[to]:
+                    current[to] = cost
+                    chosen[to] = frm
+        choices.append(chosen)
+        costs = current
+
+    # 回溯每个字符使用的模式，连续相同模式合并为一段
+    mode = min(costs, key=costs.get)
+    char_modes = []
+    for chosen in reversed(choices):
+        mode = chosen[mode]
+        char_modes.append(mode)
+    char_modes.reverse()
+    segments = []
+    for ch, mode in zip(text, char_modes):
+        if segments and segments[-1][0] == mode:
+            segments[-1][1].append(ch)
+        else:
+            segments.append((mode, [ch]))
+    segments = [(mode, "".join(chars)) for mode, chars in segments]
+
+    # 超过字符计数字段上限的段拆开（只在接近容量上限的内容中出现）
+    result = []
+    for mode, part in segments:
+        limit = (1 << util.length_in_bits(mode, version)) - 1
+        while _count(mode, part) > limit:
+            # 按字符切分，字节模式下保证不截断多字节字符
+            cut = limit
+            while _count(mode, part[:cut]) > limit:
+                cut -= 1
+            result.append((mode, part[:cut]))
+            part = part[cut:]
+        result.append((mode, part))
+    bits = sum(4 + util.length_in_bits(mode, version) + _data_bits(mode, part) for mode, part in result)
+    return result, bits
+
+class QRPlan:
+    """ 编码方案：版本、纠错等级与数据分段 """
+    def __init__(self, version, ecc, segments, bits, max_version=None):
+        self.version = version
+        self.ecc = ecc
+        self.segments = segments
+        self.bits = bits
+        self.max_version = max_version  # 自动选择时的尺寸预算，指定纠错等级时为 None
+
+    @property
+    def modules(self):
+        """ 每边模块数（不含边框） """
+        return self.version * 4 + 17
+
+    @property
+    def capacity(self):
+        """ 该版本与纠错等级可容纳的数据位数 """
+        return util.BIT_LIMIT_TABLE[ERROR_CORRECTION[self.ecc]][self.version]
+
+    @property
+    def over_budget(self):
+        return self.max_version is not None and self.version > self.max_version
+
+    def data_list(self):
+        """ 供 qrcode.QRCode.add_data 使用的数据段 """
+        return [KanjiData(part) if mode == util.MODE_KANJI else util.QRData(part, mode=mode)
+                for mode, part in self.segments]
+
+    def describe(self):
+        """ 界面显示的简短说明，如：版本 4（33×33）· 纠错 H · 字节 41 字符 + 数字 8 字符 """
+        counts = {}
+        for mode, part in self.segments:
+            counts[mode] = counts.get(mode, 0) + len(part)
+        modes = " + ".join(f"{MODE_NAMES[mode]} {count} 字符" for mode, count in counts.items())
+        text = f"版本 {self.version}（{self.modules}×{self.modules}）· 纠错 {self.ecc} · {modes}"
+        if self.over_budget:
+            text += f" · 超出预算（版本 {self.max_version}）"
+        return text
+
+    def __repr__(self):
+        return f"QRPlan(version={self.version}, ecc={self.ecc!r}, bits={self.bits}, segments={len(self.segments)})"
+
+def plan_qr(text, ecc=AUTO_ECC, max_version=MAX_AUTO_VERSION, kanji=False):
+    """
+    规划编码方案
+    ecc: "L"/"M"/"Q"/"H" 时只求最小版本；"auto" 时在 max_version 以内选最高的纠错等级，
+         任何等级都放不下时取最小版本，并在该版本内尽量提高纠错等级
+    kanji: 是否使用日文汉字模式（Shift-JIS，兼容性不如 UTF-8 字节模式）
+    内容超出二维码容量时抛出 DataOverflowError
+    """
+    if not text:
+        raise ValueError("内容为空")
+    levels = ECC_ORDER if ecc == AUTO_ECC else (ecc,)
+    # 数字模式最省，每字符至少 10/3 位，明显放不下时不必规划
+    if len(text) * 10 > util.BIT_LIMIT_TABLE[ERROR_CORRECTION["L"]][MAX_VERSION] * 3:
+        raise DataOverflowError("内容过长，超出二维码容量")
+
+    fits = {}  # 纠错等级 -> (最小版本, 分段, 位数)
+    for low, high in _VERSION_GROUPS:
+        if len(fits) == len(levels):
+            break
+        segments, bits = segment(text, low, kanji)
+        for level in levels:
+            if level in fits:
+                continue
+            limits = util.BIT_LIMIT_TABLE[ERROR_CORRECTION[level]]
+            for version in range(low, high + 1):
+                if bits <= limits[version]:
+                    fits[level] = (version, segments, bits)
+                    break
+    if not fits:
+        raise DataOverflowError("内容过长，超出二维码容量")
+
+    if ecc != AUTO_ECC:
+        version, segments, bits = fits[ecc]
+        return QRPlan(version, ecc, segments, bits)
+    # 预算内的最高纠错等级；超出预算时取最小版本，并在同一版本内尽量提高纠错等级
+    smallest = min(version for version, _, _ in fits.values())
+    for level in levels:
+        if level in fits and fits[level][0] <= max(max_version, smallest):
+            version, segments, bits = fits[level]
+            return QRPlan(version, level, segments, bits, max_version=max_version)
+
+def make_qr(text, ecc=AUTO_ECC, border=4, max_version=MAX_AUTO_VERSION, kanji=False):
+    """ 按规划结果生成 qrcode.QRCode（已完成编码与掩码选择），返回 (QRCode, QRPlan) """
+    plan = plan_qr(text, ecc, max_version, kanji)
+    qr = qrcode.QRCode(version=plan.version, error_correction=ERROR_CORRECTION[plan.ecc], border=border)
+    for data in plan.data_list():
+        qr.add_data(data)
+    qr.make(fit=False)
+    return qr, plan
@@ -1,37 +1,159 @@
-import qrcode
-from PIL import Image
+"""
+二维码生成
+由二维码模块矩阵用 NumPy 直接栅格化到 QImage 的像素缓冲区（不经过 PIL），也可直接输出 SVG 矢量图；
+版本、纠错等级与数据分段由 modules.qr_plan 规划（默认在尺寸预算内自动选择纠错等级）；
+生成结果按 (文本, 模块像素大小, 边框, 纠错等级) 缓存在 LRU 中，重复或改回之前的内容时直接使用；
+生成在后台线程中进行（QImage 可在非界面线程创建），界面线程只负责缩放显示
+"""
+import threading
+from collections import OrderedDict
+from qrcode.exceptions import DataOverflowError
 from PyQt5.QtGui import QImage, QPixmap
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import QThread, pyqtSignal
+from modules.qr_plan import AUTO_ECC, make_qr
 
-def generate_qr_image(data: str, size: int = 10, border: int = 4) -> QPixmap:
+DEFAULT_ECC = AUTO_ECC
+# 缓存的二维码数量上限（10 像素模块的二维码约 0.1~1MB）
+CACHE_SIZE = 64
+
+class QRImageCache:
+    """ 线程安全的 LRU 缓存：(文本, 模块像素大小, 边框, 纠错等级) -> (QImage, QRPlan) """
+    def __init__(self, capacity=CACHE_SIZE):
+        self.capacity = capacity
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                self._items.move_to_end(key)
+            return item
+
+    def put(self, key, item):
+        with self._lock:
+            self._items[key] = item
+            self._items.move_to_end(key)
+            while len(self._items) > self.capacity:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+_cache = QRImageCache()
+
+def cached_qr(data, size=10, border=4, ecc=DEFAULT_ECC):
+    """ 只查缓存（界面线程中调用，不会阻塞），命中返回 (QImage, QRPlan)，未命中返回 None """
+    return _cache.get((data, size, border, ecc))
+
+def build_qr(data: str, border: int = 4, ecc: str = DEFAULT_ECC):
+    """ 返回 (模块矩阵, 编码方案)；矩阵含边框，为 NumPy 布尔数组，True 为深色模块 """
+    import numpy as np
+    qr, plan = make_qr(data, ecc, border)
+    return np.array(qr.get_matrix(), dtype=bool), plan
+
+def build_matrix(data: str, border: int = 4, ecc: str = DEFAULT_ECC):
+    """ 二维码模块矩阵（含边框） """
+    return build_qr(data, border, ecc)[0]
+
+def matrix_to_qimage(matrix, box_size: int = 10, mono: bool = False) -> QImage:
     """
-    生成二维码图片
+    把模块矩阵放大 box_size 倍写入 QImage（8 位灰度，mono=True 时为 1 位黑白）
+    先得到放大后的一行模块，再通过广播直接写入 QImage 自己的像素缓冲区，不经过 PIL、不产生整图大小的中间数组
+    """
+    import numpy as np
+    rows, cols = matrix.shape
+    width, height = cols * box_size, rows * box_size
+    if mono:
+        image = QImage(width, height, QImage.Format_Mono)
+        image.setColorTable([0xFFFFFFFF, 0xFF000000])  # 0 白，1 黑
+        # Format_Mono 为高位在前，与 packbits 默认顺序一致
+        line = np.packbits(matrix.repeat(box_size, axis=1), axis=1)
+    else:
+        image = QImage(width, height, QImage.Format_Grayscale8)
+        line = np.where(matrix, 0, 255).astype(np.uint8).repeat(box_size, axis=1)
+    # 每行按 4 字节对齐，行尾的填充字节不使用
+    bytes_per_line = image.bytesPerLine()
+    buffer = image.bits()
+    buffer.setsize(bytes_per_line * height)
+    pixels = np.frombuffer(buffer, dtype=np.uint8).reshape(rows, box_size, bytes_per_line)
+    pixels[:, :, :line.shape[1]] = line[:, None, :]
+    return image
+
+def dark_runs(matrix):
+    """ 每行连续的深色模块，返回 [(行, 起始列, 长度)]，用于输出矢量图形（每段一个矩形） """
+    import numpy as np
+    rows, cols = matrix.shape
+    padded = np.zeros((rows, cols + 2), dtype=np.int8)
+    padded[:, 1:-1] = matrix
+    edges = np.diff(padded, axis=1)
+    # 按行优先顺序，同一行的起点与终点一一对应
+    ys, starts = np.nonzero(edges == 1)
+    ends = np.nonzero(edges == -1)[1]
+    return list(zip(ys.tolist(), starts.tolist(), (ends - starts).tolist()))
+
+def matrix_to_svg(matrix, box_size: int = 10) -> str:
+    """ 矢量二维码：每行连续的深色模块合并为一个矩形，全部放在一个 path 中，坐标以模块为单位 """
+    rows, cols = matrix.shape
+    path = "".join(f"M{x} {y}h{w}v1h-{w}z" for y, x, w in dark_runs(matrix))
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{cols * box_size}" height="{rows * box_size}" '
+            f'viewBox="0 0 {cols} {rows}" shape-rendering="crispEdges">'
+            f'<rect width="{cols}" height="{rows}" fill="#fff"/><path fill="#000" d="{path}"/></svg>\n')
+
+def render_qr(data: str, size: int = 10, border: int = 4, ecc: str = DEFAULT_ECC):
+    """
+    生成二维码，返回 (QImage, QRPlan)（可在后台线程中调用），结果会被缓存，调用方不要修改返回的图片
+    内容超出二维码容量时抛出 DataOverflowError 或 ValueError
+    """
+    key = (data, size, border, ecc)
+    item = _cache.get(key)
+    if item is None:
+        matrix, plan = build_qr(data, border, ecc)
+        item = (matrix_to_qimage(matrix, size), plan)
+        _cache.put(key, item)
+    return item
+
+def render_qr_image(data: str, size: int = 10, border: int = 4, ecc: str = DEFAULT_ECC) -> QImage:
+    """ 生成二维码 QImage（见 render_qr） """
+    return render_qr(data, size, border, ecc)[0]
+
+def render_qr_svg(data: str, size: int = 10, border: int = 4, ecc: str = DEFAULT_ECC) -> str:
+    """ 生成二维码 SVG 文本，size 为每个模块的显示像素大小 """
+    return matrix_to_svg(build_matrix(data, border, ecc), size)
+
+def generate_qr_image(data: str, size: int = 10, border: int = 4, ecc: str = DEFAULT_ECC) -> QPixmap:
+    """
+    生成二维码图片（需在界面线程中调用）
     :param data: 文本内容
     :param size: 盒子大小
     :param border: 边框宽度
+    :param ecc: 纠错等级 L/M/Q/H，auto 为自动选择
     :return: QPixmap 对象
     """
     if not data:
         return None
-        
+
     try:
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_H,
-            box_size=size,
-            border=border,
-        )
-        qr.add_data(data)
-        qr.make(fit=True)
-
-        img = qr.make_image(fill_color="black", back_color="white")
-        
-        # Convert PIL Image to QPixmap
-        img = img.convert("RGBA")
-        data = img.tobytes("raw", "RGBA")
-        qim = QImage(data, img.size[0], img.size[1], QImage.Format_RGBA8888)
-        pixmap = QPixmap.fromImage(qim)
-        return pixmap
+        return QPixmap.fromImage(render_qr_image(data, size, border, ecc))
     except Exception as e:
         print(f"Generate QR Error: {e}")
         return None
+
+class QRRenderWorker(QThread):
+    """ 在后台线程中生成二维码 """
+    rendered = pyqtSignal(int, object, object, str)  # 请求序号, QImage, QRPlan（失败时均为 None）, 错误信息
+
+    def __init__(self, request_id, data, size=10, border=4, ecc=DEFAULT_ECC):
+        super().__init__()
+        self.request_id = request_id
+        self.args = (data, size, border, ecc)
+
+    def run(self):
+        try:
+            image, plan = render_qr(*self.args)
+            self.rendered.emit(self.request_id, image, plan, "")
+        except (DataOverflowError, ValueError):
+            self.rendered.emit(self.request_id, None, None, "内容过长，超出二维码容量")
+        except Exception as e:
+            self.rendered.emit(self.request_id, None, None, str(e))
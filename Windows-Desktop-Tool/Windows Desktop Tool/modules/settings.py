@@ -1,6 +1,5 @@
 import os
 import sys
-import winreg
 import json
 
 APP_NAME = "UniversalWindowsDesktopTool"
@@ -24,6 +23,8 @@ def set_auto_start(enabled=True):
         app_path = os.path.abspath(sys.argv[0])
     
     try:
+        # 仅在 Windows 上可用，在此处导入使命令行模式等不依赖注册表的场景也能加载设置
+        import winreg
         key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, key_path, 0, winreg.KEY_SET_VALUE)
         if enabled:
             winreg.SetValueEx(key, app_name, 0, winreg.REG_SZ, f'"{app_path}"')
@@ -58,7 +59,11 @@ def load_settings():
         "accent_color": "#1677ff",
         "language": "简体中文",
         "disclaimer_accepted": False,
-        "auto_check_updates": True
+        "auto_check_updates": True,
+        "protected_paths": [],
+        "shred_passes": 1,
+        "watch_folders": [],
+        "converter_warm_up": True
     }
 
     data = {}
@@ -0,0 +1,164 @@
+"""
+粉碎任务预估
+流式遍历目标目录统计文件数与总字节数（按磁盘分组），
+结合缓存的各磁盘写入速度（首次使用时做一次短暂的写入测速）预估粉碎耗时
+"""
+import os
+import json
+import time
+import tempfile
+from PyQt5.QtCore import QThread, pyqtSignal
+from modules.settings import _CONFIG_DIR
+from modules.file_shredder import iter_target_entries
+
+PROFILE_FILE = os.path.join(_CONFIG_DIR, "write_throughput.json")
+# 测速写入量、测速结果有效期
+CALIBRATION_BYTES = 64 * 1024 * 1024
+PROFILE_MAX_AGE = 30 * 24 * 3600
+# 无法测速时使用的保守写入速度，以及每个文件的固定开销（打开、fsync、删除）
+FALLBACK_BPS = 100 * 1024 * 1024
+PER_FILE_OVERHEAD = 0.002
+
+def device_key(path):
+    """ 磁盘标识：Windows 上为盘符（或 UNC 共享），其它系统为设备号 """
+    path = os.path.abspath(path)
+    drive = os.path.splitdrive(path)[0]
+    if drive:
+        return drive.upper()
+    try:
+        return f"dev{os.stat(path).st_dev}"
+    except OSError:
+        return "unknown"
+
+def scan_targets(paths, stop_check=None):
+    """
+    流式遍历粉碎目标，只保存统计值，不在内存中保留文件列表
+    与实际粉碎使用同一遍历（iter_target_entries）：不进入符号链接与目录联接，跳过受保护项目
+    返回 {"bytes", "files", "devices": {磁盘: {"bytes", "files", "dir"}}}
+    """
+    result = {"bytes": 0, "files": 0, "devices": {}}
+    for target in paths:
+        key = device_key(target)
+        device = result["devices"].setdefault(key, {"bytes": 0, "files": 0, "dir": None})
+        if device["dir"] is None:
+            device["dir"] = target if os.path.isdir(target) else os.path.dirname(target)
+
+        for count, (_, st) in enumerate(iter_target_entries(target)):
+            if count % 1000 == 0 and stop_check and stop_check():
+                return result
+            device["bytes"] += st.st_size
+            device["files"] += 1
+
+    for device in result["devices"].values():
+        result["bytes"] += device["bytes"]
+        result["files"] += device["files"]
+    return result
+
+def load_profile():
+    try:
+        with open(PROFILE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f) or {}
+    except Exception:
+        return {}
+
+def save_profile(profile):
+    try:
+        os.makedirs(os.path.dirname(PROFILE_FILE), exist_ok=True)
+        with open(PROFILE_FILE, "w", encoding="utf-8") as f:
+            json.dump(profile, f, indent=2)
+    except Exception as e:
+        print(f"保存写入速度缓存失败: {e}")
+
+def measure_write_throughput(directory, size=CALIBRATION_BYTES, block_size=1024 * 1024):
+    """ 在目录所在磁盘写入并 fsync 一个临时文件，返回写入速度（字节/秒） """
+    block = os.urandom(block_size)
+    fd, path = tempfile.mkstemp(prefix=".shred_calib_", dir=directory)
+    try:
+        start = time.perf_counter()
+        with os.fdopen(fd, "wb", buffering=0) as f:
+            written = 0
+            while written < size:
+                written += f.write(block)
+            os.fsync(f.fileno())
+        elapsed = time.perf_counter() - start
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    return written / elapsed if elapsed > 0 else FALLBACK_BPS
+
+def get_write_throughput(key, directory, profile=None):
+    """ 读取缓存的磁盘写入速度，过期或不存在时重新测速 """
+    profile = load_profile() if profile is None else profile
+    entry = profile.get(key)
+    if entry and time.time() - entry.get("time", 0) < PROFILE_MAX_AGE:
+        return entry["bps"], True
+    try:
+        bps = measure_write_throughput(directory)
+    except OSError:
+        return FALLBACK_BPS, False
+    profile[key] = {"bps": bps, "time": time.time()}
+    save_profile(profile)
+    return bps, False
+
+def estimate_job(paths, passes=1, stop_check=None):
+    """
+    预估粉碎任务：统计数据量并按各磁盘写入速度预测耗时
+    返回 scan_targets 的结果，并补充 "seconds" 与每个磁盘的 "bps"/"seconds"
+    """
+    scan = scan_targets(paths, stop_check)
+    profile = load_profile()
+    total = 0.0
+    for key, device in scan["devices"].items():
+        bps, _ = get_write_throughput(key, device["dir"], profile)
+        device["bps"] = bps
+        device["seconds"] = device["bytes"] * passes / bps + device["files"] * PER_FILE_OVERHEAD
+        total += device["seconds"]
+    scan["seconds"] = total
+    scan["passes"] = passes
+    return scan
+
+def format_size(size):
+    for unit in ["B", "KB", "MB", "GB"]:
+        if size < 1024:
+            return f"{size:.1f} {unit}" if unit != "B" else f"{int(size)} B"
+        size /= 1024
+    return f"{size:.2f} TB"
+
+def format_duration(seconds):
+    seconds = int(round(seconds))
+    if seconds < 1:
+        return "不到 1 秒"
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"约 {hours} 小时 {minutes} 分"
+    if minutes:
+        return f"约 {minutes} 分 {secs} 秒"
+    return f"约 {secs} 秒"
+
+def format_estimate(estimate):
+    """ 生成确认对话框中显示的预估说明 """
+    lines = [f"共 {estimate['files']} 个文件，{format_size(estimate['bytes'])}，"
+             f"覆写 {estimate['passes']} 遍，预计耗时{format_duration(estimate['seconds'])}"]
+    for key, device in sorted(estimate["devices"].items()):
+        lines.append(f"  {key}  {device['files']} 个文件，{format_size(device['bytes'])}，"
+                     f"写入速度约 {device['bps'] / 1024 / 1024:.0f} MB/s")
+    return "\n".join(lines)
+
+class EstimateWorker(QThread):
+    """ 后台预估粉碎任务 """
+    finished = pyqtSignal(dict)
+
+    def __init__(self, paths, passes=1):
+        super().__init__()
+        self.paths = paths
+        self.passes = passes
+
+    def run(self):
+        try:
+            estimate = estimate_job(self.paths, self.passes, self.isInterruptionRequested)
+        except Exception as e:
+            estimate = {"error": str(e)}
+        self.finished.emit(estimate)
@@ -0,0 +1,139 @@
+"""
+文件粉碎任务日志（预写日志）
+记录每个文件计划的覆写遍数与完成情况，程序被强制结束或系统重启后可据此继续未完成的任务
+日志为 JSON Lines 格式，按批次 fsync，避免每条记录都落盘拖慢覆写速度
+"""
+import os
+import json
+import time
+from modules.settings import _CONFIG_DIR
+
+JOURNAL_FILE = os.path.join(_CONFIG_DIR, "shred_journal.jsonl")
+
+class ShredJournal:
+    """ 粉碎任务日志写入器 """
+    def __init__(self, path=JOURNAL_FILE, sync_every=64, sync_interval=1.0):
+        self.path = path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self._file = None
+        self._unsynced = 0
+        self._last_sync = 0.0
+
+    def begin(self, targets, passes):
+        """ 开始新任务（覆盖旧日志），任务记录立即落盘 """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._append({"op": "job", "targets": list(targets), "passes": passes, "time": time.time()})
+        self.sync()
+
+    def resume(self):
+        """ 继续已有任务，在原日志后追加 """
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def plan(self, path, size, passes):
+        self._append({"op": "plan", "path": path, "size": size, "passes": passes})
+
+    def pass_done(self, path, completed):
+        self._append({"op": "pass", "path": path, "n": completed})
+
+    def file_done(self, path):
+        self._append({"op": "file", "path": path})
+
+    def target_done(self, target, success):
+        self._append({"op": "target", "path": target, "ok": bool(success)})
+
+    def finish(self):
+        """ 任务正常结束，删除日志 """
+        self.close()
+        _destroy_journal(self.path)
+
+    def close(self):
+        if self._file is not None:
+            try:
+                self.sync()
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+    def sync(self):
+        if self._file is None:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _append(self, record):
+        if self._file is None:
+            return
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._unsynced += 1
+        # 丢失未落盘的完成记录只会导致重做该文件，因此可以放心按批次 fsync
+        if self._unsynced >= self.sync_every or time.monotonic() - self._last_sync >= self.sync_interval:
+            self.sync()
+
+class JournalState:
+    """ 从日志恢复出的未完成任务状态 """
+    def __init__(self, targets, passes):
+        self.targets = targets
+        self.passes = passes
+        self.done_targets = set()
+        self.done_files = set()
+        self.file_passes = {}  # 文件 -> 已完成的覆写遍数
+
+    @property
+    def remaining_targets(self):
+        return [t for t in self.targets if t not in self.done_targets]
+
+    def completed_passes(self, path):
+        return self.file_passes.get(path, 0)
+
+def load_pending_job(path=JOURNAL_FILE):
+    """ 读取未完成的粉碎任务，没有则返回 None """
+    if not os.path.exists(path):
+        return None
+    state = None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # 崩溃时最后一行可能只写了一半
+                    break
+                op = record.get("op")
+                if op == "job":
+                    state = JournalState(record.get("targets") or [], int(record.get("passes") or 1))
+                elif state is None:
+                    continue
+                elif op == "pass":
+                    state.file_passes[record["path"]] = record["n"]
+                elif op == "file":
+                    state.done_files.add(record["path"])
+                elif op == "target" and record.get("ok"):
+                    state.done_targets.add(record["path"])
+    except Exception as e:
+        print(f"读取粉碎日志失败: {e}")
+        return None
+    if state is None or not state.remaining_targets:
+        discard_pending_job(path)
+        return None
+    return state
+
+def discard_pending_job(path=JOURNAL_FILE):
+    """ 放弃未完成的任务 """
+    _destroy_journal(path)
+
+def _destroy_journal(path):
+    """ 日志中是被粉碎文件的完整路径，删除前先用随机数据覆写一遍，避免从配置目录恢复出文件名 """
+    from modules.file_shredder import overwrite_file
+    try:
+        overwrite_file(path, 1)
+    except OSError:
+        pass
+    try:
+        os.remove(path)
+    except OSError:
+        pass
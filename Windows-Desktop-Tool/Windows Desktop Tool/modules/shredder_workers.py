@@ -0,0 +1,90 @@
+"""
+文件粉碎的后台线程（界面使用）
+粉碎与校验逻辑在 modules.file_shredder 中，不依赖 Qt，命令行模式可直接调用
+"""
+import os
+from PyQt5.QtCore import QThread, pyqtSignal
+from modules.file_shredder import (DEFAULT_PASSES, LockHolderIndex, ShredControl, format_holders,
+                                   is_system_path, shred_paths)
+
+# 分类结果每批发送的路径数（大批量添加时界面按批追加刷新）
+CLASSIFY_BATCH = 2000
+
+class ValidationWorker(QThread):
+    """
+    后台校验：先按受保护路径规则分类并区分文件/文件夹（classified，分批发送），
+    再一次性快照进程打开的文件，逐个路径查表检查占用情况
+    """
+    classified = pyqtSignal(list) # [(路径, 是否受保护, 原因, 是否为文件夹)]
+    finished = pyqtSignal(str, bool, str) # 路径, 是否是系统文件, 原因（仅对系统文件发出）
+    holders_found = pyqtSignal(str, str) # 路径, 占用进程描述
+    done = pyqtSignal() # 全部校验完成
+
+    def __init__(self, paths):
+        super().__init__()
+        self.paths = list(paths)
+
+    def run(self):
+        batch = []
+        allowed = []
+        for path in self.paths:
+            is_sys, reason = is_system_path(path, check_processes=False)
+            batch.append((path, is_sys, reason, os.path.isdir(path)))
+            if not is_sys:
+                allowed.append(path)
+            if len(batch) >= CLASSIFY_BATCH:
+                self.classified.emit(batch)
+                batch = []
+        if batch:
+            self.classified.emit(batch)
+        # 受保护的路径已标记为禁止粉碎，不再检查占用
+        self.paths = allowed
+
+        try:
+            lock_index = LockHolderIndex().snapshot()
+        except Exception:
+            lock_index = None
+
+        for path in self.paths:
+            is_sys, reason = is_system_path(path, check_processes=lock_index is not None, lock_index=lock_index)
+            # 大批量文件时只发送需要界面处理的结果，减少跨线程信号
+            if is_sys:
+                self.finished.emit(path, True, reason)
+            elif lock_index is not None:
+                holders = lock_index.holders(path, recursive=True)
+                if holders:
+                    self.holders_found.emit(path, format_holders(holders))
+        self.done.emit()
+
+class ShredderWorker(QThread):
+    progress = pyqtSignal(int, str)
+    file_finished = pyqtSignal(str, bool, str) # 路径, 是否成功, 消息
+    summary = pyqtSignal(dict) # 任务汇总（含取消时已处理/未处理的项目）
+    finished = pyqtSignal(int, int, list) # 成功数, 失败数, 错误列表
+
+    def __init__(self, paths, passes=DEFAULT_PASSES, resume=None):
+        """
+        passes: 删除前的覆写遍数
+        resume: 从日志恢复的未完成任务（JournalState），跳过已完成的文件与覆写遍数
+        """
+        super().__init__()
+        self.paths = paths
+        self.passes = resume.passes if resume else passes
+        self.resume = resume
+        self.control = ShredControl()
+
+    def cancel(self):
+        self.control.cancel()
+
+    def pause(self):
+        self.control.pause()
+
+    def resume_work(self):
+        self.control.resume()
+
+    def run(self):
+        result = shred_paths(self.paths, self.passes, self.resume, self.control,
+                             on_progress=self.progress.emit, on_file=self.file_finished.emit)
+        errors = result.pop("errors")
+        self.summary.emit(result)
+        self.finished.emit(result["success"], result["failed"], errors)
@@ -0,0 +1,135 @@
+"""
+SVG 栅格化与多尺寸 ICO 导出
+每个 SVG 只解析一次，按需渲染各个尺寸；渲染结果按 (文件哈希, 尺寸) 缓存，
+重复导出或预览同一文件时无需重新解析和绘制
+"""
+import os
+import struct
+import hashlib
+import threading
+from collections import OrderedDict
+from PyQt5.QtCore import Qt, QRectF, QByteArray, QBuffer, QIODevice
+from PyQt5.QtGui import QImage, QPainter
+from PyQt5.QtSvg import QSvgRenderer
+
+# Windows 图标的标准尺寸
+ICO_SIZES = (16, 24, 32, 48, 64, 128, 256)
+# 缓存的渲染结果数量上限（256px 约 256KB，全部缓存约 16MB）
+CACHE_SIZE = 64
+
+class RasterCache:
+    """ 线程安全的 LRU 缓存：(文件哈希, 宽, 高) -> QImage """
+    def __init__(self, capacity=CACHE_SIZE):
+        self.capacity = capacity
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            image = self._items.get(key)
+            if image is not None:
+                self._items.move_to_end(key)
+            return image
+
+    def put(self, key, image):
+        with self._lock:
+            self._items[key] = image
+            self._items.move_to_end(key)
+            while len(self._items) > self.capacity:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+_cache = RasterCache()
+_hash_memo = {}  # (路径, 修改时间, 大小) -> 内容哈希
+
+def file_hash(path):
+    """ 文件内容哈希，按 (路径, 修改时间, 大小) 记忆，文件未变化时不重复读取 """
+    st = os.stat(path)
+    memo_key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    digest = _hash_memo.get(memo_key)
+    if digest is None:
+        with open(path, "rb") as f:
+            digest = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+        _hash_memo[memo_key] = digest
+    return digest
+
+def fit_size(renderer, size):
+    """ 按 SVG 的宽高比计算最长边为 size 的输出尺寸 """
+    default = renderer.defaultSize()
+    if default.width() <= 0 or default.height() <= 0 or default.width() == default.height():
+        return size, size
+    if default.width() > default.height():
+        return size, max(1, round(size * default.height() / default.width()))
+    return max(1, round(size * default.width() / default.height())), size
+
+def _render(renderer, width, height, canvas=None):
+    """ 渲染到透明画布；canvas 为正方形边长时居中放置（图标需要正方形） """
+    canvas_w, canvas_h = (canvas, canvas) if canvas else (width, height)
+    image = QImage(canvas_w, canvas_h, QImage.Format_ARGB32)
+    image.fill(Qt.transparent)
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setRenderHint(QPainter.SmoothPixmapTransform)
+    renderer.render(painter, QRectF((canvas_w - width) / 2, (canvas_h - height) / 2, width, height))
+    painter.end()
+    return image
+
+def rasterize(svg_path, sizes, square=False):
+    """
+    将 SVG 渲染为多个尺寸，返回 {尺寸: QImage}
+    square: 为 True 时输出正方形画布（ICO 使用），否则按宽高比，size 为最长边
+    未命中缓存时才解析 SVG，且所有尺寸共用同一个 QSvgRenderer
+    """
+    digest = file_hash(svg_path)
+    result = {}
+    renderer = None
+    for size in sizes:
+        key = (digest, size, square)
+        image = _cache.get(key)
+        if image is None:
+            if renderer is None:
+                renderer = QSvgRenderer(svg_path)
+                if not renderer.isValid():
+                    raise ValueError("无效的 SVG 文件")
+            width, height = fit_size(renderer, size)
+            image = _render(renderer, width, height, size if square else None)
+            _cache.put(key, image)
+        result[size] = image
+    return result
+
+def render_svg(svg_path, size):
+    """ 渲染单个尺寸（最长边为 size），用于导出位图和预览 """
+    return rasterize(svg_path, [size])[size]
+
+def _png_bytes(image):
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, "PNG")
+    buffer.close()
+    return bytes(data)
+
+def pack_ico(images):
+    """
+    将 {尺寸: QImage} 打包为 ICO 文件内容，每个尺寸以 PNG 格式存储（Windows Vista 及以上支持）
+    ICO 结构：ICONDIR(6 字节) + ICONDIRENTRY(每项 16 字节) + 图像数据
+    """
+    entries = [(size, _png_bytes(images[size])) for size in sorted(images)]
+    header = struct.pack("<HHH", 0, 1, len(entries))
+    offset = len(header) + 16 * len(entries)
+    directory = []
+    for size, png in entries:
+        # 宽高字段为 1 字节，256 记为 0
+        dim = 0 if size >= 256 else size
+        directory.append(struct.pack("<BBBBHHII", dim, dim, 0, 0, 1, 32, len(png), offset))
+        offset += len(png)
+    return header + b"".join(directory) + b"".join(png for _, png in entries)
+
+def export_ico(svg_path, ico_path, sizes=ICO_SIZES):
+    """ 导出包含多个尺寸的 ICO 文件 """
+    data = pack_ico(rasterize(svg_path, sizes, square=True))
+    with open(ico_path, "wb") as f:
+        f.write(data)
@@ -0,0 +1,172 @@
+"""
+视频转换方案规划
+根据 probe 得到的各路流编码与目标容器的兼容表，逐路决定直接复制（-c copy）、转码或丢弃：
+编码已被目标容器支持时只重新封装，几秒即可完成；否则只对不兼容的那一路流转码
+"""
+import os
+
+# 目标容器可直接容纳的编码（None 表示不限制）
+CONTAINER_CODECS = {
+    "mp4": {
+        "video": {"h264", "hevc", "av1", "vp9", "mpeg4", "mpeg2video", "mpeg1video"},
+        "audio": {"aac", "mp3", "ac3", "eac3", "alac", "opus", "flac"},
+        "subtitle": {"mov_text"},
+    },
+    "mov": {
+        "video": {"h264", "hevc", "mpeg4", "prores", "mjpeg", "png", "dnxhd", "mpeg2video"},
+        "audio": {"aac", "mp3", "alac", "ac3", "pcm_s16le", "pcm_s24le", "pcm_f32le"},
+        "subtitle": {"mov_text"},
+    },
+    "mkv": {
+        "video": None,
+        "audio": None,
+        "subtitle": {"subrip", "ass", "ssa", "webvtt", "hdmv_pgs_subtitle", "dvd_subtitle", "dvb_subtitle"},
+    },
+    "avi": {
+        "video": {"mpeg4", "msmpeg4v2", "msmpeg4v3", "mjpeg", "h264", "rawvideo"},
+        "audio": {"mp3", "ac3", "pcm_s16le"},
+        "subtitle": set(),
+    },
+}
+
+# 需要转码时使用的编码器及编码参数（参数按输出流序号添加流说明符）
+_X264 = ("libx264", {"preset": "medium", "crf": "23"})
+_AAC = ("aac", {"b": "192k"})
+DEFAULT_ENCODERS = {
+    "mp4": {"video": _X264, "audio": _AAC, "subtitle": ("mov_text", {})},
+    "mov": {"video": _X264, "audio": _AAC, "subtitle": ("mov_text", {})},
+    "mkv": {"video": _X264, "audio": _AAC, "subtitle": ("srt", {})},
+    "avi": {"video": ("mpeg4", {"q": "3"}), "audio": ("libmp3lame", {"q": "2"}), "subtitle": None},
+}
+
+# 直接复制时需要的码流过滤器：AVI 只能存放 Annex B 格式的 H.264（mp4/mkv 中为 avcC 格式）
+COPY_BITSTREAM_FILTERS = {("avi", "h264"): "h264_mp4toannexb"}
+
+# 可以转为文本字幕的字幕编码（图形字幕无法转为 mov_text / srt）
+TEXT_SUBTITLES = {"subrip", "ass", "ssa", "webvtt", "mov_text", "text"}
+
+# 粗略的处理速度（相对实时播放的倍数），用于估算耗时
+COPY_SPEED = 200.0
+AUDIO_SPEED = 80.0
+# 1080p 视频用 libx264 medium 转码的速度，其他分辨率按像素数换算
+VIDEO_SPEED_1080P = 1.5
+_PIXELS_1080P = 1920 * 1080
+
+ACTION_COPY = "copy"
+ACTION_TRANSCODE = "transcode"
+ACTION_DROP = "drop"
+
+def container_of(path_or_format):
+    """ 由文件路径或格式名得到容器名（mp4 / mkv / mov / avi） """
+    name = path_or_format.lower()
+    if "." in name:
+        name = os.path.splitext(name)[1]
+    name = name.lstrip(".")
+    return {"m4v": "mp4", "webm": "mkv", "qt": "mov"}.get(name, name)
+
+_KIND_NAMES = {"video": "视频", "audio": "音频", "subtitle": "字幕"}
+
+def _accepts(container, kind, codec):
+    allowed = CONTAINER_CODECS[container].get(kind)
+    return allowed is None or codec in allowed
+
+def _stream_action(stream, container):
+    """ 返回 (动作, 编码器, 附加参数, 说明) """
+    kind, codec = stream["type"], stream["codec"]
+    if stream.get("attached_pic"):
+        return ACTION_DROP, None, {}, "封面图片不保留"
+    if kind == "attachment":
+        if container == "mkv":
+            return ACTION_COPY, None, {}, "复制附件"
+        return ACTION_DROP, None, {}, "目标容器不支持附件"
+    if kind not in ("video", "audio", "subtitle"):
+        return ACTION_DROP, None, {}, "丢弃数据流"
+    if _accepts(container, kind, codec):
+        return ACTION_COPY, None, {}, f"复制 {codec}"
+    encoder = DEFAULT_ENCODERS[container].get(kind)
+    if encoder is None:
+        return ACTION_DROP, None, {}, f"目标容器不支持{_KIND_NAMES[kind]}"
+    if kind == "subtitle" and codec not in TEXT_SUBTITLES:
+        return ACTION_DROP, None, {}, f"图形字幕 {codec} 无法转换"
+    name, extra = encoder
+    return ACTION_TRANSCODE, name, extra, f"{codec} → {name}"
+
+def _estimate_seconds(actions, duration):
+    """ 估算耗时：每路流按各自的处理速度累加 """
+    if not duration:
+        return None
+    seconds = duration / COPY_SPEED
+    for action in actions:
+        if action["action"] != ACTION_TRANSCODE:
+            continue
+        if action["type"] == "video":
+            pixels = (action.get("width") or 1920) * (action.get("height") or 1080)
+            seconds += duration / (VIDEO_SPEED_1080P * _PIXELS_1080P / max(pixels, 1))
+        else:
+            seconds += duration / AUDIO_SPEED
+    return seconds
+
+def stream_args(action, out_index, container, input_index=0):
+    """ 单路流的 ffmpeg 参数：映射、编码器（或 copy）、编码参数、码流过滤器与标签 """
+    args = ["-map", f"{input_index}:{action['index']}", f"-c:{out_index}", action["encoder"] or "copy"]
+    for option, value in action["options"].items():
+        args += [f"-{option}:{out_index}", value]
+    if action["action"] == ACTION_COPY:
+        bsf = COPY_BITSTREAM_FILTERS.get((container, action["codec"]))
+        if bsf:
+            args += [f"-bsf:{out_index}", bsf]
+        if action["codec"] == "hevc" and container in ("mp4", "mov"):
+            # hvc1 标签：QuickTime 与 Windows 自带播放器才能识别
+            args += [f"-tag:{out_index}", "hvc1"]
+    return args
+
+def plan_conversion(info, target_format):
+    """
+    根据 probe 的结果规划转换，返回
+    {"container", "mode", "streams": [...], "args": ffmpeg 输出参数, "seconds": 预计耗时或 None}
+    mode: "remux" 全部流直接复制 / "partial" 只转码部分流 / "transcode" 所有视频流都需转码
+    """
+    container = container_of(target_format)
+    if container not in CONTAINER_CODECS:
+        raise ValueError(f"不支持的目标格式: {target_format}")
+    actions = []
+    args = []
+    out_index = 0
+    for stream in info["streams"]:
+        action, encoder, extra, note = _stream_action(stream, container)
+        actions.append({**stream, "action": action, "encoder": encoder, "options": extra, "note": note})
+        if action == ACTION_DROP:
+            continue
+        args += stream_args(actions[-1], out_index, container)
+        out_index += 1
+    if out_index == 0:
+        raise ValueError("源文件中没有可转换的音视频流")
+
+    kept = [a for a in actions if a["action"] != ACTION_DROP]
+    videos = [a for a in kept if a["type"] == "video"]
+    if all(a["action"] == ACTION_COPY for a in kept):
+        mode = "remux"
+    elif videos and all(a["action"] == ACTION_TRANSCODE for a in videos):
+        mode = "transcode"
+    else:
+        mode = "partial"
+    return {"container": container, "mode": mode, "streams": actions, "args": args,
+            "seconds": _estimate_seconds(actions, info.get("duration"))}
+
+_MODE_NAMES = {"remux": "直接复制流（仅重新封装）", "partial": "部分转码", "transcode": "重新编码视频"}
+
+def format_seconds(seconds):
+    if seconds < 60:
+        return f"{max(1, round(seconds))} 秒"
+    if seconds < 3600:
+        return f"{seconds / 60:.0f} 分钟"
+    return f"{seconds / 3600:.1f} 小时"
+
+def describe_plan(plan):
+    """ 方案的简短说明，用于界面展示 """
+    lines = [_MODE_NAMES[plan["mode"]]]
+    if plan["seconds"] is not None:
+        lines[0] += f"，预计约 {format_seconds(plan['seconds'])}"
+    for s in plan["streams"]:
+        lines.append(f"#{s['index']} {_KIND_NAMES.get(s['type'], s['type'])}：{s['note']}")
+    return "\n".join(lines)
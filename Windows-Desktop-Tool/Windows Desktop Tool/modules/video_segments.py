@@ -0,0 +1,141 @@
+"""
+分段并行视频转码
+视频流先按关键帧切分（流复制，不重新编码）为若干段，多个 ffmpeg 进程同时转码各段，
+再用 concat 分离器无损拼接；音频、字幕等其余流直接从源文件单独处理后一起封装。
+适用于单进程多线程扩展性较差的编码器/预设，以及长视频
+"""
+import os
+import glob
+import time
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from modules.conversion_jobs import report_progress, is_cancelled
+from modules.ffmpeg_tools import run_ffmpeg, error_summary
+from modules.video_plan import ACTION_DROP, ACTION_TRANSCODE, stream_args
+
+# 时长不足该值（秒）时不分段：切分与拼接的额外开销得不偿失
+PARALLEL_MIN_SECONDS = 60
+# 每段的最短时长（秒）
+MIN_SEGMENT_SECONDS = 10
+# 每个进程平均分到的段数：段越多负载越均衡，但每段开头的编码器预热开销越多
+SEGMENTS_PER_WORKER = 2
+# 单进程多线程扩展性较差的编码器：只有这些编码器会自动分段；
+# libx264 等本身就能用满所有核，分段不会更快，只会增加关键帧切分与拼接的风险
+POOR_SCALING_ENCODERS = {"mpeg4", "msmpeg4v2", "msmpeg4v3", "libvpx", "libvpx-vp9", "libaom-av1", "libtheora"}
+
+def primary_video(plan):
+    """ 可分段转码时返回需要转码的那一路视频流，否则返回 None（仅支持单路视频流） """
+    videos = [s for s in plan["streams"] if s["type"] == "video" and s["action"] != ACTION_DROP]
+    if len(videos) != 1 or videos[0]["action"] != ACTION_TRANSCODE:
+        return None
+    return videos[0]
+
+def can_split(plan, duration, workers, force=False):
+    """
+    是否分段转码：默认只对扩展性较差的编码器、多核且足够长的视频启用
+    force: 忽略编码器、时长与核数的限制（仍需要已知时长与可转码的视频流）
+    """
+    video = primary_video(plan) if duration else None
+    if video is None:
+        return False
+    return force or (video["encoder"] in POOR_SCALING_ENCODERS and workers > 1
+                     and duration >= PARALLEL_MIN_SECONDS)
+
+def segment_count(duration, workers):
+    return max(2, min(workers * SEGMENTS_PER_WORKER, int(duration // MIN_SEGMENT_SECONDS)))
+
+def _concat_list(paths, list_path):
+    """ 写出 concat 分离器使用的文件列表（单引号需转义） """
+    with open(list_path, "w", encoding="utf-8") as f:
+        for path in paths:
+            escaped = path.replace("\\", "/").replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+
+def split_video(input_path, stream_index, segment_seconds, work_dir):
+    """ 按关键帧把视频流切分为约 segment_seconds 秒的若干段（流复制），返回各段路径 """
+    pattern = os.path.join(work_dir, "src_%04d.mkv")
+    returncode, log, _ = run_ffmpeg(["-i", input_path, "-map", f"0:{stream_index}", "-c", "copy",
+                                     "-f", "segment", "-segment_time", f"{segment_seconds:.3f}",
+                                     "-segment_format", "matroska", "-reset_timestamps", "1", pattern])
+    if returncode != 0:
+        raise RuntimeError(error_summary(log))
+    return sorted(glob.glob(os.path.join(work_dir, "src_*.mkv")))
+
+def transcode_segmented(input_path, output_path, plan, duration, workers=None):
+    """
+    分段并行转码，返回 (是否成功, 消息)
+    plan: video_plan.plan_conversion 的结果；workers: 同时运行的 ffmpeg 进程数，默认等于 CPU 核数
+    """
+    workers = max(1, workers or os.cpu_count() or 1)
+    video = primary_video(plan)
+    container = plan["container"]
+    # 每个进程分到的编码线程数，合计不超过 CPU 核数
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    start_time = time.perf_counter()
+
+    work_dir = tempfile.mkdtemp(prefix=".segments_", dir=os.path.dirname(os.path.abspath(output_path)))
+    try:
+        report_progress(0, "正在按关键帧切分")
+        sources = split_video(input_path, video["index"],
+                              duration / segment_count(duration, workers), work_dir)
+        if is_cancelled():
+            return False, "已取消"
+
+        encoded = [os.path.join(work_dir, f"enc_{i:04d}.mkv") for i in range(len(sources))]
+        out_times = [0.0] * len(sources)
+        stop = threading.Event()
+        encode_args = ["-c:v", video["encoder"], "-threads", str(threads)]
+        for option, value in video["options"].items():
+            encode_args += [f"-{option}:v", value]
+
+        def encode(i):
+            def on_progress(percent, stats):
+                if stats["out_time"] is not None:
+                    out_times[i] = stats["out_time"]
+            return run_ffmpeg(["-i", sources[i], "-map", "0:v:0", *encode_args, encoded[i]],
+                              progress_callback=on_progress, cancel_check=stop.is_set)
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending = {pool.submit(encode, i) for i in range(len(sources))}
+            error = None
+            while pending:
+                done, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                for future in done:
+                    returncode, log, cancelled = future.result()
+                    if returncode != 0 and not cancelled and error is None:
+                        error = error_summary(log)
+                        stop.set()
+                if is_cancelled():
+                    stop.set()
+                elapsed = time.perf_counter() - start_time
+                speed = sum(out_times) / elapsed if elapsed > 0 else 0
+                report_progress(min(95, sum(out_times) * 95 / duration),
+                                f"分段转码 {len(sources) - len(pending)}/{len(sources)}，{speed:.2f}x")
+        if is_cancelled():
+            return False, "已取消"
+        if error:
+            return False, error
+
+        # 拼接视频段，其余流从源文件映射并按方案复制或转码
+        report_progress(95, "正在拼接")
+        list_path = os.path.join(work_dir, "segments.txt")
+        _concat_list(encoded, list_path)
+        args = ["-f", "concat", "-safe", "0", "-i", list_path, "-i", input_path,
+                "-map", "0:v:0", "-c:0", "copy"]
+        out_index = 1
+        for stream in plan["streams"]:
+            if stream is video or stream["action"] == ACTION_DROP:
+                continue
+            args += stream_args(stream, out_index, container, input_index=1)
+            out_index += 1
+        returncode, log, cancelled = run_ffmpeg([*args, output_path], duration, cancel_check=is_cancelled)
+        if cancelled:
+            return False, "已取消"
+        if returncode != 0:
+            return False, error_summary(log)
+        speed = duration / max(time.perf_counter() - start_time, 1e-6)
+        return True, f"转换成功（{len(sources)} 段并行，{speed:.2f}x）"
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
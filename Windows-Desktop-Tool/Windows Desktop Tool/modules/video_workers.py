@@ -0,0 +1,21 @@
+"""
+视频相关的后台线程（界面使用）
+ffprobe 读取网络共享或较慢磁盘上的文件可能需要数秒，不能在界面线程中执行
+"""
+from PyQt5.QtCore import QThread, pyqtSignal
+
+class VideoProbeWorker(QThread):
+    """ 后台读取视频的流信息 """
+    probed = pyqtSignal(str, object)  # 路径, 流信息（未安装 ffmpeg 或读取失败时为 None）
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+
+    def run(self):
+        try:
+            from modules.ffmpeg_tools import find_tool, probe
+            info = probe(self.path) if find_tool("ffmpeg") else None
+        except Exception:
+            info = None
+        self.probed.emit(self.path, info)
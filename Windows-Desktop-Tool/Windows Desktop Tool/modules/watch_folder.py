@@ -0,0 +1,296 @@
+"""
+监视文件夹自动转换
+监视指定文件夹中新建/修改的文件（已安装 watchdog 时使用其系统通知，否则使用 Qt 的 QFileSystemWatcher，均不轮询目录），
+文件大小与修改时间在一段时间内不再变化（仍在写入的文件不处理）后，按扩展名规则提交到后台转换任务队列；
+已处理的文件记录在配置目录中，程序重启后不会重复转换
+"""
+import os
+import json
+import time
+import threading
+from PyQt5.QtCore import QObject, QTimer, QFileSystemWatcher, pyqtSignal
+from modules.settings import _CONFIG_DIR
+from modules.file_converter import resolve_conversion
+
+STATE_FILE = os.path.join(_CONFIG_DIR, "watch_folders_state.json")
+# 文件大小与修改时间保持不变多久（秒）后视为写入完成
+DEBOUNCE_SECONDS = 2.0
+# 检查待处理文件的间隔（毫秒），只在有待处理文件时运行
+CHECK_INTERVAL_MS = 500
+# 未指定输出目录时，转换结果放在被监视文件夹下的该子文件夹中
+DEFAULT_OUTPUT_SUBDIR = "converted"
+# 临时文件与 Office 锁文件不处理
+_IGNORED_SUFFIXES = (".part", ".tmp", ".crdownload", ".download")
+
+def parse_rules(text):
+    """
+    解析规则文本，如 "png>jpg, docx>pdf"（也可用 -> 或 →），返回 {".png": "jpg", ...}
+    不支持的转换抛出 ValueError
+    """
+    rules = {}
+    for item in text.replace("，", ",").replace(";", ",").split(","):
+        item = item.strip().replace("→", ">").replace("->", ">")
+        if not item:
+            continue
+        source, sep, target = item.partition(">")
+        if not sep:
+            raise ValueError(f"规则格式错误: {item}")
+        ext = "." + source.strip().lstrip(".").lower()
+        target = target.strip().lstrip(".").lower()
+        if target == "jpeg":
+            target = "jpg"
+        if resolve_conversion(ext, target) is None:
+            raise ValueError(f"不支持的转换: {ext} → {target}")
+        rules[ext] = target
+    if not rules:
+        raise ValueError("请至少填写一条规则")
+    return rules
+
+def format_rules(rules):
+    return ", ".join(f"{ext.lstrip('.')}>{target}" for ext, target in rules.items())
+
+def file_signature(path):
+    """ (大小, 修改时间)，用于判断文件是否写入完成以及是否已处理过 """
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+class ProcessedState:
+    """ 已处理文件记录：路径 -> 处理时的文件签名，签名变化（文件被修改）后会重新转换 """
+    def __init__(self, path=STATE_FILE):
+        self.path = path
+        self._files = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                files = json.load(f).get("files", {})
+        except (OSError, ValueError):
+            files = {}
+        # 源文件已不存在的记录不再保留
+        self._files = {p: info for p, info in files.items() if os.path.exists(p)}
+
+    def save(self):
+        with self._lock:
+            data = json.dumps({"files": self._files}, ensure_ascii=False)
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    def is_processed(self, path, signature):
+        info = self._files.get(os.path.normcase(os.path.abspath(path)))
+        return info is not None and tuple(info["signature"]) == tuple(signature)
+
+    def mark(self, path, signature, success, output):
+        with self._lock:
+            self._files[os.path.normcase(os.path.abspath(path))] = {
+                "signature": list(signature), "ok": bool(success), "output": output, "time": time.time()}
+
+def _start_watchdog(paths, callback):
+    """ 用 watchdog 监视各文件夹（不含子文件夹），未安装 watchdog 时返回 None """
+    try:
+        from watchdog.observers import Observer
+        from watchdog.events import FileSystemEventHandler
+    except ImportError:
+        return None
+
+    class Handler(FileSystemEventHandler):
+        def on_created(self, event):
+            if not event.is_directory:
+                callback(event.src_path)
+
+        def on_modified(self, event):
+            if not event.is_directory:
+                callback(event.src_path)
+
+        def on_moved(self, event):
+            if not event.is_directory:
+                callback(event.dest_path)
+
+    observer = Observer()
+    handler = Handler()
+    for path in paths:
+        observer.schedule(handler, path, recursive=False)
+    observer.start()
+    return observer
+
+class WatchFolderService(QObject):
+    """
+    监视文件夹服务（在界面线程中创建）
+    folders: [{"path": 文件夹, "rules": {".png": "jpg"}, "output": 输出目录（可为空）}]
+    """
+    file_queued = pyqtSignal(str, str)           # 源文件, 输出文件
+    file_finished = pyqtSignal(str, bool, str)   # 源文件, 是否成功, 消息
+    _changed = pyqtSignal(str)                   # 后台通知线程 -> 界面线程
+    _done = pyqtSignal(str, object, str, object)  # 源文件, 签名, 输出文件, (是否成功, 消息)
+
+    def __init__(self, state=None, debounce=DEBOUNCE_SECONDS, parent=None):
+        super().__init__(parent)
+        self.state = state or ProcessedState()
+        self.debounce = debounce
+        self.folders = []
+        self.backend = None
+        self._observer = None
+        self._qt_watcher = None
+        self._pending = {}     # 路径 -> (签名, 签名最后变化的时间)
+        self._in_flight = set()
+        self._timer = QTimer(self)
+        self._timer.setInterval(CHECK_INTERVAL_MS)
+        self._timer.timeout.connect(self._check_pending)
+        self._changed.connect(self._on_changed)
+        self._done.connect(self._on_done)
+
+    def set_folders(self, folders):
+        """ 更新监视的文件夹并重新开始监视 """
+        self.stop()
+        self.folders = [{"path": os.path.abspath(f["path"]), "rules": dict(f.get("rules", {})),
+                         "output": f.get("output") or ""} for f in folders if f.get("path")]
+        if self.folders:
+            self.start()
+
+    def start(self):
+        paths = [f["path"] for f in self.folders if os.path.isdir(f["path"])]
+        if not paths:
+            return
+        self._observer = _start_watchdog(paths, self._changed.emit)
+        if self._observer is not None:
+            self.backend = "watchdog"
+        else:
+            self._qt_watcher = QFileSystemWatcher(paths, self)
+            self._qt_watcher.directoryChanged.connect(self._scan_folder)
+            self.backend = "QFileSystemWatcher"
+        # 程序未运行期间放入的文件
+        for path in paths:
+            self._scan_folder(path)
+
+    def stop(self):
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=2)
+            self._observer = None
+        if self._qt_watcher is not None:
+            self._qt_watcher.deleteLater()
+            self._qt_watcher = None
+        self.backend = None
+        self._pending.clear()
+        self._timer.stop()
+
+    def _folder_of(self, path):
+        parent = os.path.normcase(os.path.dirname(os.path.abspath(path)))
+        for folder in self.folders:
+            if os.path.normcase(folder["path"]) == parent:
+                return folder
+        return None
+
+    def _scan_folder(self, folder_path):
+        """ 目录变化通知（QFileSystemWatcher 只通知目录）或启动时：检查目录中的文件 """
+        try:
+            with os.scandir(folder_path) as it:
+                names = [entry.path for entry in it if entry.is_file()]
+        except OSError:
+            return
+        for path in names:
+            self._on_changed(path)
+
+    def _on_changed(self, path):
+        name = os.path.basename(path)
+        if name.startswith("~$") or name.lower().endswith(_IGNORED_SUFFIXES):
+            return
+        folder = self._folder_of(path)
+        if folder is None or os.path.splitext(name)[1].lower() not in folder["rules"]:
+            return
+        if path in self._in_flight:
+            return
+        try:
+            signature = file_signature(path)
+        except OSError:
+            self._pending.pop(path, None)
+            return
+        if self.state.is_processed(path, signature):
+            return
+        previous = self._pending.get(path)
+        if previous is None or previous[0] != signature:
+            self._pending[path] = (signature, time.monotonic())
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _check_pending(self):
+        """ 大小与修改时间在 debounce 秒内未变化、且可以打开的文件视为写入完成 """
+        now = time.monotonic()
+        for path, (signature, since) in list(self._pending.items()):
+            try:
+                current = file_signature(path)
+            except OSError:
+                del self._pending[path]
+                continue
+            if current != signature:
+                self._pending[path] = (current, now)
+            elif now - since >= self.debounce and self._can_open(path):
+                del self._pending[path]
+                self._submit(path, current)
+        if not self._pending:
+            self._timer.stop()
+
+    @staticmethod
+    def _can_open(path):
+        """ Windows 上写入方通常独占文件，能以读写方式打开时说明写入已结束 """
+        if not os.access(path, os.W_OK):
+            return True
+        try:
+            with open(path, "rb+"):
+                return True
+        except OSError:
+            return False
+
+    def output_path(self, folder, path):
+        output_dir = folder["output"] or os.path.join(folder["path"], DEFAULT_OUTPUT_SUBDIR)
+        stem, ext = os.path.splitext(os.path.basename(path))
+        return os.path.join(output_dir, f"{stem}.{folder['rules'][ext.lower()]}")
+
+    def _submit(self, path, signature):
+        from modules import file_converter
+        folder = self._folder_of(path)
+        if folder is None:
+            return
+        ext = os.path.splitext(path)[1].lower()
+        func_name, args = resolve_conversion(ext, folder["rules"][ext])
+        output = self.output_path(folder, path)
+        try:
+            os.makedirs(os.path.dirname(output), exist_ok=True)
+        except OSError as e:
+            self._on_done(path, signature, output, (False, str(e)))
+            return
+        self._in_flight.add(path)
+        future = file_converter.submit_conversion(getattr(file_converter, func_name), path, output, *args,
+                                                  name=f"监视: {os.path.basename(path)}")
+        # 回调在任务线程中执行，通过信号回到界面线程
+        future.add_done_callback(lambda f: self._done.emit(path, signature, output, self._result(f)))
+        self.file_queued.emit(path, output)
+
+    @staticmethod
+    def _result(future):
+        if future.cancelled():
+            return None
+        try:
+            return future.result()
+        except Exception as e:
+            return False, str(e)
+
+    def _on_done(self, path, signature, output, result):
+        self._in_flight.discard(path)
+        if result is None:
+            # 被取消的任务不记录，下次启动或文件变化时重新转换
+            return
+        success, msg = result
+        if msg == "已取消":
+            return
+        # 失败也记录，避免同一文件反复失败；文件被修改后会重新尝试
+        self.state.mark(path, signature, success, output)
+        self.state.save()
+        self.file_finished.emit(path, success, msg)
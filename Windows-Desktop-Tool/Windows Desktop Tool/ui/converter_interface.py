@@ -1,12 +1,41 @@
 import os
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QStackedWidget, QFileDialog
-from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QStackedWidget, QFileDialog,
+                             QTableWidgetItem, QHeaderView, QAbstractItemView, QLabel)
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+from PyQt5.QtGui import QColor, QPixmap
 from qfluentwidgets import (SubtitleLabel, BodyLabel, CaptionLabel, PrimaryPushButton, 
                             PushButton, FluentIcon as FIF, InfoBar, ComboBox, 
-                            StrongBodyLabel, SearchLineEdit)
+                            StrongBodyLabel, SearchLineEdit, TableWidget, LineEdit, ProgressBar)
+
+# 图片输出尺寸选项（传给 image_convert 的缩小参数，只缩小不放大）
+_IMAGE_SIZE_OPTIONS = [
+    ("原始尺寸", {}),
+    ("最长边 3840 px", {"max_size": 3840}),
+    ("最长边 1920 px", {"max_size": 1920}),
+    ("最长边 1280 px", {"max_size": 1280}),
+    ("最长边 640 px", {"max_size": 640}),
+    ("缩略图 256 px", {"max_size": 256}),
+    ("缩放 50%", {"scale": 0.5}),
+    ("缩放 25%", {"scale": 0.25}),
+]
+
+SVG_PREVIEW_SIZE = 96
+# SVG 导出位图的默认尺寸（最长边）
+SVG_EXPORT_SIZE = 1024
+
+# 任务状态对应的文字颜色
+_JOB_STATUS_COLORS = {
+    "已完成": QColor("#27ae60"),
+    "失败": QColor("#ff4d4f"),
+    "已取消": QColor("#faad14"),
+    "正在取消": QColor("#faad14"),
+}
 
 class ConverterInterface(QWidget):
     """ 综合格式转换界面 """
+    # 监视文件夹配置变化，由主窗口保存到设置
+    watch_folders_changed = pyqtSignal(list)
+
     def __init__(self, parent=None):
         super().__init__(parent=parent)
         self.setObjectName("ConverterInterface")
@@ -30,7 +59,7 @@ class ConverterInterface(QWidget):
         type_layout = QHBoxLayout()
         type_layout.addWidget(StrongBodyLabel("转换类型", self))
         self.type_box = ComboBox(self)
-        self.type_box.addItems(["图片转换", "文档转换", "视频转换"])
+        self.type_box.addItems(["图片转换", "文档转换", "视频转换", "监视文件夹"])
         self.type_box.setFixedWidth(200)
         type_layout.addWidget(self.type_box)
         type_layout.addStretch(1)
@@ -62,6 +91,13 @@ class ConverterInterface(QWidget):
         row.addWidget(self.btn_img_browse)
         img_card_layout.addLayout(row)
 
+        # SVG 预览（使用栅格化缓存，导出相同尺寸时无需重新渲染）
+        self.svg_preview = QLabel()
+        self.svg_preview.setFixedSize(SVG_PREVIEW_SIZE, SVG_PREVIEW_SIZE)
+        self.svg_preview.setAlignment(Qt.AlignCenter)
+        self.svg_preview.hide()
+        img_card_layout.addWidget(self.svg_preview)
+
         img_card_layout.addSpacing(10)
         img_card_layout.addWidget(StrongBodyLabel("2. 选择目标格式"))
         
@@ -80,10 +116,44 @@ class ConverterInterface(QWidget):
         self.img_format_group.addStretch(1)
         img_card_layout.addLayout(self.img_format_group)
 
+        size_row = QHBoxLayout()
+        size_row.addWidget(BodyLabel("输出尺寸"))
+        self.img_size_box = ComboBox(self)
+        for text, options in _IMAGE_SIZE_OPTIONS:
+            self.img_size_box.addItem(text, userData=options)
+        self.img_size_box.setFixedWidth(200)
+        size_row.addWidget(self.img_size_box)
+        size_row.addStretch(1)
+        img_card_layout.addLayout(size_row)
+
         img_card_layout.addSpacing(10)
         self.btn_img_convert = PrimaryPushButton(FIF.SYNC, "开始转换图片")
         self.btn_img_convert.setEnabled(False)
         img_card_layout.addWidget(self.btn_img_convert)
+
+        # 批量转换：选择多个文件或文件夹，按命名模板输出到目录
+        img_card_layout.addSpacing(10)
+        img_card_layout.addWidget(StrongBodyLabel("批量转换"))
+        batch_row = QHBoxLayout()
+        self.batch_template_edit = LineEdit()
+        self.batch_template_edit.setPlaceholderText("命名模板，如 {name}、{parent}_{index:04d}")
+        self.batch_template_edit.setText("{name}")
+        self.btn_batch_files = PushButton(FIF.PHOTO, "选择文件批量转换")
+        self.btn_batch_folder = PushButton(FIF.FOLDER, "选择文件夹批量转换")
+        self.btn_batch_stop = PushButton(FIF.CLOSE, "停止")
+        self.btn_batch_stop.hide()
+        batch_row.addWidget(self.batch_template_edit)
+        batch_row.addWidget(self.btn_batch_files)
+        batch_row.addWidget(self.btn_batch_folder)
+        batch_row.addWidget(self.btn_batch_stop)
+        img_card_layout.addLayout(batch_row)
+        self.batch_progress = ProgressBar()
+        self.batch_progress.hide()
+        self.batch_status = CaptionLabel("")
+        self.batch_status.hide()
+        img_card_layout.addWidget(self.batch_progress)
+        img_card_layout.addWidget(self.batch_status)
+        self.batch_worker = None
         img_layout.addWidget(self.img_card)
         img_layout.addStretch(1)
 
@@ -152,6 +222,13 @@ class ConverterInterface(QWidget):
         self.video_format_box.addItems(["MP4", "MKV", "MOV", "AVI"])
         self.video_format_box.setFixedWidth(200)
         video_card_layout.addWidget(self.video_format_box)
+        # 根据源视频各路流的编码显示转换方案与预计耗时
+        self.video_plan_label = CaptionLabel("")
+        self.video_plan_label.setWordWrap(True)
+        self.video_plan_label.hide()
+        video_card_layout.addWidget(self.video_plan_label)
+        self.video_info = None
+        self._probe_workers = set()
 
         video_card_layout.addSpacing(10)
         self.btn_video_convert = PrimaryPushButton(FIF.SYNC, "开始转换视频")
@@ -160,9 +237,89 @@ class ConverterInterface(QWidget):
         video_layout.addWidget(self.video_card)
         video_layout.addStretch(1)
 
+        # --- 监视文件夹面板 ---
+        self.watch_panel = QWidget()
+        watch_layout = QVBoxLayout(self.watch_panel)
+        watch_layout.setContentsMargins(0, 10, 0, 0)
+        watch_layout.setSpacing(15)
+
+        self.watch_card = QWidget()
+        self.watch_card.setStyleSheet("background-color: rgba(255, 255, 255, 0.05); border-radius: 10px;")
+        watch_card_layout = QVBoxLayout(self.watch_card)
+        watch_card_layout.addWidget(StrongBodyLabel("放入文件夹的文件按规则自动转换（程序在托盘中运行时同样有效）"))
+        self.watch_rules_edit = LineEdit()
+        self.watch_rules_edit.setPlaceholderText("转换规则，例如 png>jpg, docx>pdf, mkv>mp4")
+        self.btn_watch_add = PushButton(FIF.ADD, "选择文件夹并添加")
+        self.btn_watch_remove = PushButton(FIF.DELETE, "移除选中")
+        row_watch = QHBoxLayout()
+        row_watch.addWidget(self.watch_rules_edit)
+        row_watch.addWidget(self.btn_watch_add)
+        row_watch.addWidget(self.btn_watch_remove)
+        watch_card_layout.addLayout(row_watch)
+
+        self.watch_table = TableWidget(self)
+        self.watch_table.setColumnCount(3)
+        self.watch_table.setHorizontalHeaderLabels(["文件夹", "规则", "输出到"])
+        self.watch_table.verticalHeader().hide()
+        self.watch_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.watch_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.watch_table.setMinimumHeight(120)
+        watch_header = self.watch_table.horizontalHeader()
+        watch_header.setSectionResizeMode(0, QHeaderView.Stretch)
+        watch_header.setSectionResizeMode(1, QHeaderView.ResizeToContents)
+        watch_header.setSectionResizeMode(2, QHeaderView.Stretch)
+        watch_card_layout.addWidget(self.watch_table)
+        self.watch_status = CaptionLabel("未监视任何文件夹")
+        watch_card_layout.addWidget(self.watch_status)
+        watch_layout.addWidget(self.watch_card)
+        watch_layout.addStretch(1)
+        self.watch_folders = []
+        self.watch_service = None
+
+        # --- 转换任务队列 ---
+        self.queue_card = QWidget()
+        self.queue_card.setStyleSheet("background-color: rgba(255, 255, 255, 0.05); border-radius: 10px;")
+        queue_layout = QVBoxLayout(self.queue_card)
+        queue_header = QHBoxLayout()
+        queue_header.addWidget(StrongBodyLabel("转换任务"))
+        queue_header.addStretch(1)
+        self.btn_job_cancel = PushButton(FIF.CLOSE, "取消选中任务")
+        self.btn_job_clear = PushButton(FIF.DELETE, "清除已结束")
+        queue_header.addWidget(self.btn_job_cancel)
+        queue_header.addWidget(self.btn_job_clear)
+        self.btn_cache_clear = PushButton(FIF.BROOM, "清空转换缓存")
+        queue_header.addWidget(self.btn_cache_clear)
+        queue_layout.addLayout(queue_header)
+
+        self.job_table = TableWidget(self)
+        self.job_table.setColumnCount(4)
+        self.job_table.setHorizontalHeaderLabels(["任务", "状态", "进度", "信息"])
+        self.job_table.verticalHeader().hide()
+        self.job_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.job_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.job_table.setWordWrap(False)
+        self.job_table.setMinimumHeight(160)
+        header = self.job_table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.Stretch)
+        header.setSectionResizeMode(1, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(2, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(3, QHeaderView.Stretch)
+        queue_layout.addWidget(self.job_table)
+        layout.addWidget(self.queue_card)
+
+        # 任务运行期间定时刷新队列视图
+        self._job_timer = QTimer(self)
+        self._job_timer.setInterval(300)
+        self._job_timer.timeout.connect(self.refresh_jobs)
+        self._notified_jobs = set()
+        self.btn_job_cancel.clicked.connect(self.cancel_selected_jobs)
+        self.btn_job_clear.clicked.connect(self.clear_finished_jobs)
+        self.btn_cache_clear.clicked.connect(self.clear_conversion_cache)
+
         self.stack.addWidget(self.img_panel)
         self.stack.addWidget(self.doc_panel)
         self.stack.addWidget(self.video_panel)
+        self.stack.addWidget(self.watch_panel)
 
         self.type_box.currentIndexChanged.connect(self.stack.setCurrentIndex)
 
@@ -173,6 +330,12 @@ class ConverterInterface(QWidget):
         self.btn_img_convert.clicked.connect(self.do_img_convert)
         self.btn_doc_convert.clicked.connect(self.do_doc_convert)
         self.btn_video_convert.clicked.connect(self.do_video_convert)
+        self.video_format_box.currentIndexChanged.connect(self.update_video_plan)
+        self.btn_batch_files.clicked.connect(self.select_batch_files)
+        self.btn_batch_folder.clicked.connect(self.select_batch_folder)
+        self.btn_batch_stop.clicked.connect(self.stop_batch)
+        self.btn_watch_add.clicked.connect(self.add_watch_folder)
+        self.btn_watch_remove.clicked.connect(self.remove_watch_folders)
 
     def on_img_format_clicked(self):
         btn = self.sender()
@@ -201,6 +364,18 @@ class ConverterInterface(QWidget):
         if path:
             self.img_path_edit.setText(path)
             self.update_img_convert_btn()
+            self.update_svg_preview(path)
+
+    def update_svg_preview(self, path):
+        if not path.lower().endswith(".svg"):
+            self.svg_preview.hide()
+            return
+        try:
+            from modules.svg_raster import render_svg
+            self.svg_preview.setPixmap(QPixmap.fromImage(render_svg(path, SVG_PREVIEW_SIZE)))
+            self.svg_preview.show()
+        except Exception:
+            self.svg_preview.hide()
 
     def select_doc_file(self):
         # 允许选择所有支持的文档格式
@@ -216,54 +391,67 @@ class ConverterInterface(QWidget):
         if path:
             self.video_path_edit.setText(path)
             self.update_video_convert_btn()
+            self.probe_video(path)
+
+    def probe_video(self, path):
+        """ 在后台线程中读取流信息，完成后显示转换方案 """
+        from modules.video_workers import VideoProbeWorker
+        self.video_info = None
+        self.update_video_plan()
+        worker = VideoProbeWorker(path)
+        worker.probed.connect(self.on_video_probed)
+        worker.finished.connect(lambda w=worker: self._probe_workers.discard(w))
+        self._probe_workers.add(worker)
+        worker.start()
+
+    def on_video_probed(self, path, info):
+        # 读取期间已选择了其他文件时丢弃结果
+        if path != self.video_path_edit.text():
+            return
+        self.video_info = info
+        self.update_video_plan()
+
+    def update_video_plan(self):
+        if not self.video_info:
+            self.video_plan_label.hide()
+            return
+        from modules.video_plan import plan_conversion, describe_plan
+        from modules.video_segments import can_split, segment_count
+        try:
+            plan = plan_conversion(self.video_info, self.video_format_box.currentText())
+            text = describe_plan(plan)
+            duration, workers = self.video_info["duration"], os.cpu_count() or 1
+            if can_split(plan, duration, workers):
+                text += f"\n视频将分为 {segment_count(duration, workers)} 段，由 {workers} 个进程并行转码"
+        except ValueError as e:
+            text = str(e)
+        self.video_plan_label.setText(text)
+        self.video_plan_label.show()
 
     def do_img_convert(self):
         input_path = self.img_path_edit.text()
-        target_fmt = ""
-        for b in self.img_format_btns:
-            if b.isChecked():
-                target_fmt = b.text()
-                break
-        
+        target_fmt = self.selected_img_format()
         if not target_fmt: return
 
         # 延迟导入文件转换模块
-        from modules.file_converter import svg_to_ico, image_convert
-        from PyQt5.QtSvg import QSvgRenderer
-        from PyQt5.QtGui import QImage, QPainter
+        from modules.file_converter import svg_to_ico, svg_to_image, image_convert
         
         is_svg = input_path.lower().endswith(".svg")
-        success, msg = False, "转换失败"
-        save_path = None
-
-        if is_svg:
-            if target_fmt == "ICO":
-                default_name = os.path.splitext(os.path.basename(input_path))[0] + ".ico"
-                save_path, _ = QFileDialog.getSaveFileName(self, "保存 ICO", default_name, "ICO 图标 (*.ico)")
-                if save_path:
-                    success, msg = svg_to_ico(input_path, save_path)
-            else:
-                save_path, _ = QFileDialog.getSaveFileName(self, f"保存 {target_fmt}", f"output.{target_fmt.lower()}", f"{target_fmt} 图片 (*.{target_fmt.lower()})")
-                if save_path:
-                    try:
-                        renderer = QSvgRenderer(input_path)
-                        image = QImage(1024, 1024, QImage.Format_ARGB32)
-                        image.fill(Qt.transparent)
-                        painter = QPainter(image)
-                        renderer.render(painter)
-                        painter.end()
-                        success = image.save(save_path, target_fmt)
-                        msg = "成功" if success else "保存失败"
-                    except Exception as e:
-                        msg = str(e)
+
+        if is_svg and target_fmt == "ICO":
+            default_name = os.path.splitext(os.path.basename(input_path))[0] + ".ico"
+            save_path, _ = QFileDialog.getSaveFileName(self, "保存 ICO", default_name, "ICO 图标 (*.ico)")
+            if save_path:
+                self.submit_job(svg_to_ico, input_path, save_path)
         else:
             save_path, _ = QFileDialog.getSaveFileName(self, f"保存 {target_fmt}", f"output.{target_fmt.lower()}", f"{target_fmt} 图片 (*.{target_fmt.lower()})")
             if save_path:
-                success, msg = image_convert(input_path, save_path, target_fmt)
-
-        if save_path:
-            if success: InfoBar.success("转换成功", "文件已保存", duration=3000, parent=self.window())
-            else: InfoBar.error("转换失败", msg, duration=5000, parent=self.window())
+                if is_svg:
+                    options = self.selected_img_options()
+                    size = options.get("max_size") or round(SVG_EXPORT_SIZE * options.get("scale", 1))
+                    self.submit_job(svg_to_image, input_path, save_path, target_fmt, size)
+                else:
+                    self.submit_job(image_convert, input_path, save_path, target_fmt, **self.selected_img_options())
 
     def do_doc_convert(self):
         input_path = self.doc_path_edit.text()
@@ -274,28 +462,23 @@ class ConverterInterface(QWidget):
         
         target = self.doc_target_box.currentData()
         ext = os.path.splitext(input_path)[1].lower()
-        success, msg = False, "未执行"
-        save_path = None
         if ext == ".pdf" and target == "docx":
             save_path, _ = QFileDialog.getSaveFileName(self, "保存 Word", "output.docx", "Word 文档 (*.docx)")
-            if save_path:
-                success, msg = pdf_to_word(input_path, save_path)
+            func = pdf_to_word
         elif ext == ".docx" and target == "pdf":
             save_path, _ = QFileDialog.getSaveFileName(self, "保存 PDF", "output.pdf", "PDF 文档 (*.pdf)")
-            if save_path:
-                success, msg = word_to_pdf(input_path, save_path)
+            func = word_to_pdf
         elif ext == ".docx" and target == "xlsx":
             save_path, _ = QFileDialog.getSaveFileName(self, "保存 Excel", "output.xlsx", "Excel 表格 (*.xlsx)")
-            if save_path:
-                success, msg = word_to_excel(input_path, save_path)
+            func = word_to_excel
         elif ext == ".xlsx" and target == "docx":
             save_path, _ = QFileDialog.getSaveFileName(self, "保存 Word", "output.docx", "Word 文档 (*.docx)")
-            if save_path:
-                success, msg = excel_to_word(input_path, save_path)
+            func = excel_to_word
+        else:
+            return
 
         if save_path:
-            if success: InfoBar.success("转换成功", "文件已保存", duration=3000, parent=self.window())
-            else: InfoBar.error("转换失败", msg, duration=5000, parent=self.window())
+            self.submit_job(func, input_path, save_path)
 
     def do_video_convert(self):
         input_path = self.video_path_edit.text()
@@ -311,11 +494,208 @@ class ConverterInterface(QWidget):
         save_path, _ = QFileDialog.getSaveFileName(self, "保存视频", default_name, filter_str)
         if not save_path:
             return
-        success, msg = video_convert(input_path, save_path, target_fmt)
-        if success:
-            InfoBar.success("转换成功", "视频已保存", duration=3000, parent=self.window())
+        self.submit_job(video_convert, input_path, save_path, target_fmt)
+
+    def selected_img_format(self):
+        for b in self.img_format_btns:
+            if b.isChecked():
+                return b.text()
+        return ""
+
+    def selected_img_options(self):
+        return dict(self.img_size_box.currentData() or {})
+
+    def select_batch_files(self):
+        filter_str = "图片文件 (*.png *.jpg *.jpeg *.webp *.bmp *.gif *.tif *.tiff)"
+        paths, _ = QFileDialog.getOpenFileNames(self, "选择图片", "", filter_str)
+        if paths:
+            self.start_batch(paths)
+
+    def select_batch_folder(self):
+        folder = QFileDialog.getExistingDirectory(self, "选择图片文件夹")
+        if folder:
+            self.start_batch([folder])
+
+    def start_batch(self, sources):
+        target_fmt = self.selected_img_format()
+        if not target_fmt:
+            InfoBar.warning("提示", "请先选择目标格式", duration=2000, parent=self.window())
+            return
+        output_dir = QFileDialog.getExistingDirectory(self, "选择输出文件夹")
+        if not output_dir:
+            return
+        from modules.image_batch import ImageBatchWorker
+        template = self.batch_template_edit.text().strip() or "{name}"
+        self.batch_worker = ImageBatchWorker(sources, output_dir, target_fmt, template, self.selected_img_options())
+        self.batch_worker.progress.connect(self.on_batch_progress)
+        self.batch_worker.finished.connect(self.on_batch_finished)
+        self.batch_progress.setValue(0)
+        self.batch_progress.show()
+        self.batch_status.setText("正在准备...")
+        self.batch_status.show()
+        self.btn_batch_files.setEnabled(False)
+        self.btn_batch_folder.setEnabled(False)
+        self.btn_batch_stop.show()
+        self.batch_worker.start()
+
+    def stop_batch(self):
+        if self.batch_worker and self.batch_worker.isRunning():
+            self.batch_worker.requestInterruption()
+            self.batch_status.setText("正在停止，等待进行中的文件完成...")
+
+    def on_batch_progress(self, percent, text):
+        self.batch_progress.setValue(percent)
+        self.batch_status.setText(text)
+
+    def on_batch_finished(self, summary):
+        self.btn_batch_files.setEnabled(True)
+        self.btn_batch_folder.setEnabled(True)
+        self.btn_batch_stop.hide()
+        self.batch_progress.hide()
+        failed = summary["failed"]
+        text = (f"完成 {summary['done']} 个，跳过 {summary['skipped']} 个（已是最新），失败 {len(failed)} 个，"
+                f"{summary['rate']:.1f} 张/秒")
+        self.batch_status.setText(text)
+        if failed:
+            detail = "\n".join(f"{os.path.basename(src)}: {msg}".lstrip(": ") for src, msg in failed[:3])
+            InfoBar.error("批量转换结束", f"{text}\n{detail}", duration=6000, parent=self.window())
+        elif summary["total"] == 0:
+            InfoBar.warning("批量转换", "未找到可转换的图片", duration=3000, parent=self.window())
+        elif summary["cancelled"]:
+            InfoBar.warning("批量转换已停止", text, duration=4000, parent=self.window())
         else:
-            InfoBar.error("转换失败", msg, duration=5000, parent=self.window())
+            InfoBar.success("批量转换完成", text, duration=4000, parent=self.window())
+
+    def submit_job(self, func, input_path, save_path, *args, **kwargs):
+        """ 提交转换任务到后台队列，界面立即返回 """
+        from modules.file_converter import submit_conversion
+        name = f"{os.path.basename(input_path)} → {os.path.basename(save_path)}"
+        submit_conversion(func, input_path, save_path, *args, name=name, **kwargs)
+        InfoBar.info("已加入队列", name, duration=2000, parent=self.window())
+        self.refresh_jobs()
+        self._job_timer.start()
+
+    def refresh_jobs(self):
+        """ 同步任务队列视图，并提示新结束的任务 """
+        from modules.conversion_jobs import get_job_manager
+        jobs = get_job_manager().jobs
+        self.job_table.setRowCount(len(jobs))
+        for row, job in enumerate(jobs):
+            values = [job.name, job.status, f"{job.progress}%", job.message]
+            for col, value in enumerate(values):
+                item = self.job_table.item(row, col)
+                if item is None:
+                    item = QTableWidgetItem()
+                    self.job_table.setItem(row, col, item)
+                if item.text() != value:
+                    item.setText(value)
+                    item.setToolTip(value)
+                if col == 0:
+                    item.setData(Qt.UserRole, job.id)
+                elif col == 1:
+                    color = _JOB_STATUS_COLORS.get(job.status)
+                    item.setForeground(color if color else self.job_table.palette().text())
+
+            if job.finished and job.id not in self._notified_jobs:
+                self._notified_jobs.add(job.id)
+                if job.status == "已完成":
+                    InfoBar.success("转换成功", f"{job.name} 已保存", duration=3000, parent=self.window())
+                elif job.status == "失败":
+                    InfoBar.error("转换失败", job.message, duration=5000, parent=self.window())
+
+        if not get_job_manager().active_jobs():
+            self._job_timer.stop()
+
+    def cancel_selected_jobs(self):
+        from modules.conversion_jobs import get_job_manager
+        manager = get_job_manager()
+        rows = {index.row() for index in self.job_table.selectionModel().selectedRows()}
+        for row in rows:
+            item = self.job_table.item(row, 0)
+            job = manager.get(item.data(Qt.UserRole)) if item else None
+            if job is not None:
+                job.cancel()
+        self.refresh_jobs()
+
+    def clear_finished_jobs(self):
+        from modules.conversion_jobs import get_job_manager
+        get_job_manager().clear_finished()
+        self.refresh_jobs()
+
+    def clear_conversion_cache(self):
+        from modules import conversion_cache
+        count, size = conversion_cache.cache_size()
+        conversion_cache.clear()
+        InfoBar.success("已清空转换缓存", f"共 {count} 个结果，{size / 1024 / 1024:.1f} MB",
+                        duration=3000, parent=self.window())
+
+    def set_watch_folders(self, folders):
+        """ 应用监视文件夹配置（启动时由主窗口从设置中传入） """
+        from modules.watch_folder import WatchFolderService
+        self.watch_folders = [dict(f) for f in folders if f.get("path")]
+        if self.watch_service is None:
+            self.watch_service = WatchFolderService(parent=self)
+            self.watch_service.file_queued.connect(self.on_watch_file_queued)
+            self.watch_service.file_finished.connect(self.on_watch_file_finished)
+        self.watch_service.set_folders(self.watch_folders)
+        self.refresh_watch_table()
+
+    def refresh_watch_table(self):
+        from modules.watch_folder import format_rules, DEFAULT_OUTPUT_SUBDIR
+        self.watch_table.setRowCount(len(self.watch_folders))
+        for row, folder in enumerate(self.watch_folders):
+            output = folder.get("output") or os.path.join(folder["path"], DEFAULT_OUTPUT_SUBDIR)
+            for col, text in enumerate((folder["path"], format_rules(folder["rules"]), output)):
+                self.watch_table.setItem(row, col, QTableWidgetItem(text))
+        if not self.watch_folders:
+            self.watch_status.setText("未监视任何文件夹")
+        elif self.watch_service and self.watch_service.backend:
+            self.watch_status.setText(f"正在监视 {len(self.watch_folders)} 个文件夹（{self.watch_service.backend}）")
+        else:
+            self.watch_status.setText("监视的文件夹不存在")
+
+    def add_watch_folder(self):
+        from modules.watch_folder import parse_rules
+        try:
+            rules = parse_rules(self.watch_rules_edit.text())
+        except ValueError as e:
+            InfoBar.warning("规则无效", str(e), duration=3000, parent=self.window())
+            return
+        folder = QFileDialog.getExistingDirectory(self, "选择要监视的文件夹")
+        if not folder:
+            return
+        folders = [f for f in self.watch_folders if os.path.normcase(f["path"]) != os.path.normcase(folder)]
+        folders.append({"path": folder, "rules": rules, "output": ""})
+        self.set_watch_folders(folders)
+        self.watch_folders_changed.emit(self.watch_folders)
+
+    def remove_watch_folders(self):
+        rows = {index.row() for index in self.watch_table.selectedIndexes()}
+        if not rows:
+            return
+        self.set_watch_folders([f for i, f in enumerate(self.watch_folders) if i not in rows])
+        self.watch_folders_changed.emit(self.watch_folders)
+
+    def on_watch_file_queued(self, path, output):
+        self.refresh_jobs()
+        self._job_timer.start()
+
+    def on_watch_file_finished(self, path, success, msg):
+        if not success:
+            InfoBar.error("自动转换失败", f"{os.path.basename(path)}: {msg}", duration=5000, parent=self.window())
+
+    def stop_jobs(self):
+        """ 退出程序时取消所有转换任务并关闭进程池 """
+        from modules.conversion_jobs import get_job_manager
+        self._job_timer.stop()
+        if self.watch_service:
+            self.watch_service.stop()
+        get_job_manager().shutdown()
+        if self.batch_worker and self.batch_worker.isRunning():
+            self.batch_worker.requestInterruption()
+            self.batch_worker.wait(1500)
+        for worker in list(self._probe_workers):
+            worker.wait(1000)
 
     def update_network_status(self, is_online):
         """ 更新网络状态 """
@@ -333,3 +713,5 @@ class ConverterInterface(QWidget):
         self.doc_card.setStyleSheet(f"background-color: {card_bg}; border-radius: 10px;")
         if hasattr(self, "video_card"):
             self.video_card.setStyleSheet(f"background-color: {card_bg}; border-radius: 10px;")
+        self.queue_card.setStyleSheet(f"background-color: {card_bg}; border-radius: 10px;")
+        self.watch_card.setStyleSheet(f"background-color: {card_bg}; border-radius: 10px;")
@@ -32,6 +32,7 @@ from modules.network_monitor import NetworkMonitor
 from modules.system_functions import open_group_policy
 from modules.settings import load_settings, save_settings, set_auto_start
 from modules.window_tool import open_file_location
+from modules.file_shredder import set_user_protected_paths
 
 class MainWindow(FluentWindow):
     def __init__(self):
@@ -75,6 +76,12 @@ class MainWindow(FluentWindow):
         QTimer.singleShot(500, self.check_disclaimer)
 
         QTimer.singleShot(2500, self._auto_check_updates_on_startup)
+
+        # 检查上次被中断的粉碎任务
+        QTimer.singleShot(1500, self.shredder_interface.check_pending_job)
+
+        # 启动完成后在后台预先导入格式转换依赖并启动转换进程池
+        QTimer.singleShot(4000, self._warm_up_converters)
     
     def _init_network_monitor(self):
         """延迟初始化网络监控"""
@@ -277,6 +284,7 @@ class MainWindow(FluentWindow):
         self.settings_interface.btn_check_updates.clicked.connect(lambda: self.check_updates(interactive=True))
         self.settings_interface.btn_open_releases.clicked.connect(self.open_releases_page)
         self.settings_interface.btn_disclaimer.clicked.connect(lambda: self.show_disclaimer(is_first_time=False))
+        self.converter_interface.watch_folders_changed.connect(self.save_watch_folders)
 
     def _sync_theme_styles(self):
         theme_setting = self.settings.get("theme", "深色")
@@ -347,6 +355,10 @@ class MainWindow(FluentWindow):
         self.settings_interface.cb_auto_start.blockSignals(False)
         accent_color = self.settings.get("accent_color", "#1677ff")
         self.apply_accent_color(accent_color)
+        # 用户自定义的受保护路径（文件粉碎时禁止操作）
+        set_user_protected_paths(self.settings.get("protected_paths", []))
+        self.shredder_interface.passes = max(1, int(self.settings.get("shred_passes", 1)))
+        self.converter_interface.set_watch_folders(self.settings.get("watch_folders", []))
         if hasattr(self.settings_interface, "update_status"):
             self.settings_interface.update_status.setText("")
 
@@ -551,10 +563,20 @@ class MainWindow(FluentWindow):
         set_auto_start(self.settings["auto_start"])
         self._sync_theme_styles()
 
+    def save_watch_folders(self, folders):
+        self.settings["watch_folders"] = folders
+        save_settings(self.settings)
+
     def open_releases_page(self):
         import webbrowser
         webbrowser.open("https://github.com/liaozixing/Windows-Desktop-Tool/releases")
 
+    def _warm_up_converters(self):
+        if not self.settings.get("converter_warm_up", True):
+            return
+        from modules.converter_registry import warm_up
+        warm_up()
+
     def _auto_check_updates_on_startup(self):
         if not self.settings.get("auto_check_updates", True):
             return
@@ -656,6 +678,20 @@ class MainWindow(FluentWindow):
                     self.network_monitor.terminate()
             except: pass
         
+        # 粉碎任务需要在覆写检查点安全退出，不能直接 terminate
+        if hasattr(self, 'shredder_interface'):
+            try: self.shredder_interface.stop_worker()
+            except: pass
+
+        # 取消格式转换任务并关闭转换进程池
+        if hasattr(self, 'converter_interface'):
+            try: self.converter_interface.stop_jobs()
+            except: pass
+
+        if hasattr(self, 'qrcode_interface'):
+            try: self.qrcode_interface.stop_batch_worker()
+            except: pass
+
         # 优化：并行停止所有工作线程，减少等待时间
         workers = ['speed_worker', 'ip_worker', 'speed_ip_worker', 'gp_worker', 'update_worker']
         for worker_name in workers:
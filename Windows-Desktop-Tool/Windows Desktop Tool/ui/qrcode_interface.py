@@ -1,14 +1,23 @@
 import os
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, 
                              QFileDialog, QApplication)
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QPixmap
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QImage
 from qfluentwidgets import (SubtitleLabel, BodyLabel, CaptionLabel, PrimaryPushButton, 
                             PushButton, FluentIcon as FIF, InfoBar, 
                             StrongBodyLabel, TextEdit, ImageLabel,
-                            CardWidget)
+                            CardWidget, ComboBox, LineEdit, ProgressBar)
 
-from modules.qrcode_tool import generate_qr_image
+from modules.qrcode_tool import QRRenderWorker, cached_qr, render_qr_svg, DEFAULT_ECC
+from modules.qr_plan import MAX_AUTO_VERSION
+
+# 停止输入多久（毫秒）后刷新预览
+PREVIEW_DELAY_MS = 250
+QR_BOX_SIZE = 10
+QR_BORDER = 4
+ECC_OPTIONS = [("auto", "自动"), ("L", "低 (7%)"), ("M", "中 (15%)"), ("Q", "较高 (25%)"), ("H", "高 (30%)")]
+BATCH_OUTPUTS = [("png", "PNG 图片（文件夹）"), ("svg", "SVG 矢量图（文件夹）"),
+                 ("zip", "ZIP 压缩包（PNG）"), ("pdf", "PDF 打印页（A4 平铺）")]
 
 class QRCodeInterface(QWidget):
     """ 二维码工具界面 """
@@ -34,6 +43,7 @@ class QRCodeInterface(QWidget):
 
         # 生成页面布局 (直接显示)
         self.init_gen_page(layout)
+        self.init_batch_card(layout)
 
     def init_gen_page(self, parent_layout):
         layout = QHBoxLayout()
@@ -50,10 +60,26 @@ class QRCodeInterface(QWidget):
         self.input_text.setPlaceholderText("在此输入想要生成二维码的文本或链接...")
         left_layout.addWidget(self.input_text)
         
+        # 输入停止一段时间后自动刷新预览
+        self._preview_timer = QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(PREVIEW_DELAY_MS)
+        self._preview_timer.timeout.connect(self.refresh_preview)
+        self.input_text.textChanged.connect(self._preview_timer.start)
+
         btn_layout = QHBoxLayout()
         self.btn_gen = PrimaryPushButton(FIF.SYNC, "生成二维码", self)
         self.btn_gen.clicked.connect(self.do_generate)
         btn_layout.addWidget(self.btn_gen)
+        btn_layout.addWidget(BodyLabel("纠错等级"))
+        self.ecc_combo = ComboBox(self)
+        for ecc, label in ECC_OPTIONS:
+            self.ecc_combo.addItem(label, userData=ecc)
+        self.ecc_combo.setCurrentIndex([ecc for ecc, _ in ECC_OPTIONS].index(DEFAULT_ECC))
+        self.ecc_combo.setToolTip(f"自动：在版本 {MAX_AUTO_VERSION}（{MAX_AUTO_VERSION * 4 + 17}×{MAX_AUTO_VERSION * 4 + 17} 模块）"
+                                  f"以内选择能容纳内容的最高纠错等级")
+        self.ecc_combo.currentIndexChanged.connect(lambda _: self.refresh_preview())
+        btn_layout.addWidget(self.ecc_combo)
         btn_layout.addStretch(1)
         left_layout.addLayout(btn_layout)
         
@@ -71,6 +97,10 @@ class QRCodeInterface(QWidget):
         self.qr_display.setText("预览区域")
         
         right_layout.addWidget(self.qr_display)
+        self.qr_status = CaptionLabel("", self)
+        self.qr_status.setAlignment(Qt.AlignCenter)
+        self.qr_status.setWordWrap(True)
+        right_layout.addWidget(self.qr_status)
         
         action_layout = QHBoxLayout()
         self.btn_save = PushButton(FIF.SAVE, "保存图片", self)
@@ -86,38 +116,211 @@ class QRCodeInterface(QWidget):
         right_layout.addLayout(action_layout)
         
         layout.addWidget(right_panel, 1)
-        self.current_qr_pixmap = None
+        self.current_qr_image = None
+        self.current_qr_args = None
+        self._request_args = None
+        # 最新一次请求的序号；后台线程同一时间只运行一个，期间的新请求只保留最后一个
+        self._request_id = 0
+        self._qr_worker = None
+        self._pending_request = None
+        self._notify_request = None
         
         parent_layout.addLayout(layout)
 
+    def init_batch_card(self, parent_layout):
+        """ 批量生成：从 CSV / 文本文件读取内容，后台多进程生成 """
+        self.batch_card = CardWidget(self)
+        card_layout = QVBoxLayout(self.batch_card)
+        card_layout.setContentsMargins(16, 12, 16, 12)
+        card_layout.addWidget(StrongBodyLabel("批量生成"))
+
+        row = QHBoxLayout()
+        self.batch_column_edit = LineEdit()
+        self.batch_column_edit.setPlaceholderText("内容列（CSV 列名或序号，默认第 1 列）")
+        self.batch_name_edit = LineEdit()
+        self.batch_name_edit.setPlaceholderText("文件名/标签列（可选）")
+        self.batch_output_combo = ComboBox()
+        for mode, label in BATCH_OUTPUTS:
+            self.batch_output_combo.addItem(label, userData=mode)
+        self.btn_batch = PrimaryPushButton(FIF.DOCUMENT, "选择 CSV/文本文件并生成")
+        self.btn_batch.clicked.connect(self.start_batch)
+        self.btn_batch_stop = PushButton(FIF.CLOSE, "停止")
+        self.btn_batch_stop.clicked.connect(self.stop_batch)
+        self.btn_batch_stop.hide()
+        row.addWidget(self.batch_column_edit)
+        row.addWidget(self.batch_name_edit)
+        row.addWidget(self.batch_output_combo)
+        row.addWidget(self.btn_batch)
+        row.addWidget(self.btn_batch_stop)
+        card_layout.addLayout(row)
+
+        self.batch_progress = ProgressBar()
+        self.batch_progress.hide()
+        self.batch_status = CaptionLabel("CSV 每行一个二维码（首行为表头时可按列名选择）；文本文件每个非空行一个二维码")
+        card_layout.addWidget(self.batch_progress)
+        card_layout.addWidget(self.batch_status)
+        self.batch_worker = None
+        parent_layout.addWidget(self.batch_card)
+
+    def start_batch(self):
+        from modules.qr_batch import QRBatchWorker, read_items
+        path, _ = QFileDialog.getOpenFileName(self, "选择内容列表", "", "CSV / 文本文件 (*.csv *.txt);;所有文件 (*)")
+        if not path:
+            return
+        try:
+            items = read_items(path, self.batch_column_edit.text().strip() or 0,
+                               self.batch_name_edit.text().strip() or None)
+        except (OSError, ValueError) as e:
+            InfoBar.error("错误", f"读取失败: {e}", duration=3000, parent=self.window())
+            return
+        if not items:
+            InfoBar.warning("提示", "文件中没有可生成的内容", duration=2000, parent=self.window())
+            return
+
+        mode = self.batch_output_combo.currentData()
+        stem = os.path.splitext(path)[0]
+        if mode in ("png", "svg"):
+            output = QFileDialog.getExistingDirectory(self, "选择输出文件夹")
+        elif mode == "zip":
+            output, _ = QFileDialog.getSaveFileName(self, "保存 ZIP", f"{stem}_qrcode.zip", "ZIP 压缩包 (*.zip)")
+        else:
+            output, _ = QFileDialog.getSaveFileName(self, "保存 PDF", f"{stem}_qrcode.pdf", "PDF 文件 (*.pdf)")
+        if not output:
+            return
+
+        self.batch_worker = QRBatchWorker(items, mode, output, QR_BOX_SIZE, QR_BORDER,
+                                          self.ecc_combo.currentData() or DEFAULT_ECC)
+        self.batch_worker.progress.connect(self.on_batch_progress)
+        self.batch_worker.finished.connect(self.on_batch_finished)
+        self.batch_progress.setValue(0)
+        self.batch_progress.show()
+        self.batch_status.setText(f"共 {len(items)} 条，正在启动...")
+        self.btn_batch.setEnabled(False)
+        self.btn_batch_stop.show()
+        self.batch_worker.start()
+
+    def stop_batch(self):
+        if self.batch_worker and self.batch_worker.isRunning():
+            self.batch_worker.requestInterruption()
+            self.batch_status.setText("正在停止，等待进行中的任务完成...")
+
+    def on_batch_progress(self, percent, text):
+        self.batch_progress.setValue(percent)
+        self.batch_status.setText(text)
+
+    def on_batch_finished(self, summary):
+        self.btn_batch.setEnabled(True)
+        self.btn_batch_stop.hide()
+        self.batch_progress.hide()
+        failed = summary["failed"]
+        text = f"完成 {summary['done']} 个，失败 {len(failed)} 个，{summary['rate']:.0f} 个/秒"
+        if summary["pages"]:
+            text += f"，共 {summary['pages']} 页"
+        self.batch_status.setText(text)
+        if failed:
+            detail = "\n".join(f"{data[:30]}: {msg}".lstrip(": ") for data, msg in failed[:3])
+            InfoBar.error("批量生成结束", f"{text}\n{detail}", duration=6000, parent=self.window())
+        elif summary["cancelled"]:
+            InfoBar.warning("批量生成已停止", text, duration=4000, parent=self.window())
+        else:
+            InfoBar.success("批量生成完成", text, duration=4000, parent=self.window())
+
+    def stop_batch_worker(self):
+        """ 退出程序时停止批量生成 """
+        if self.batch_worker and self.batch_worker.isRunning():
+            self.batch_worker.requestInterruption()
+            self.batch_worker.wait(1500)
+
     def do_generate(self):
         text = self.input_text.toPlainText()
         if not text:
             InfoBar.warning("提示", "请输入内容", duration=2000, parent=self.window())
             return
-            
-        pixmap = generate_qr_image(text, size=10)
-        if pixmap:
-            self.current_qr_pixmap = pixmap
-            # 缩放显示
-            scaled = pixmap.scaled(200, 200, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            self.qr_display.setPixmap(scaled)
-            self.btn_save.setEnabled(True)
-            self.btn_copy_img.setEnabled(True)
-            InfoBar.success("成功", "二维码已生成", duration=2000, parent=self.window())
+        self.refresh_preview(notify=True)
+
+    def refresh_preview(self, notify=False):
+        """ 按当前内容生成预览：缓存命中时立即显示，否则交给后台线程 """
+        self._preview_timer.stop()
+        text = self.input_text.toPlainText()
+        self._request_id += 1
+        self._notify_request = self._request_id if notify else None
+        if not text:
+            self._pending_request = None
+            self.show_qr_result(None, None, "")
+            return
+        args = (text, QR_BOX_SIZE, QR_BORDER, self.ecc_combo.currentData() or DEFAULT_ECC)
+        self._request_args = args
+        cached = cached_qr(*args)
+        if cached is not None:
+            self._pending_request = None
+            self.on_qr_rendered(self._request_id, *cached, "")
+            return
+        self._pending_request = (self._request_id, args)
+        if self._qr_worker is None:
+            self._start_qr_worker()
+
+    def _start_qr_worker(self):
+        request_id, args = self._pending_request
+        self._pending_request = None
+        self._qr_worker = QRRenderWorker(request_id, *args)
+        self._qr_worker.rendered.connect(self.on_qr_rendered)
+        self._qr_worker.finished.connect(self._on_qr_worker_finished)
+        self._qr_worker.start()
+
+    def _on_qr_worker_finished(self):
+        self._qr_worker.deleteLater()
+        self._qr_worker = None
+        if self._pending_request is not None:
+            self._start_qr_worker()
+
+    def on_qr_rendered(self, request_id, image, plan, error):
+        # 内容已再次变化的过期结果不显示（结果已进入缓存）
+        if request_id != self._request_id:
+            return
+        self.show_qr_result(image, plan, error)
+        if self._notify_request == request_id:
+            self._notify_request = None
+            if image is not None:
+                InfoBar.success("成功", "二维码已生成", duration=2000, parent=self.window())
+            else:
+                InfoBar.error("错误", error or "生成失败", duration=2000, parent=self.window())
+
+    def show_qr_result(self, image, plan, error):
+        self.current_qr_image = image
+        self.current_qr_args = self._request_args if image is not None else None
+        # 显示实际使用的版本、纠错等级与编码分段
+        self.qr_status.setText(plan.describe() if plan is not None else error)
+        self.btn_save.setEnabled(image is not None)
+        self.btn_copy_img.setEnabled(image is not None)
+        # ImageLabel 直接绘制 QImage（传入 QPixmap 也会被转换回 QImage），且会按图片调整自身大小
+        if image is None:
+            self.qr_display.setImage(QImage())
         else:
-            InfoBar.error("错误", "生成失败", duration=2000, parent=self.window())
+            self.qr_display.setImage(image.scaled(200, 200, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+        self.qr_display.setFixedSize(200, 200)
 
     def save_qr_image(self):
-        if not self.current_qr_pixmap: return
-        path, _ = QFileDialog.getSaveFileName(self, "保存二维码", "qrcode.png", "PNG 图片 (*.png)")
-        if path:
-            self.current_qr_pixmap.save(path, "PNG")
-            InfoBar.success("成功", "图片已保存", duration=2000, parent=self.window())
+        if self.current_qr_image is None: return
+        path, selected = QFileDialog.getSaveFileName(self, "保存二维码", "qrcode.png",
+                                                     "PNG 图片 (*.png);;SVG 矢量图 (*.svg)")
+        if not path:
+            return
+        if selected.startswith("SVG") or path.lower().endswith(".svg"):
+            path = os.path.splitext(path)[0] + ".svg"
+            try:
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(render_qr_svg(*self.current_qr_args))
+            except (OSError, ValueError) as e:
+                InfoBar.error("错误", f"保存失败: {e}", duration=2000, parent=self.window())
+                return
+        elif not self.current_qr_image.save(path, "PNG"):
+            InfoBar.error("错误", "保存失败", duration=2000, parent=self.window())
+            return
+        InfoBar.success("成功", "图片已保存", duration=2000, parent=self.window())
 
     def copy_qr_image(self):
-        if not self.current_qr_pixmap: return
-        QApplication.clipboard().setPixmap(self.current_qr_pixmap)
+        if self.current_qr_image is None: return
+        QApplication.clipboard().setImage(self.current_qr_image)
         InfoBar.success("成功", "图片已复制到剪贴板", duration=2000, parent=self.window())
 
     def update_network_status(self, is_online):
@@ -1,13 +1,30 @@
 import os
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QHeaderView, QTableWidgetItem, QMenu, QAction, QApplication
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QHeaderView, QAbstractItemView, QMenu, QAction, QApplication
 from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QColor
 from qfluentwidgets import (SubtitleLabel, BodyLabel, CaptionLabel, PrimaryPushButton, 
                             PushButton, FluentIcon as FIF, InfoBar, MessageBox, 
-                            TableWidget, ProgressBar)
+                            TableView, ProgressBar)
 
-from modules.file_shredder import ShredderWorker, is_system_path, ValidationWorker
+from modules.file_shredder import DEFAULT_PASSES
+from modules.shredder_workers import ShredderWorker, ValidationWorker
 from modules.window_tool import open_file_location
+from ui.shredder_model import ShredderTableModel, LEVEL_NORMAL, LEVEL_SUCCESS, LEVEL_ERROR, LEVEL_WARNING
+
+# 扩展名 -> 类型显示
+_TYPE_MAP = {
+    '.py': 'Python 脚本',
+    '.html': 'HTML 文档',
+    '.htm': 'HTML 文档',
+    '.txt': '文本文件',
+    '.pdf': 'PDF 文档',
+    '.docx': 'Word 文档',
+    '.xlsx': 'Excel 表格',
+    '.jpg': 'JPEG 图片',
+    '.png': 'PNG 图片',
+    '.exe': '可执行程序',
+    '.zip': '压缩文件',
+    '.rar': '压缩文件'
+}
 
 class ShredderInterface(QWidget):
     """ 文件粉碎界面 """
@@ -35,10 +52,16 @@ class ShredderInterface(QWidget):
         self.desc = BodyLabel("将需要销毁的文件或文件夹拖入此处，或点击下方按钮添加。", self)
         layout.addWidget(self.desc)
 
-        # 文件列表
-        self.file_list = TableWidget(self)
-        self.file_list.setColumnCount(3)
-        self.file_list.setHorizontalHeaderLabels(["路径", "类型", "当前状态"])
+        # 文件列表（模型/视图，只绘制可见行）
+        self.file_model = ShredderTableModel(self)
+        self.file_list = TableView(self)
+        self.file_list.setModel(self.file_model)
+        self.file_list.setWordWrap(False)
+        self.file_list.setTextElideMode(Qt.ElideMiddle)
+        self.file_list.setSelectionBehavior(QAbstractItemView.SelectRows)
+        # 固定行高，避免大列表逐行计算高度
+        self.file_list.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.file_list.verticalHeader().setDefaultSectionSize(36)
         self.file_list.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
         self.file_list.horizontalHeader().setSectionResizeMode(1, QHeaderView.Fixed)
         self.file_list.horizontalHeader().setSectionResizeMode(2, QHeaderView.Fixed)
@@ -54,6 +77,7 @@ class ShredderInterface(QWidget):
         self.btn_add_folder = PushButton(FIF.FOLDER, "添加文件夹", self)
         self.btn_remove = PushButton(FIF.REMOVE, "移除选中", self)
         self.btn_clear = PushButton(FIF.DELETE, "清空列表", self)
+        self.btn_wipe = PushButton(FIF.ERASE_TOOL, "擦除空闲空间", self)
         self.btn_shred = PrimaryPushButton(FIF.BROOM, "立即粉碎", self)
         
         btn_layout.addWidget(self.btn_add_file)
@@ -61,13 +85,22 @@ class ShredderInterface(QWidget):
         btn_layout.addWidget(self.btn_remove)
         btn_layout.addWidget(self.btn_clear)
         btn_layout.addStretch(1)
+        btn_layout.addWidget(self.btn_wipe)
         btn_layout.addWidget(self.btn_shred)
         layout.addLayout(btn_layout)
 
-        # 进度条
+        # 进度条与任务控制按钮
+        run_layout = QHBoxLayout()
         self.progress_bar = ProgressBar(self)
         self.progress_bar.hide()
-        layout.addWidget(self.progress_bar)
+        self.btn_pause = PushButton(FIF.PAUSE, "暂停", self)
+        self.btn_cancel = PushButton(FIF.CLOSE, "取消", self)
+        self.btn_pause.hide()
+        self.btn_cancel.hide()
+        run_layout.addWidget(self.progress_bar, 1)
+        run_layout.addWidget(self.btn_pause)
+        run_layout.addWidget(self.btn_cancel)
+        layout.addLayout(run_layout)
 
         self.status_label = CaptionLabel("", self)
         layout.addWidget(self.status_label)
@@ -78,9 +111,14 @@ class ShredderInterface(QWidget):
         self.btn_remove.clicked.connect(self.remove_selected)
         self.btn_clear.clicked.connect(self.clear_list)
         self.btn_shred.clicked.connect(self.start_shredding)
+        self.btn_wipe.clicked.connect(self.start_free_space_wipe)
+        self.btn_pause.clicked.connect(self.toggle_pause)
+        self.btn_cancel.clicked.connect(self.cancel_running)
 
         self.paths = set()
         self.system_paths = set() # 新增：记录系统文件路径
+        self.shredded_paths = set() # 本次粉碎成功的路径
+        self.passes = DEFAULT_PASSES # 删除前的覆写遍数（由设置决定）
         self.update_desc()
 
     def dragEnterEvent(self, event):
@@ -106,87 +144,62 @@ class ShredderInterface(QWidget):
             self.add_paths([folder])
 
     def add_paths(self, paths):
-        to_validate = []
+        """
+        先以“正在检查”状态加入列表，受保护路径判断与文件/文件夹区分在后台线程中分批完成，
+        几十万个路径时界面也不会卡住（粉碎前 shred_paths 还会再次检查受保护路径）
+        """
+        rows = []
         for path in paths:
             path = os.path.normpath(path)
             if path in self.paths or path in self.system_paths:
                 continue
+            self.paths.add(path)
+            rows.append((path, "", "正在检查...", LEVEL_NORMAL))
+        if not rows:
+            return
+        self.file_model.append_rows(rows)
 
-            # 快速路径校验（不检查进程占用，防止 UI 卡死）
-            is_sys, reason = is_system_path(path, check_processes=False)
-            
-            row = self.file_list.rowCount()
-            self.file_list.insertRow(row)
-            
-            # 路径列：使用中间省略
-            fm = self.file_list.fontMetrics()
-            elided_path = fm.elidedText(path, Qt.ElideMiddle, 400) # 初始宽度
-            path_item = QTableWidgetItem(elided_path)
-            path_item.setData(Qt.UserRole, path)
-            path_item.setToolTip(path)
-            self.file_list.setItem(row, 0, path_item)
-            
+        # 启动后台校验 worker：分类后检查占用情况
+        self.status_label.setText("正在执行安全检查...")
+        self._system_hits = []
+        self._validation_hits = []
+        self.validator = ValidationWorker([row[0] for row in rows])
+        self.validator.classified.connect(self.on_paths_classified)
+        self.validator.finished.connect(self.on_validation_finished)
+        self.validator.holders_found.connect(self.on_holders_found)
+        self.validator.done.connect(self.on_validation_done)
+        self.validator.start()
+
+        self.update_desc()
+
+    def on_paths_classified(self, results):
+        """ 后台分类结果（每批一次）：更新类型与状态，受保护的路径转入系统文件列表 """
+        for path, is_sys, reason, is_dir in results:
+            if path not in self.paths:
+                # 检查期间已被移除
+                continue
             if is_sys:
+                self.paths.discard(path)
                 self.system_paths.add(path)
-                # 类型列
-                type_item = QTableWidgetItem("【系统文件】")
-                type_item.setForeground(QColor("#ff4d4f"))
-                self.file_list.setItem(row, 1, type_item)
-                
-                # 状态列
-                status_item = QTableWidgetItem("禁止粉碎 (系统文件)")
-                status_item.setForeground(QColor("#ff4d4f"))
-                self.file_list.setItem(row, 2, status_item)
-                
-                InfoBar.warning(
-                    "安全提示",
-                    f"检测到系统关键文件：{os.path.basename(path)}\n已自动标记为禁止粉碎，如需移除请手动清空列表。",
-                    duration=5000,
-                    parent=self.window()
-                )
+                self.file_model.queue_update(path, "禁止粉碎 (系统文件)", LEVEL_ERROR,
+                                             type_text="【系统文件】", tooltip=reason)
+                self._system_hits.append(path)
+                continue
+            # 更准确的类型显示
+            if is_dir:
+                file_type = "文件夹"
             else:
-                self.paths.add(path)
-                # 更准确的类型显示
-                if os.path.isdir(path):
-                    file_type = "文件夹"
-                else:
-                    ext = os.path.splitext(path)[1].lower()
-                    type_map = {
-                        '.py': 'Python 脚本',
-                        '.html': 'HTML 文档',
-                        '.htm': 'HTML 文档',
-                        '.txt': '文本文件',
-                        '.pdf': 'PDF 文档',
-                        '.docx': 'Word 文档',
-                        '.xlsx': 'Excel 表格',
-                        '.jpg': 'JPEG 图片',
-                        '.png': 'PNG 图片',
-                        '.exe': '可执行程序',
-                        '.zip': '压缩文件',
-                        '.rar': '压缩文件'
-                    }
-                    file_type = type_map.get(ext, f"{ext[1:].upper() if ext else '未知'} 文件")
-                
-                self.file_list.setItem(row, 1, QTableWidgetItem(file_type))
-                self.file_list.setItem(row, 2, QTableWidgetItem("待粉碎"))
-                to_validate.append(path)
-        
-        # 启动后台校验 worker 检查占用情况
-        if to_validate:
-            self.status_label.setText("正在执行深度安全检查...")
-            self.validator = ValidationWorker(to_validate)
-            self.validator.finished.connect(self.on_validation_finished)
-            self.validator.start()
-            
+                ext = os.path.splitext(path)[1].lower()
+                file_type = _TYPE_MAP.get(ext, f"{ext[1:].upper() if ext else '未知'} 文件")
+            self.file_model.queue_update(path, "待粉碎", LEVEL_NORMAL, type_text=file_type)
         self.update_desc()
 
     def show_context_menu(self, pos):
-        item = self.file_list.itemAt(pos)
-        if not item:
+        index = self.file_list.indexAt(pos)
+        if not index.isValid():
             return
             
-        row = item.row()
-        path = self.file_list.item(row, 0).data(Qt.UserRole)
+        path = self.file_model.path_at(index.row())
         
         menu = QMenu(self)
         copy_path_action = QAction(FIF.COPY.icon(), "复制路径", self)
@@ -205,31 +218,40 @@ class ShredderInterface(QWidget):
         menu.exec_(self.file_list.viewport().mapToGlobal(pos))
 
     def on_validation_finished(self, path, is_sys, reason):
-        """ 后台深度校验回调 """
-        self.status_label.setText("")
+        """ 后台深度校验回调（仅对被系统占用的文件触发） """
         if is_sys:
             # 发现是被系统占用的文件，将其转入系统文件列表
-            if path in self.paths:
-                self.paths.remove(path)
+            self.paths.discard(path)
             self.system_paths.add(path)
-            
-            # 更新 UI 状态
-            for row in range(self.file_list.rowCount()):
-                if self.file_list.item(row, 0).data(Qt.UserRole) == path:
-                    # 更新类型列
-                    type_item = QTableWidgetItem("【系统占用】")
-                    type_item.setForeground(QColor("#ff4d4f"))
-                    self.file_list.setItem(row, 1, type_item)
-                    
-                    # 更新状态列
-                    status_item = QTableWidgetItem("禁止粉碎 (系统占用)")
-                    status_item.setForeground(QColor("#ff4d4f"))
-                    self.file_list.setItem(row, 2, status_item)
-                    break
-            
+            self.file_model.queue_update(path, "禁止粉碎 (系统占用)", LEVEL_ERROR, type_text="【系统占用】")
+            self._validation_hits.append(path)
+
+    def on_holders_found(self, path, holders):
+        """ 显示占用该文件的进程，粉碎时会尝试解除占用 """
+        self.file_model.queue_update(path, f"被占用: {holders}", LEVEL_WARNING,
+                                     tooltip=f"占用进程：{holders}\n粉碎时将尝试结束这些进程")
+
+    def on_validation_done(self):
+        self.status_label.setText("")
+        system_hits = getattr(self, "_system_hits", [])
+        if system_hits:
+            name = os.path.basename(system_hits[0])
+            if len(system_hits) > 1:
+                name += f" 等 {len(system_hits)} 项"
             InfoBar.warning(
                 "安全提示",
-                f"文件被系统关键进程占用：{os.path.basename(path)}\n已标记为禁止操作。",
+                f"检测到系统关键文件：{name}\n已自动标记为禁止粉碎，如需移除请手动清空列表。",
+                duration=5000,
+                parent=self.window()
+            )
+        hits = getattr(self, "_validation_hits", [])
+        if hits:
+            name = os.path.basename(hits[0])
+            if len(hits) > 1:
+                name += f" 等 {len(hits)} 项"
+            InfoBar.warning(
+                "安全提示",
+                f"文件被系统关键进程占用：{name}\n已标记为禁止操作。",
                 duration=3000,
                 parent=self.window()
             )
@@ -237,41 +259,28 @@ class ShredderInterface(QWidget):
 
     def remove_path(self, path):
         """ 移除指定路径的文件 """
-        for row in range(self.file_list.rowCount()):
-            if self.file_list.item(row, 0).data(Qt.UserRole) == path:
-                self.file_list.removeRow(row)
-                break
-        if path in self.paths:
-            self.paths.remove(path)
-        if path in self.system_paths:
-            self.system_paths.remove(path)
+        self.file_model.remove_paths([path])
+        self.paths.discard(path)
+        self.system_paths.discard(path)
         self.update_desc()
 
     def remove_selected(self):
-        selected_ranges = self.file_list.selectedRanges()
-        if not selected_ranges:
+        rows = {index.row() for index in self.file_list.selectionModel().selectedIndexes()}
+        if not rows:
             return
-        
-        # 从后往前删，避免索引偏移
-        rows_to_remove = []
-        for r in selected_ranges:
-            for row in range(r.topRow(), r.bottomRow() + 1):
-                rows_to_remove.append(row)
-        
-        rows_to_remove = sorted(list(set(rows_to_remove)), reverse=True)
-        for row in rows_to_remove:
-            path = self.file_list.item(row, 0).data(Qt.UserRole)
-            if path in self.paths:
-                self.paths.remove(path)
-            if path in self.system_paths:
-                self.system_paths.remove(path)
-            self.file_list.removeRow(row)
+
+        to_remove = [self.file_model.path_at(row) for row in rows]
+        for path in to_remove:
+            self.paths.discard(path)
+            self.system_paths.discard(path)
+        self.file_list.clearSelection()
+        self.file_model.remove_paths(to_remove)
         self.update_desc()
 
     def clear_list(self):
         self.paths.clear()
         self.system_paths.clear()
-        self.file_list.setRowCount(0)
+        self.file_model.clear()
         self.update_desc()
 
     def update_desc(self):
@@ -293,39 +302,170 @@ class ShredderInterface(QWidget):
             InfoBar.warning("提示", "请先添加需要粉碎的文件或文件夹", duration=2000, parent=self.window())
             return
 
-        msg_box = MessageBox(
-            "确认粉碎",
-            "确定要粉碎选中的文件吗？粉碎后数据将无法恢复，且会尝试解除占用强制删除！",
-            self.window()
-        )
+        # 先在后台预估数据量与耗时，再弹出确认框
+        from modules.shred_estimator import EstimateWorker
+        self.set_controls_enabled(False)
+        self.status_label.setText("正在统计待粉碎数据并预估耗时...")
+        self.estimate_paths = list(self.paths)
+        self.estimator = EstimateWorker(self.estimate_paths, self.passes)
+        self.estimator.finished.connect(self.on_estimate_finished)
+        self.estimator.start()
+
+    def on_estimate_finished(self, estimate):
+        from modules.shred_estimator import format_estimate
+        self.set_controls_enabled(True)
+        self.status_label.setText("")
+        self.update_desc()
+
+        content = "确定要粉碎选中的文件吗？粉碎后数据将无法恢复，且会尝试解除占用强制删除！"
+        if "error" not in estimate:
+            content += "\n\n" + format_estimate(estimate)
+
+        msg_box = MessageBox("确认粉碎", content, self.window())
         msg_box.yesButton.setText("确定粉碎")
         msg_box.cancelButton.setText("取消")
         
         if msg_box.exec_():
-            self.set_controls_enabled(False)
-            self.progress_bar.show()
-            self.progress_bar.setValue(0)
-            
-            self.worker = ShredderWorker(list(self.paths))
-            self.worker.progress.connect(self.on_progress)
-            self.worker.file_finished.connect(self.on_file_finished)
-            self.worker.finished.connect(self.on_finished)
-            self.worker.start()
+            self.run_worker(self.estimate_paths)
+
+    def run_worker(self, paths, resume=None):
+        self.set_controls_enabled(False)
+        self.show_run_controls(True, can_pause=True)
+        self.progress_bar.setValue(0)
+        self.shredded_paths = set()
+        self.last_summary = None
+
+        self.worker = ShredderWorker(paths, passes=self.passes, resume=resume)
+        self.worker.progress.connect(self.on_progress)
+        self.worker.file_finished.connect(self.on_file_finished)
+        self.worker.summary.connect(self.on_summary)
+        self.worker.finished.connect(self.on_finished)
+        self.worker.start()
+
+    def show_run_controls(self, visible, can_pause=False):
+        """ 显示/隐藏进度条与暂停、取消按钮 """
+        self.progress_bar.setVisible(visible)
+        self.btn_cancel.setVisible(visible)
+        self.btn_cancel.setEnabled(True)
+        self.btn_pause.setEnabled(True)
+        self.btn_pause.setVisible(visible and can_pause)
+        self.progress_bar.resume()
+        self.btn_pause.setText("暂停")
+        self.btn_pause.setIcon(FIF.PAUSE)
+
+    def toggle_pause(self):
+        worker = getattr(self, "worker", None)
+        if not worker or not worker.isRunning():
+            return
+        if worker.control.paused:
+            worker.resume_work()
+            self.btn_pause.setText("暂停")
+            self.btn_pause.setIcon(FIF.PAUSE)
+            self.progress_bar.resume()
+        else:
+            worker.pause()
+            self.btn_pause.setText("继续")
+            self.btn_pause.setIcon(FIF.PLAY)
+            self.progress_bar.pause()
+            self.status_label.setText("已暂停")
+
+    def cancel_running(self):
+        """ 取消正在进行的粉碎或空闲空间擦除（在当前缓冲区写完后生效） """
+        self.btn_cancel.setEnabled(False)
+        self.btn_pause.setEnabled(False)
+        self.status_label.setText("正在取消...")
+        worker = getattr(self, "worker", None)
+        if worker and worker.isRunning():
+            worker.cancel()
+        wipe_worker = getattr(self, "wipe_worker", None)
+        if wipe_worker and wipe_worker.isRunning():
+            wipe_worker.stop()
+
+    def stop_worker(self, timeout_ms=1500):
+        """ 退出程序时停止后台任务，等待覆写循环在检查点退出 """
+        self.cancel_running()
+        estimator = getattr(self, "estimator", None)
+        if estimator and estimator.isRunning():
+            estimator.requestInterruption()
+        for name in ("worker", "wipe_worker", "validator", "estimator"):
+            worker = getattr(self, name, None)
+            if worker and worker.isRunning():
+                worker.wait(timeout_ms)
+
+    def check_pending_job(self):
+        """ 启动时检查上次未完成的粉碎任务，询问是否继续 """
+        from modules.shred_journal import load_pending_job, discard_pending_job
+        state = load_pending_job()
+        if state is None:
+            return
+
+        remaining = state.remaining_targets
+        msg_box = MessageBox(
+            "继续未完成的粉碎任务",
+            f"检测到上次有 {len(remaining)} 个项目未粉碎完成（程序被中断或系统重启）。\n"
+            "是否继续？已完成覆写的文件将被跳过。",
+            self.window()
+        )
+        msg_box.yesButton.setText("继续粉碎")
+        msg_box.cancelButton.setText("放弃")
+        if not msg_box.exec_():
+            discard_pending_job()
+            return
+
+        self.add_paths(remaining)
+        targets = [os.path.normpath(p) for p in remaining]
+        targets = [p for p in targets if p in self.paths]
+        if targets:
+            self.run_worker(targets, resume=state)
+        else:
+            discard_pending_job()
 
     def on_file_finished(self, path, success, msg):
-        """ 单个文件处理完成的回调 """
-        for row in range(self.file_list.rowCount()):
-            if self.file_list.item(row, 0).data(Qt.UserRole) == path:
-                status_item = QTableWidgetItem(msg)
-                if success:
-                    status_item.setForeground(QColor("#27ae60")) # 绿色
-                else:
-                    status_item.setForeground(QColor("#ff4d4f")) # 红色
-                self.file_list.setItem(row, 2, status_item)
-                break
+        """ 单个文件处理完成的回调（合并后批量刷新到列表） """
+        if success:
+            self.shredded_paths.add(path)
+        self.file_model.queue_update(path, msg, LEVEL_SUCCESS if success else LEVEL_ERROR)
+
+    def start_free_space_wipe(self):
+        """ 擦除所选磁盘的空闲空间，使此前已删除的文件无法恢复 """
+        from PyQt5.QtWidgets import QFileDialog
+        folder = QFileDialog.getExistingDirectory(self, "选择要擦除空闲空间的磁盘或文件夹")
+        if not folder:
+            return
+
+        msg_box = MessageBox(
+            "擦除空闲空间",
+            f"将在 {folder} 所在磁盘写满临时填充文件以覆盖已删除文件的残留数据，完成后自动删除。\n"
+            "磁盘越大耗时越长，期间会保留少量空间以保证系统正常运行。是否继续？",
+            self.window()
+        )
+        msg_box.yesButton.setText("开始擦除")
+        msg_box.cancelButton.setText("取消")
+        if not msg_box.exec_():
+            return
+
+        from modules.free_space_wiper import FreeSpaceWipeWorker
+        self.set_controls_enabled(False)
+        self.show_run_controls(True)
+        self.progress_bar.setValue(0)
+        self.wipe_worker = FreeSpaceWipeWorker(folder, writers=2)
+        self.wipe_worker.progress.connect(self.on_progress)
+        self.wipe_worker.finished.connect(self.on_wipe_finished)
+        self.wipe_worker.start()
+
+    def on_wipe_finished(self, success, msg):
+        self.set_controls_enabled(True)
+        self.show_run_controls(False)
+        self.status_label.setText("")
+        self.update_desc()
+        if success:
+            InfoBar.success("擦除完成", msg, duration=3000, parent=self.window())
+        else:
+            InfoBar.error("擦除失败", msg, duration=5000, parent=self.window())
 
     def set_controls_enabled(self, enabled):
         """ 控制界面按钮的可操作性 """
+        self.btn_wipe.setEnabled(enabled)
         self.btn_shred.setEnabled(enabled)
         self.btn_add_file.setEnabled(enabled)
         self.btn_add_folder.setEnabled(enabled)
@@ -341,12 +481,28 @@ class ShredderInterface(QWidget):
         self.progress_bar.setValue(val)
         self.status_label.setText(msg)
 
+    def on_summary(self, summary):
+        self.last_summary = summary
+        for path in summary.get("skipped", []):
+            if path != summary.get("interrupted"):
+                self.file_model.queue_update(path, "未处理 (已取消)", LEVEL_WARNING)
+
     def on_finished(self, success, fail, errors):
         self.set_controls_enabled(True)
-        self.progress_bar.hide()
+        self.show_run_controls(False)
         self.status_label.setText("")
         
-        if fail == 0:
+        summary = getattr(self, "last_summary", None) or {}
+        if summary.get("cancelled"):
+            msg = f"已粉碎: {success}, 失败: {fail}, 未处理: {len(summary.get('skipped', []))}"
+            if summary.get("interrupted"):
+                msg += f"\n{os.path.basename(summary['interrupted'])} 覆写未完成，下次启动时可继续"
+            InfoBar.warning("粉碎已取消", msg, duration=6000, parent=self.window())
+        elif fail == 0 and summary.get("protected"):
+            protected = summary["protected"]
+            msg = f"已跳过 {len(protected)} 个受保护项目（保留在原位置）:\n" + "\n".join(protected[:3])
+            InfoBar.warning("粉碎完成", msg, duration=6000, parent=self.window())
+        elif fail == 0:
             InfoBar.success("粉碎完成", "文件已彻底粉碎，无法恢复", duration=3000, parent=self.window())
         else:
             msg = f"成功: {success}, 失败: {fail}"
@@ -355,17 +511,8 @@ class ShredderInterface(QWidget):
             InfoBar.error("部分项目粉碎失败", msg, duration=5000, parent=self.window())
         
         # 粉碎完成后移除已成功粉碎的路径记录，但保留在列表中显示
-        paths_to_remove = []
-        for path in self.paths:
-            # 检查列表中该路径的状态
-            for row in range(self.file_list.rowCount()):
-                if self.file_list.item(row, 0).data(Qt.UserRole) == path:
-                    if self.file_list.item(row, 2).text() == "已粉碎":
-                        paths_to_remove.append(path)
-                    break
-        
-        for p in paths_to_remove:
-            self.paths.remove(p)
+        self.file_model.flush()
+        self.paths -= self.shredded_paths
             
         self.update_desc()
 
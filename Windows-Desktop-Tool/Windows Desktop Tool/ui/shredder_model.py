@@ -0,0 +1,160 @@
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer
+from PyQt5.QtGui import QColor
+
+# 状态级别对应的文字颜色
+LEVEL_NORMAL = 0
+LEVEL_SUCCESS = 1
+LEVEL_ERROR = 2
+LEVEL_WARNING = 3
+
+_LEVEL_COLORS = {
+    LEVEL_SUCCESS: QColor("#27ae60"),
+    LEVEL_ERROR: QColor("#ff4d4f"),
+    LEVEL_WARNING: QColor("#faad14"),
+}
+
+class ShredderTableModel(QAbstractTableModel):
+    """
+    文件粉碎列表模型
+    按列存储（路径/类型/状态/级别），并维护 路径 -> 行号 索引；
+    状态更新先进入待处理队列，由定时器合并成一次 dataChanged 刷新，
+    视图只绘制可见行，几十万条记录也不会卡顿
+    """
+    HEADERS = ["路径", "类型", "当前状态"]
+
+    def __init__(self, parent=None, flush_interval=100):
+        super().__init__(parent)
+        self._paths = []
+        self._types = []
+        self._status = []
+        self._levels = []
+        self._tips = {}      # 路径 -> 状态列提示（稀疏存储）
+        self._row_of = {}    # 路径 -> 行号
+        self._pending = {}   # 路径 -> (状态, 级别, 类型, 提示)
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(flush_interval)
+        self._flush_timer.timeout.connect(self.flush)
+
+    # ---- Qt 模型接口 ----
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._paths)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        if role == Qt.DisplayRole:
+            if col == 0:
+                return self._paths[row]
+            if col == 1:
+                return self._types[row]
+            return self._status[row]
+        if role == Qt.ForegroundRole and col > 0:
+            return _LEVEL_COLORS.get(self._levels[row])
+        if role == Qt.ToolTipRole:
+            if col == 0:
+                return self._paths[row]
+            if col == 2:
+                return self._tips.get(self._paths[row])
+        if role == Qt.UserRole:
+            return self._paths[row]
+        return None
+
+    # ---- 数据操作 ----
+    def append_rows(self, rows):
+        """ 批量追加 [(路径, 类型, 状态, 级别)]，只触发一次插入通知 """
+        rows = [r for r in rows if r[0] not in self._row_of]
+        if not rows:
+            return
+        first = len(self._paths)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        for offset, (path, type_text, status, level) in enumerate(rows):
+            self._row_of[path] = first + offset
+            self._paths.append(path)
+            self._types.append(type_text)
+            self._status.append(status)
+            self._levels.append(level)
+        self.endInsertRows()
+
+    def remove_paths(self, paths):
+        """ 批量移除，重建列数据与索引（O(N)，与移除数量无关） """
+        paths = {p for p in paths if p in self._row_of}
+        if not paths:
+            return
+        self.flush()
+        self.beginResetModel()
+        keep = [i for i, p in enumerate(self._paths) if p not in paths]
+        self._paths = [self._paths[i] for i in keep]
+        self._types = [self._types[i] for i in keep]
+        self._status = [self._status[i] for i in keep]
+        self._levels = [self._levels[i] for i in keep]
+        self._row_of = {p: i for i, p in enumerate(self._paths)}
+        for p in paths:
+            self._tips.pop(p, None)
+        self.endResetModel()
+
+    def clear(self):
+        self._flush_timer.stop()
+        self.beginResetModel()
+        self._paths, self._types, self._status, self._levels = [], [], [], []
+        self._tips.clear()
+        self._row_of.clear()
+        self._pending.clear()
+        self.endResetModel()
+
+    def path_at(self, row):
+        return self._paths[row]
+
+    def contains(self, path):
+        return path in self._row_of
+
+    def status_of(self, path):
+        row = self._row_of.get(path)
+        return None if row is None else self._status[row]
+
+    def queue_update(self, path, status, level=LEVEL_NORMAL, type_text=None, tooltip=None):
+        """ 登记一条状态更新，稍后与其它更新合并刷新 """
+        if path not in self._row_of:
+            return
+        # 同一刷新周期内的多次更新合并：状态与级别以最后一次为准，类型与提示保留已登记的非空值
+        queued = self._pending.get(path)
+        if queued is not None:
+            type_text = queued[2] if type_text is None else type_text
+            tooltip = queued[3] if tooltip is None else tooltip
+        self._pending[path] = (status, level, type_text, tooltip)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def flush(self):
+        """ 应用所有待处理的状态更新，并按受影响的行范围发出一次 dataChanged """
+        self._flush_timer.stop()
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        first = last = None
+        for path, (status, level, type_text, tooltip) in pending.items():
+            row = self._row_of.get(path)
+            if row is None:
+                continue
+            self._status[row] = status
+            self._levels[row] = level
+            if type_text is not None:
+                self._types[row] = type_text
+            if tooltip:
+                self._tips[path] = tooltip
+            else:
+                self._tips.pop(path, None)
+            first = row if first is None else min(first, row)
+            last = row if last is None else max(last, row)
+        if first is not None:
+            self.dataChanged.emit(self.index(first, 1), self.index(last, 2))